@@ -26,16 +26,42 @@ class ConnectorConfig(sevm.Config):
     port: int = None
     tls: bool = True
     qos: int = 2
+    event_qos: int = None
+    command_response_qos: int = None
+    fog_processes_qos: int = None
+    error_qos: int = None
     msg_retry: int = 5
     keepalive: int = 20
     clean_session: bool = True
     loop_time: typing.Union[int, float] = 1
+    loop_mode: str = "poll"
     reconn_delay_min: int = 5
     reconn_delay_max: int = 120
     reconn_delay_factor: typing.Union[int, float] = 1.85
     low_level_logger: bool = False
     request_timeout: typing.Union[int, float] = 30
     eventual_consistency_delay: typing.Union[int, float] = 2
+    publish_timeout: typing.Union[int, float] = None
+    subscribe_timeout: typing.Union[int, float] = None
+    executor_max_workers: int = 8
+    executor_queue_size: int = 0
+    http_pool_size: int = 4
+    http_pool_idle_timeout: typing.Union[int, float] = 60
+    http_pool_retries: int = 1
+    token_refresh_fraction: typing.Union[int, float] = 0.8
+    subscribe_chunk_size: int = 100
+    command_workers: int = 4
+    command_worker_queue_size: int = 0
+    lazy_command_decoding: bool = False
+    command_dedup: bool = False
+    command_dedup_size: int = 10000
+    command_dedup_ttl: typing.Union[int, float] = 3600
+    command_max_age: typing.Union[int, float] = None
+    command_expired_reply: bool = False
+    serializer: str = "json"
+    topic_cache_size: int = 10000
+    correlation_id_strategy: str = "uuid4"
+    lazy_correlation_id: bool = False
 
 
 class ApiConfig(sevm.Config):
@@ -52,7 +78,25 @@ class ApiConfig(sevm.Config):
     command_error_pub_topic: str = "error/command/{correlation_id}"
 
 
+class SpoolConfig(sevm.Config):
+    enabled: bool = False
+    path: str = "cc_spool.sqlite"
+    max_messages: int = 100000
+    eviction_policy: str = "drop_oldest"
+    drain_rate: typing.Union[int, float] = 100
+    drain_batch_size: int = 50
+
+
+class QueueConfig(sevm.Config):
+    command_size: int = 0
+    fog_processes_size: int = 0
+    fog_analytics_size: int = 0
+    overflow_policy: str = "block"
+    spill_dir: str = None
+
+
 class RouterConfig(sevm.Config):
+    # deprecated, topics are routed via 'api.command_sub_topic' and 'api.fog_processes_sub_topic'
     command_sub_topic_identifier: str = "command"
     fog_processes_sub_topic_identifier: str = "processes"
 
@@ -66,6 +110,8 @@ class Credentials(sevm.Config):
 class Config(sevm.Config):
     connector = ConnectorConfig
     api = ApiConfig
+    spool = SpoolConfig
+    queue = QueueConfig
     router = RouterConfig
     credentials = Credentials
     device_attribute_origin: str = "local-cc"
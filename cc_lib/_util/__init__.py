@@ -19,6 +19,7 @@ from ._logger import get_logger
 
 __all__ = (
     'validate_instance',
+    'TypeValidation',
     'validate_subclass',
     'calc_nth_term',
     'calc_duration',
@@ -29,6 +30,14 @@ import typing
 import math
 
 
+class TypeValidation:
+    """
+    Global switch for type validation on hot paths (envelopes, messages and send methods).
+    Enabled by default, disable only if all callers are trusted.
+    """
+    enabled = True
+
+
 def validate_instance(obj: object, cls: typing.Union[type, typing.Tuple[type, ...]]) -> None:
     """
     Raise TypeError if given object is not an instance of given class.
@@ -15,9 +15,17 @@
 """
 
 from ._client import *
+from ._async_client import *
 from ._exception import *
+from ._batch import *
+from ._serializer import *
+from ._asynchron import Executor
 
 __all__ = (
     _client.__all__,
-    _exception.__all__
+    _async_client.__all__,
+    _exception.__all__,
+    _batch.__all__,
+    _serializer.__all__,
+    ('Executor', )
 )
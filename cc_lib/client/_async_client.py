@@ -0,0 +1,252 @@
+"""
+   Copyright 2019 InfAI (CC SES)
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+__all__ = ("AsyncClient", )
+
+
+from ._client import Client
+from ._batch import BatchResult
+from ._exception import QueueEmptyError
+from ._asynchron import Future, Executor
+from ._serializer import Serializer
+from ..types import Device
+from ..types.message import CommandEnvelope, CommandResponseEnvelope, EventEnvelope, FogProcessesEnvelope, ClientErrorEnvelope, DeviceErrorEnvelope, CommandErrorEnvelope
+from .._util import validate_instance
+import functools
+import asyncio
+import typing
+
+
+class AsyncClient:
+    """
+    asyncio interface for client-connector projects.
+    The MQTT connection is driven by the event loop, HTTP requests are executed by the client's executor.
+    Must be created from within a coroutine if no event loop is given.
+    """
+    def __init__(self, user: typing.Optional[str] = None, pw: typing.Optional[str] = None, client_id: typing.Optional[str] = None, device_id_prefix: typing.Optional[str] = None, device_attribute_origin: typing.Optional[str] = None, fog_processes: typing.Optional[bool] = False, fog_analytics: typing.Optional[bool] = False, executor: typing.Optional[Executor] = None, event_loop: typing.Optional[asyncio.AbstractEventLoop] = None, serializer: typing.Optional[Serializer] = None):
+        """
+        Create an AsyncClient instance. See Client for parameters.
+        :param event_loop: Event loop driving the client, defaults to the running loop.
+        """
+        validate_instance(event_loop, (asyncio.AbstractEventLoop, type(None)))
+        self.__loop = event_loop or asyncio.get_running_loop()
+        self.__client = Client(
+            user=user,
+            pw=pw,
+            client_id=client_id,
+            device_id_prefix=device_id_prefix,
+            device_attribute_origin=device_attribute_origin,
+            fog_processes=fog_processes,
+            fog_analytics=fog_analytics,
+            executor=executor,
+            event_loop=self.__loop,
+            serializer=serializer
+        )
+        self.__cmd_event = asyncio.Event()
+        self.__fog_prcs_event = asyncio.Event()
+        self.__client.set_command_clbk(functools.partial(self.__notify, self.__cmd_event))
+        self.__client.set_fog_processes_clbk(functools.partial(self.__notify, self.__fog_prcs_event))
+
+    @property
+    def client(self) -> Client:
+        """
+        Underlying Client, e.g. for setting callbacks, registering handlers or retrieving metrics.
+        """
+        return self.__client
+
+    def __notify(self, event: asyncio.Event) -> None:
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.__loop:
+            event.set()
+        else:
+            self.__loop.call_soon_threadsafe(event.set)
+
+    async def __wait(self, future: Future) -> typing.Any:
+        return await asyncio.wrap_future(future.as_concurrent(), loop=self.__loop)
+
+    async def init_hub(self, hub_id: typing.Optional[str] = None, hub_name: typing.Optional[str] = None) -> str:
+        """
+        Initialize a hub. See Client.init_hub.
+        :return: Hub ID.
+        """
+        return await self.__wait(self.__client.init_hub(hub_id=hub_id, hub_name=hub_name, asynchronous=True))
+
+    async def sync_hub(self, devices: typing.List[Device]) -> None:
+        """
+        Synchronize a hub. See Client.sync_hub.
+        """
+        await self.__wait(self.__client.sync_hub(devices=devices, asynchronous=True))
+
+    async def add_device(self, device: Device) -> None:
+        """
+        Add a device to local device manager and remote platform. See Client.add_device.
+        """
+        await self.__wait(self.__client.add_device(device=device, asynchronous=True))
+
+    async def add_devices(self, devices: typing.List[Device], concurrency: int = 8) -> BatchResult:
+        """
+        Add multiple devices. See Client.add_devices.
+        """
+        return await self.__wait(self.__client.add_devices(devices=devices, concurrency=concurrency, asynchronous=True))
+
+    async def delete_device(self, device: typing.Union[Device, str]) -> None:
+        """
+        Delete a device. See Client.delete_device.
+        """
+        await self.__wait(self.__client.delete_device(device=device, asynchronous=True))
+
+    async def update_device(self, device: Device) -> None:
+        """
+        Update a device. See Client.update_device.
+        """
+        await self.__wait(self.__client.update_device(device=device, asynchronous=True))
+
+    async def connect(self, reconnect: bool = False) -> None:
+        """
+        Connect to platform message broker. See Client.connect.
+        """
+        await self.__wait(self.__client.connect(reconnect=reconnect, asynchronous=True))
+
+    async def disconnect(self) -> None:
+        """
+        Disconnect from platform message broker.
+        """
+        self.__client.disconnect()
+
+    async def connect_device(self, device: typing.Union[Device, str]) -> None:
+        """
+        Connect a device to the platform. See Client.connect_device.
+        """
+        await self.__wait(self.__client.connect_device(device=device, asynchronous=True))
+
+    async def disconnect_device(self, device: typing.Union[Device, str]) -> None:
+        """
+        Disconnect a device from the platform. See Client.disconnect_device.
+        """
+        await self.__wait(self.__client.disconnect_device(device=device, asynchronous=True))
+
+    async def connect_devices(self, devices: typing.List[typing.Union[Device, str]]) -> BatchResult:
+        """
+        Connect multiple devices. See Client.connect_devices.
+        """
+        return await self.__wait(self.__client.connect_devices(devices=devices, asynchronous=True))
+
+    async def disconnect_devices(self, devices: typing.List[typing.Union[Device, str]]) -> BatchResult:
+        """
+        Disconnect multiple devices. See Client.disconnect_devices.
+        """
+        return await self.__wait(self.__client.disconnect_devices(devices=devices, asynchronous=True))
+
+    async def receive_command(self) -> CommandEnvelope:
+        """
+        Wait for a command.
+        :return: Envelope object.
+        """
+        return (await self.receive_commands(max_commands=1))[0]
+
+    async def receive_commands(self, max_commands: int) -> typing.List[CommandEnvelope]:
+        """
+        Wait for commands and return up to max_commands at once.
+        :return: List of envelope objects.
+        """
+        while True:
+            self.__cmd_event.clear()
+            try:
+                return self.__client.receive_commands(max_commands=max_commands, block=False)
+            except QueueEmptyError:
+                await self.__cmd_event.wait()
+
+    async def commands(self, batch_size: int = 100) -> typing.AsyncIterator[CommandEnvelope]:
+        """
+        Iterate over received commands, e.g. 'async for envelope in client.commands()'.
+        :param batch_size: Maximum number of commands taken from the queue at once.
+        """
+        while True:
+            for envelope in await self.receive_commands(max_commands=batch_size):
+                yield envelope
+
+    async def receive_fog_processes(self) -> FogProcessesEnvelope:
+        """
+        Wait for a fog processes message.
+        :return: FogProcessesEnvelope object.
+        """
+        return (await self.receive_fog_processes_batch(max_items=1))[0]
+
+    async def receive_fog_processes_batch(self, max_items: int) -> typing.List[FogProcessesEnvelope]:
+        """
+        Wait for fog processes messages and return up to max_items at once.
+        :return: List of FogProcessesEnvelope objects.
+        """
+        while True:
+            self.__fog_prcs_event.clear()
+            try:
+                return self.__client.receive_fog_processes_batch(max_items=max_items, block=False)
+            except QueueEmptyError:
+                await self.__fog_prcs_event.wait()
+
+    async def fog_processes(self, batch_size: int = 100) -> typing.AsyncIterator[FogProcessesEnvelope]:
+        """
+        Iterate over received fog processes messages, e.g. 'async for envelope in client.fog_processes()'.
+        :param batch_size: Maximum number of messages taken from the queue at once.
+        """
+        while True:
+            for envelope in await self.receive_fog_processes_batch(max_items=batch_size):
+                yield envelope
+
+    async def send_command_response(self, envelope: CommandResponseEnvelope, qos: typing.Optional[int] = None) -> None:
+        """
+        Send a response to the platform after handling a command.
+        """
+        await self.__wait(self.__client.send_command_response(envelope, asynchronous=True, qos=qos))
+
+    async def send_event(self, envelope: EventEnvelope, qos: typing.Optional[int] = None) -> None:
+        """
+        Send an event to the platform.
+        """
+        await self.__wait(self.__client.send_event(envelope, asynchronous=True, qos=qos))
+
+    async def send_events(self, envelopes: typing.Union[typing.List[EventEnvelope], typing.Tuple[EventEnvelope]], qos: typing.Optional[int] = None) -> None:
+        """
+        Send multiple events to the platform in one pass.
+        """
+        await self.__wait(self.__client.send_events(envelopes, asynchronous=True, qos=qos))
+
+    async def send_fog_process_sync(self, envelope: FogProcessesEnvelope, qos: typing.Optional[int] = None) -> None:
+        """
+        Send fog processes sync data to the platform.
+        """
+        await self.__wait(self.__client.send_fog_process_sync(envelope, asynchronous=True, qos=qos))
+
+    async def send_client_error(self, envelope: ClientErrorEnvelope, qos: typing.Optional[int] = None) -> None:
+        """
+        Send a client error to the platform.
+        """
+        await self.__wait(self.__client.send_client_error(envelope, asynchronous=True, qos=qos))
+
+    async def send_device_error(self, envelope: DeviceErrorEnvelope, qos: typing.Optional[int] = None) -> None:
+        """
+        Send a device error to the platform.
+        """
+        await self.__wait(self.__client.send_device_error(envelope, asynchronous=True, qos=qos))
+
+    async def send_command_error(self, envelope: CommandErrorEnvelope, qos: typing.Optional[int] = None) -> None:
+        """
+        Send a command error to the platform.
+        """
+        await self.__wait(self.__client.send_command_error(envelope, asynchronous=True, qos=qos))
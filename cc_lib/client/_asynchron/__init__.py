@@ -17,9 +17,17 @@
 
 from .future import *
 from .worker import *
+from .executor import *
+from .dispatcher import *
+from .completion import *
+from .callbacks import *
 
 
 __all__ = (
     future.__all__,
-    worker.__all__
+    worker.__all__,
+    executor.__all__,
+    dispatcher.__all__,
+    completion.__all__,
+    callbacks.__all__
 )
\ No newline at end of file
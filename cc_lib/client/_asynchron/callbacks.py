@@ -0,0 +1,91 @@
+"""
+   Copyright 2019 InfAI (CC SES)
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+__all__ = ('DoneCallbacks', )
+
+
+from ..._util import get_logger
+import threading
+import typing
+import queue
+
+
+logger = get_logger(__name__.split('.', 1)[-1].replace("_", ""))
+
+
+class _CallbackDispatcher:
+    """
+    Run done callbacks one after another on a dedicated thread so workers and the MQTT loop never execute user code.
+    """
+    def __init__(self):
+        self.__queue = queue.SimpleQueue()
+        self.__thread = None
+        self.__lock = threading.Lock()
+
+    def __run(self):
+        while True:
+            callbacks = self.__queue.get()
+            for callback in callbacks:
+                try:
+                    callback()
+                except Exception:
+                    logger.exception("done callback '{}' failed".format(getattr(callback, "__name__", callback)))
+
+    def submit(self, callbacks: typing.List[typing.Callable[[], None]]) -> None:
+        if not self.__thread:
+            with self.__lock:
+                if not self.__thread:
+                    self.__thread = threading.Thread(target=self.__run, name="done-callbacks", daemon=True)
+                    self.__thread.start()
+        self.__queue.put(callbacks)
+
+
+_dispatcher = _CallbackDispatcher()
+
+_lock = threading.Lock()
+
+
+class DoneCallbacks:
+    """
+    Mixin for workers providing done callbacks. Workers call _run_done_callbacks after completion.
+    """
+
+    __slots__ = ('__callbacks', )
+
+    def _init_done_callbacks(self) -> None:
+        self.__callbacks = None
+
+    def add_done_callback(self, callback: typing.Callable[[], None]) -> None:
+        """
+        Call a function without arguments once the worker is done, immediately scheduled if already done.
+        """
+        with _lock:
+            if self.__callbacks is None:
+                self.__callbacks = [callback]
+            else:
+                self.__callbacks.append(callback)
+        # the worker may have completed before the callback was stored
+        if self.done:
+            self._run_done_callbacks()
+
+    def _run_done_callbacks(self) -> None:
+        if self.__callbacks is None:
+            return
+        with _lock:
+            callbacks = self.__callbacks
+            self.__callbacks = None
+        if callbacks:
+            _dispatcher.submit(callbacks)
@@ -0,0 +1,117 @@
+"""
+   Copyright 2019 InfAI (CC SES)
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+__all__ = ('Completion', )
+
+
+from .callbacks import DoneCallbacks
+import collections
+import threading
+import typing
+
+
+_waiter_lock = threading.Lock()
+
+
+class Completion(DoneCallbacks):
+    """
+    Lightweight replacement for EventWorker if the operation completes via callback.
+    A threading.Event is only created if someone waits, instances can be recycled via acquire and release.
+    """
+
+    __slots__ = ('result', 'exception', 'usr_method', 'usr_data', '__name', '__name_args', '__done', '__waiter')
+
+    __pool = collections.deque(maxlen=64)
+
+    def __init__(self, name: typing.Optional[str] = None, name_args: tuple = (), usr_method: typing.Optional[typing.Callable] = None, usr_data: typing.Any = None):
+        """
+        :param name: Name or format string formatted with name_args on access.
+        :param name_args: Arguments for name.
+        :param usr_method: Called with the completion before it is set.
+        :param usr_data: Arbitrary user data.
+        """
+        self.result = None
+        self.exception = None
+        self.usr_method = usr_method or self.__noop
+        self.usr_data = usr_data
+        self.__name = name
+        self.__name_args = name_args
+        self.__done = False
+        self.__waiter = None
+        self._init_done_callbacks()
+
+    @staticmethod
+    def __noop(completion) -> None:
+        pass
+
+    @classmethod
+    def acquire(cls, name: typing.Optional[str] = None, name_args: tuple = (), usr_method: typing.Optional[typing.Callable] = None, usr_data: typing.Any = None) -> "Completion":
+        """
+        Get a recycled or new instance.
+        """
+        try:
+            completion = cls.__pool.pop()
+        except IndexError:
+            return cls(name=name, name_args=name_args, usr_method=usr_method, usr_data=usr_data)
+        completion.usr_method = usr_method or cls.__noop
+        completion.usr_data = usr_data
+        completion.__name = name
+        completion.__name_args = name_args
+        return completion
+
+    def release(self) -> None:
+        """
+        Return a done instance to the pool. The instance must not be used afterwards.
+        """
+        if not self.__done:
+            raise RuntimeError("completion not done")
+        self.result = None
+        self.exception = None
+        self.usr_method = None
+        self.usr_data = None
+        self.__done = False
+        # a late set() of the previous use may still hold the old event
+        self.__waiter = None
+        self.__pool.append(self)
+
+    @property
+    def name(self) -> typing.Optional[str]:
+        if self.__name_args:
+            return self.__name.format(*self.__name_args)
+        return self.__name
+
+    @property
+    def done(self) -> bool:
+        return self.__done
+
+    def set(self) -> None:
+        # wake waiters before the flag is visible, a waiter may release the instance once it sees the flag
+        with _waiter_lock:
+            if self.__waiter:
+                self.__waiter.set()
+            self.__done = True
+        self._run_done_callbacks()
+
+    def join(self, timeout: typing.Optional[float] = None) -> None:
+        if self.__done:
+            return
+        with _waiter_lock:
+            if not self.__waiter:
+                self.__waiter = threading.Event()
+        if self.__done:
+            return
+        if not self.__waiter.wait(timeout):
+            raise TimeoutError
@@ -0,0 +1,99 @@
+"""
+   Copyright 2019 InfAI (CC SES)
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+__all__ = ('KeyedDispatcher', )
+
+
+from ..._util import get_logger
+import collections
+import threading
+import typing
+
+
+logger = get_logger(__name__.split('.', 1)[-1].replace("_", ""))
+
+
+class KeyedDispatcher:
+    """
+    Execute tasks on a fixed number of threads.
+    Tasks sharing a key are executed one at a time in the order they were submitted. Each key has its own queue,
+    free threads take the next key with pending tasks, so a slow task only delays tasks with the same key.
+    """
+    def __init__(self, workers: int, queue_size: int = 0, name: str = "dispatcher"):
+        """
+        :param workers: Number of threads.
+        :param queue_size: Maximum number of pending tasks of all keys, '0' for unbounded.
+        :param name: Thread name prefix.
+        """
+        if workers < 1:
+            raise ValueError("workers must be larger than 0")
+        self.__max_size = queue_size
+        self.__size = 0
+        self.__pending = dict()
+        self.__ready = collections.deque()
+        self.__lock = threading.Lock()
+        self.__has_ready = threading.Condition(self.__lock)
+        self.__not_full = threading.Condition(self.__lock)
+        for num in range(workers):
+            thread = threading.Thread(
+                target=self.__work,
+                name="{}-{}".format(name, num),
+                daemon=True
+            )
+            thread.start()
+
+    @property
+    def queue_length(self) -> int:
+        return self.__size
+
+    def __work(self):
+        while True:
+            with self.__lock:
+                while not self.__ready:
+                    self.__has_ready.wait()
+                key = self.__ready.popleft()
+                target, args = self.__pending[key].popleft()
+                self.__size -= 1
+                self.__not_full.notify()
+            try:
+                target(*args)
+            except Exception:
+                logger.exception("task '{}' failed".format(getattr(target, "__name__", target)))
+            with self.__lock:
+                if self.__pending[key]:
+                    self.__ready.append(key)
+                    self.__has_ready.notify()
+                else:
+                    del self.__pending[key]
+
+    def submit(self, key: typing.Hashable, target: typing.Callable, args: tuple = ()) -> None:
+        """
+        Queue a task. Blocks if the maximum number of pending tasks is reached.
+        :param key: Tasks with equal keys are executed in order.
+        :param target: Callable to execute.
+        :param args: Positional arguments.
+        :return: None.
+        """
+        with self.__lock:
+            while self.__max_size and self.__size >= self.__max_size:
+                self.__not_full.wait()
+            tasks = self.__pending.get(key)
+            if tasks is None:
+                tasks = self.__pending[key] = collections.deque()
+                self.__ready.append(key)
+                self.__has_ready.notify()
+            tasks.append((target, args))
+            self.__size += 1
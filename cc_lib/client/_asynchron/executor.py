@@ -0,0 +1,139 @@
+"""
+   Copyright 2019 InfAI (CC SES)
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+__all__ = ('Executor', 'TaskWorker', 'current_task')
+
+
+from .future import Future
+from .callbacks import DoneCallbacks
+import threading
+import typing
+import queue
+
+
+_local = threading.local()
+
+
+def current_task() -> typing.Optional['TaskWorker']:
+    """
+    Get the task executed by the calling executor thread.
+    :return: TaskWorker object or None if not called from an executor thread.
+    """
+    return getattr(_local, "task", None)
+
+
+class TaskWorker(DoneCallbacks):
+
+    __slots__ = ('name', 'result', 'exception', '__target', '__args', '__kwargs', '__event')
+
+    def __init__(self, target=None, name=None, args=(), kwargs=None):
+        self.name = name
+        self.result = None
+        self.exception = None
+        self.__target = target
+        self.__args = args
+        self.__kwargs = kwargs or dict()
+        self.__event = threading.Event()
+        self._init_done_callbacks()
+
+    @property
+    def done(self) -> bool:
+        return self.__event.is_set()
+
+    def run(self) -> None:
+        try:
+            try:
+                if self.__target:
+                    self.result = self.__target(*self.__args, **self.__kwargs)
+            finally:
+                del self.__target, self.__args, self.__kwargs
+        except Exception as ex:
+            self.exception = ex
+        self.__event.set()
+        self._run_done_callbacks()
+
+    def join(self, timeout: typing.Optional[float] = None) -> None:
+        if not self.__event.wait(timeout):
+            raise TimeoutError
+
+
+class Executor:
+    """
+    Bounded pool of threads executing tasks in the background.
+    Threads are started on demand up to max_workers, tasks exceeding queue_size block the submitting thread.
+    """
+    def __init__(self, max_workers: int, queue_size: int = 0, name: str = "executor"):
+        if max_workers < 1:
+            raise ValueError("max workers must be larger than 0")
+        if queue_size < 0:
+            raise ValueError("queue size must not be negative")
+        self.__max_workers = max_workers
+        self.__name = name
+        self.__queue = queue.Queue(maxsize=queue_size)
+        self.__threads = list()
+        self.__idle = threading.Semaphore(0)
+        self.__lock = threading.Lock()
+
+    @property
+    def max_workers(self) -> int:
+        return self.__max_workers
+
+    @property
+    def workers(self) -> int:
+        return len(self.__threads)
+
+    @property
+    def queue_length(self) -> int:
+        return self.__queue.qsize()
+
+    def __work(self):
+        while True:
+            task = self.__queue.get()
+            _local.task = task
+            try:
+                task.run()
+            finally:
+                _local.task = None
+            self.__idle.release()
+
+    def __adjust(self):
+        if self.__idle.acquire(timeout=0):
+            return
+        with self.__lock:
+            if len(self.__threads) < self.__max_workers:
+                thread = threading.Thread(
+                    target=self.__work,
+                    name="{}-{}".format(self.__name, len(self.__threads)),
+                    daemon=True
+                )
+                thread.start()
+                self.__threads.append(thread)
+
+    def submit(self, target: typing.Callable, args: tuple = (), kwargs: typing.Optional[dict] = None, name: typing.Optional[str] = None, block: bool = True) -> Future:
+        """
+        Execute a callable on one of the executor's threads.
+        :param target: Callable to execute.
+        :param args: Positional arguments.
+        :param kwargs: Keyword arguments.
+        :param name: Name of the task.
+        :param block: If 'False' raise queue.Full instead of waiting if the queue is full.
+        :return: Future object.
+        """
+        task = TaskWorker(target=target, name=name, args=args, kwargs=kwargs)
+        future = Future(task)
+        self.__adjust()
+        self.__queue.put(task, block=block)
+        return future
@@ -18,6 +18,8 @@ __all__ = ('Future', )
 
 
 from .._exception import FutureNotDoneError
+import concurrent.futures
+import functools
 import typing
 
 
@@ -44,8 +46,31 @@ class Future:
     def wait(self, timeout: typing.Optional[float] = None) -> None:
         self.__worker.join(timeout)
 
-    # def addDoneCallback(self, func: typing.Callable[[], None]) -> None:
-    #     self.__worker.callback = func
+    def add_done_callback(self, func: typing.Callable[['Future'], None]) -> None:
+        """
+        Call a function with this Future once it is done.
+        Callbacks are executed in order of completion on a dedicated dispatcher thread and must not block.
+        :param func: Function receiving the Future.
+        :return: None.
+        """
+        self.__worker.add_done_callback(functools.partial(func, self))
+
+    def as_concurrent(self) -> concurrent.futures.Future:
+        """
+        Get a concurrent.futures.Future completed together with this Future, e.g. for use with concurrent.futures.wait or asyncio.wrap_future.
+        :return: concurrent.futures.Future object.
+        """
+        c_future = concurrent.futures.Future()
+        c_future.set_running_or_notify_cancel()
+
+        def transfer(future: Future):
+            try:
+                c_future.set_result(future.result())
+            except Exception as ex:
+                c_future.set_exception(ex)
+
+        self.add_done_callback(transfer)
+        return c_future
 
     @property
     def name(self) -> str:
@@ -19,17 +19,18 @@ __all__ = ('ThreadWorker', 'EventWorker')
 
 
 from .future import Future
+from .callbacks import DoneCallbacks
 import threading
 import typing
 
 
-class ThreadWorker(threading.Thread):
+class ThreadWorker(threading.Thread, DoneCallbacks):
     def __init__(self, group=None, target=None, name=None, args=(), kwargs=None, *, daemon=None):
         super().__init__(group=group, target=target, name=name, args=args, kwargs=kwargs, daemon=daemon)
         self.result = None
         self.exception = None
         self.done = False
-        # self.callback = None
+        self._init_done_callbacks()
 
     def run(self) -> None:
         try:
@@ -41,11 +42,7 @@ class ThreadWorker(threading.Thread):
         except Exception as ex:
             self.exception = ex
         self.done = True
-        # if self.callback:
-        #     try:
-        #         self.callback()
-        #     except BaseException:
-        #         logger.exception("exception calling callback for '{}'".format(self.name))
+        self._run_done_callbacks()
 
     def start(self) -> Future:
         future = Future(self)
@@ -58,7 +55,7 @@ class ThreadWorker(threading.Thread):
             raise TimeoutError
 
 
-class EventWorker(threading.Event):
+class EventWorker(threading.Event, DoneCallbacks):
 
     __slots__ = (
         'name', 'result', 'exception', 'usr_method', 'usr_data', '_flag', '_cond', '__target', '__args', '__kwargs', '__started'
@@ -75,6 +72,7 @@ class EventWorker(threading.Event):
         self.__args = args
         self.__kwargs = kwargs
         self.__started = False
+        self._init_done_callbacks()
 
     @property
     def done(self):
@@ -94,6 +92,10 @@ class EventWorker(threading.Event):
             self.exception = ex
             self.set()
 
+    def set(self) -> None:
+        super().set()
+        self._run_done_callbacks()
+
     def join(self, timeout: typing.Optional[float] = None) -> None:
         if not self.wait(timeout):
             raise TimeoutError
@@ -19,6 +19,8 @@ __all__ = ('OpenIdClient', 'NoTokenError')
 from ..._util import get_logger
 from ..._configuration import cc_conf
 from ...client._protocol import http
+import threading
+import typing
 import time
 import json
 
@@ -48,10 +50,17 @@ class Token:
         self.max_age = max_age
         self.time_stamp = int(time.time())
 
+    def expired(self) -> bool:
+        return int(time.time()) - self.time_stamp >= self.max_age
+
 
 class OpenIdClient:
-    def __init__(self, url: str, usr: str, pw: str, id: str):
+    def __init__(self, url: str, usr: str, pw: str, id: str, pool: typing.Optional[http.ConnectionPool] = None):
+        fraction = cc_conf.connector.token_refresh_fraction
+        if fraction and not 0 < fraction < 1:
+            raise ValueError("token refresh fraction must be between 0 and 1 or 0 to disable background refresh")
         self.__url = url
+        self.__pool = pool
         self.__usr = usr
         self.__pw = pw
         self.__id = id
@@ -60,22 +69,49 @@ class OpenIdClient:
         self.__token_type = None
         self.__not_before_policy = None
         self.__session_state = None
+        self.__lock = threading.Lock()
+        self.__refresh_timer = None
 
     def get_access_token(self) -> str:
-        try:
-            if self.__access_token:
-                if int(time.time()) - self.__access_token.time_stamp >= self.__access_token.max_age:
-                    logger.debug('access token expired')
-                    if int(time.time()) - self.__refresh_token.time_stamp >= self.__refresh_token.max_age:
-                        logger.debug('refresh token expired')
-                        self.__token_request()
-                    else:
-                        self.__refresh_request()
-            else:
-                self.__token_request()
-            return self.__access_token.token
-        except (RequestError, ResponseError) as ex:
-            raise NoTokenError(ex)
+        access_token = self.__access_token
+        if access_token and not access_token.expired():
+            return access_token.token
+        with self.__lock:
+            try:
+                if self.__access_token:
+                    if self.__access_token.expired():
+                        logger.debug('access token expired')
+                        self.__renew()
+                else:
+                    self.__token_request()
+                return self.__access_token.token
+            except (RequestError, ResponseError) as ex:
+                raise NoTokenError(ex)
+
+    def __renew(self) -> None:
+        if self.__refresh_token.expired():
+            logger.debug('refresh token expired')
+            self.__token_request()
+        else:
+            self.__refresh_request()
+
+    def __background_refresh(self) -> None:
+        with self.__lock:
+            try:
+                logger.debug('refreshing access token ...')
+                self.__renew()
+            except (RequestError, ResponseError):
+                logger.warning('refreshing access token failed - retrying on next request')
+
+    def __schedule_refresh(self) -> None:
+        if self.__refresh_timer:
+            self.__refresh_timer.cancel()
+        fraction = cc_conf.connector.token_refresh_fraction
+        if fraction:
+            self.__refresh_timer = threading.Timer(self.__access_token.max_age * fraction, self.__background_refresh)
+            self.__refresh_timer.name = "token-refresh"
+            self.__refresh_timer.daemon = True
+            self.__refresh_timer.start()
 
     def __set_response(self, payload: str) -> None:
         try:
@@ -85,6 +121,7 @@ class OpenIdClient:
             self.__token_type = payload['token_type']
             self.__not_before_policy = payload['not-before-policy']
             self.__session_state = payload['session_state']
+            self.__schedule_refresh()
         except json.JSONDecodeError as ex:
             logger.error("could not decode response - {}".format(ex))
             raise ResponseError
@@ -98,7 +135,8 @@ class OpenIdClient:
             method=http.Method.POST,
             body=payload,
             content_type=http.ContentType.form,
-            timeout=cc_conf.connector.request_timeout
+            timeout=cc_conf.connector.request_timeout,
+            pool=self.__pool
         )
         try:
             resp = req.send()
@@ -0,0 +1,71 @@
+"""
+   Copyright 2019 InfAI (CC SES)
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+__all__ = ("BatchResult", )
+
+
+import typing
+
+
+class BatchResult:
+    """
+    Outcome of a batch operation per item.
+    """
+
+    __slots__ = ('__results', )
+
+    def __init__(self, results: typing.Dict[str, typing.Optional[Exception]]):
+        """
+        :param results: Mapping of item IDs to an exception or None if the operation succeeded.
+        """
+        self.__results = results
+
+    @property
+    def succeeded(self) -> typing.List[str]:
+        return [key for key, ex in self.__results.items() if ex is None]
+
+    @property
+    def failed(self) -> typing.Dict[str, Exception]:
+        return {key: ex for key, ex in self.__results.items() if ex is not None}
+
+    def ok(self) -> bool:
+        """
+        Check if the operation succeeded for all items.
+        :return: Boolean.
+        """
+        return all(ex is None for ex in self.__results.values())
+
+    def __getitem__(self, key: str) -> typing.Optional[Exception]:
+        return self.__results[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__results
+
+    def __iter__(self):
+        return iter(self.__results.items())
+
+    def __len__(self):
+        return len(self.__results)
+
+    def __repr__(self):
+        """
+        Provide a string representation.
+        :return: String.
+        """
+        attributes = [('succeeded', len(self.succeeded)), ('failed', repr(self.failed))]
+        return "{}({})".format(
+            __class__.__name__, ", ".join(["=".join([key, str(value)]) for key, value in attributes])
+        )
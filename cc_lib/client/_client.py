@@ -18,25 +18,68 @@ __all__ = ("Client", "CompletionStrategy")
 
 
 from .._configuration import cc_conf
-from .._util import validate_instance, calc_duration, get_logger
+from .._util import validate_instance, calc_duration, get_logger, TypeValidation
 from .._model import DeviceAttribute
 from ..types import Device
-from ..types.message import CommandEnvelope, CommandResponseEnvelope, EventEnvelope, FogProcessesEnvelope, DeviceMessage, ClientErrorEnvelope, DeviceErrorEnvelope, CommandErrorEnvelope
+from ..types.message import CorrelationIds, CommandEnvelope, LazyCommandEnvelope, CommandResponseEnvelope, EventEnvelope, FogProcessesEnvelope, DeviceMessage, ClientErrorEnvelope, DeviceErrorEnvelope, CommandErrorEnvelope, response_from_command_envelope, error_from_command_envelope
 from ._exception import *
 from ._auth import OpenIdClient, NoTokenError
 from ._protocol import http, mqtt
-from ._asynchron import Future, ThreadWorker, EventWorker
+from ._asynchron import Future, ThreadWorker, EventWorker, Completion, Executor, KeyedDispatcher, current_task
+from ._spool import Spool
+from ._batch import BatchResult
+from ._registry import SubscriptionRegistry
+from ._router import TopicRouter, filter_from_template, filters_overlap
+from ._queue import MessageQueue
+from ._dedup import CommandDeduplicator
+from ._serializer import Serializer, get_serializer
+from ._topics import TopicCache
+import itertools
+import asyncio
 import typing
 import datetime
 import hashlib
+import re
 import time
 import queue
 import threading
+import logging
 import json
 
 
 logger = get_logger(__name__.rsplit(".", 1)[-1].replace("_", ""))
 
+# strings with escape sequences are not matched and left to the decoder
+_string_value = r'"[^"\\]*"'
+_number_value = r'[-+.\deE]+'
+
+
+def _field_re(name: str, value: str) -> typing.Tuple[typing.Pattern, typing.Pattern]:
+    pattern = r'(?<!\\)"{}"\s*:\s*({})'.format(name, value)
+    return re.compile(pattern), re.compile(pattern.encode())
+
+
+_raw_field_re = {
+    "correlation_id": _field_re("correlation_id", _string_value),
+    "timestamp": _field_re("timestamp", "{}|{}".format(_string_value, _number_value))
+}
+
+
+def _raw_field(raw: typing.Union[str, bytes], name: str) -> typing.Optional[str]:
+    """
+    Read a top level field of a command without decoding the whole payload.
+    :param raw: Raw command payload.
+    :param name: Field name, 'correlation_id' or 'timestamp'.
+    :return: Field value as string or None if the payload contains no or more than one key with the given name.
+    """
+    matches = _raw_field_re[name][isinstance(raw, bytes)].findall(raw)
+    if len(matches) != 1:
+        return None
+    value = matches[0]
+    if isinstance(value, bytes):
+        value = value.decode()
+    return value.strip('"')
+
 
 def _hashDevices(devices: typing.Union[typing.Tuple[Device], typing.List[Device]]) -> str:
     """
@@ -58,46 +101,129 @@ class Client:
     """
     Client class for client-connector projects.
     """
-    def __init__(self, user: typing.Optional[str] = None, pw: typing.Optional[str] = None, client_id: typing.Optional[str] = None, device_id_prefix: typing.Optional[str] = None, device_attribute_origin: typing.Optional[str] = None, fog_processes: typing.Optional[bool] = False, fog_analytics: typing.Optional[bool] = False):
+    def __init__(self, user: typing.Optional[str] = None, pw: typing.Optional[str] = None, client_id: typing.Optional[str] = None, device_id_prefix: typing.Optional[str] = None, device_attribute_origin: typing.Optional[str] = None, fog_processes: typing.Optional[bool] = False, fog_analytics: typing.Optional[bool] = False, executor: typing.Optional[Executor] = None, event_loop: typing.Optional[asyncio.AbstractEventLoop] = None, serializer: typing.Optional[Serializer] = None):
         """
         Create a Client instance. Set device manager, initiate configuration and library logging facility.
+        :param executor: Executor running background work. If none is given an executor will be created from the configuration.
+        :param serializer: Codec for outgoing and incoming messages. If none is given connector.serializer is used.
+        :param event_loop: If given the MQTT connection is driven by this asyncio event loop instead of a loop thread.
         """
+        validate_instance(executor, (Executor, type(None)))
+        validate_instance(event_loop, (asyncio.AbstractEventLoop, type(None)))
+        validate_instance(serializer, (Serializer, type(None)))
+        self.__correlation_ids = CorrelationIds(
+            strategy=cc_conf.connector.correlation_id_strategy,
+            lazy=cc_conf.connector.lazy_correlation_id
+        )
+        self.__event_loop = event_loop
+        self.__serializer = serializer or get_serializer(cc_conf.connector.serializer)
         self.__user = user or cc_conf.credentials.user
         self.__pw = pw or cc_conf.credentials.pw
         self.__device_id_prefix = device_id_prefix
+        self.__topics = TopicCache(cc_conf.api, device_id_prefix=device_id_prefix, max_size=cc_conf.connector.topic_cache_size)
         self.__device_attribute_origin = device_attribute_origin or cc_conf.device_attribute_origin
         self.__fog_processes = fog_processes
         self.__fog_analytics = fog_analytics
-        self.__auth = OpenIdClient(cc_conf.api.auth_endpt, self.__user, self.__pw, client_id or cc_conf.credentials.client_id)
+        self.__http_pool = http.ConnectionPool(
+            size=cc_conf.connector.http_pool_size,
+            idle_timeout=cc_conf.connector.http_pool_idle_timeout,
+            retries=cc_conf.connector.http_pool_retries
+        )
+        self.__auth = OpenIdClient(
+            cc_conf.api.auth_endpt,
+            self.__user,
+            self.__pw,
+            client_id or cc_conf.credentials.client_id,
+            pool=self.__http_pool
+        )
         self.__comm = None
         self.__connected_flag = False
         self.__connect_lock = threading.Lock()
         self.__reconnect_flag = False
-        self.__cmd_queue = queue.Queue()
-        self.__fog_prcs_queue = queue.Queue()
-        self.__fog_analyt_queue = queue.Queue()
+        self.__cmd_queue = MessageQueue(
+            maxsize=cc_conf.queue.command_size,
+            overflow_policy=cc_conf.queue.overflow_policy,
+            spill_dir=cc_conf.queue.spill_dir
+        )
+        self.__cmd_handlers = dict()
+        self.__cmd_dispatcher = None
+        self.__cmd_handler_lock = threading.Lock()
+        self.__cmd_dedup = CommandDeduplicator(
+            max_size=cc_conf.connector.command_dedup_size,
+            ttl=cc_conf.connector.command_dedup_ttl
+        ) if cc_conf.connector.command_dedup else None
+        self.__cmd_max_age = dict()
+        self.__cmd_expired = 0
+        self.__fog_prcs_queue = MessageQueue(
+            maxsize=cc_conf.queue.fog_processes_size,
+            overflow_policy=cc_conf.queue.overflow_policy,
+            spill_dir=cc_conf.queue.spill_dir
+        )
+        self.__fog_analyt_queue = MessageQueue(
+            maxsize=cc_conf.queue.fog_analytics_size,
+            overflow_policy=cc_conf.queue.overflow_policy,
+            spill_dir=cc_conf.queue.spill_dir
+        )
         self.__workers = list()
+        self.__executor = executor or Executor(
+            max_workers=cc_conf.connector.executor_max_workers,
+            queue_size=cc_conf.connector.executor_queue_size,
+            name="client-executor"
+        )
         self.__hub_sync_event = threading.Event()
         self.__hub_sync_event.set()
         self.__hub_sync_lock = threading.Lock()
         self.__connect_clbk = None
         self.__disconnect_clbk = None
+        self.__resubscribe_clbk = None
+        self.__command_clbk = None
+        self.__fog_prcs_clbk = None
+        self.__subscriptions = SubscriptionRegistry()
+        self.__resubscribe_metrics = {
+            "resubscribe_pending": 0,
+            "resubscribe_restored": 0,
+            "resubscribe_failed": 0,
+            "resubscribe_duration": 0
+        }
         self.__set_clbk_lock = threading.RLock()
         self.__hub_id = None
-        cmd_sub_topic = cc_conf.api.command_sub_topic.split("/")
-        self.__command_sub_topic_map = {
-            "identifier": cmd_sub_topic.index(cc_conf.router.command_sub_topic_identifier),
-            "device_id": cmd_sub_topic.index("{device_id}"),
-            "service_id": cmd_sub_topic.index("+")
-        }
-        fog_prcs_topic = cc_conf.api.fog_processes_sub_topic.split("/")
-        self.__fog_processes_sub_topic_map = {
-            "identifier": fog_prcs_topic.index(cc_conf.router.fog_processes_sub_topic_identifier),
-            "sub_topic": fog_prcs_topic.index("#")
-        }
+        self.__spool = None
+        if cc_conf.spool.enabled:
+            self.__spool = Spool(
+                path=cc_conf.spool.path,
+                max_messages=cc_conf.spool.max_messages,
+                eviction_policy=cc_conf.spool.eviction_policy
+            )
+        self.__spool_lock = threading.Lock()
+        self.__spool_draining = False
+        self.__router = TopicRouter()
+        cmd_filter, cmd_names = filter_from_template(
+            cc_conf.api.command_sub_topic,
+            {"device_id": "device_id", "+": "service_uri"}
+        )
+        self.__router.add(topic_filter=cmd_filter, handler=self.__handle_command, names=cmd_names)
+        fog_prcs_filter, fog_prcs_names = filter_from_template(cc_conf.api.fog_processes_sub_topic, {"#": "sub_topic"})
+        self.__router.add(topic_filter=fog_prcs_filter, handler=self.__handle_fog_process, names=fog_prcs_names)
+        self.__reserved_filters = (cmd_filter, fog_prcs_filter)
+        self.__check_router_conf(cmd_filter, fog_prcs_filter)
+        self.__routes = dict()
+        self.__routes_lock = threading.Lock()
 
     # ------------- internal methods ------------- #
 
+    @staticmethod
+    def __check_router_conf(cmd_filter: str, fog_prcs_filter: str) -> None:
+        defaults = (
+            ("command_sub_topic_identifier", cmd_filter, "command_sub_topic"),
+            ("fog_processes_sub_topic_identifier", fog_prcs_filter, "fog_processes_sub_topic")
+        )
+        for key, topic_filter, api_key in defaults:
+            identifier = getattr(cc_conf.router, key)
+            if identifier != getattr(type(cc_conf.router), key):
+                logger.warning("'router.{}' is deprecated - topics are routed via 'api.{}'".format(key, api_key))
+            if identifier not in topic_filter.split("/"):
+                raise ValueError("'router.{}' value '{}' not in '{}'".format(key, identifier, getattr(cc_conf.api, api_key)))
+
     def __init_hub(self, hub_id, hub_name) -> str:
         try:
             logger.info("initializing hub ...")
@@ -118,7 +244,8 @@ class Client:
                     },
                     content_type=http.ContentType.json,
                     headers={"Authorization": "Bearer {}".format(access_token)},
-                    timeout=cc_conf.connector.request_timeout
+                    timeout=cc_conf.connector.request_timeout,
+                    pool=self.__http_pool
                 )
                 resp = req.send()
                 if not resp.status == 200:
@@ -126,6 +253,7 @@ class Client:
                     raise HubInitializationError
                 hub = json.loads(resp.body)
                 self.__hub_id = hub["id"]
+                self.__correlation_ids.set_scope(self.__hub_id)
                 logger.debug("hub ID '{}'".format(self.__hub_id))
                 logger.info("initializing hub successful")
                 return self.__hub_id
@@ -135,11 +263,13 @@ class Client:
                     url="{}/{}".format(cc_conf.api.hub_endpt, http.url_encode(hub_id)),
                     method=http.Method.HEAD,
                     headers={"Authorization": "Bearer {}".format(access_token)},
-                    timeout=cc_conf.connector.request_timeout
+                    timeout=cc_conf.connector.request_timeout,
+                    pool=self.__http_pool
                 )
                 resp = req.send()
                 if resp.status == 200:
                     self.__hub_id = hub_id
+                    self.__correlation_ids.set_scope(self.__hub_id)
                     logger.info("initializing hub successful")
                     return self.__hub_id
                 elif resp.status == 404:
@@ -191,7 +321,8 @@ class Client:
                     method=http.Method.GET,
                     content_type=http.ContentType.json,
                     headers={"Authorization": "Bearer {}".format(access_token)},
-                    timeout=cc_conf.connector.request_timeout
+                    timeout=cc_conf.connector.request_timeout,
+                    pool=self.__http_pool
                 )
                 resp = req.send()
                 if resp.status == 200:
@@ -210,7 +341,8 @@ class Client:
                             },
                             content_type=http.ContentType.json,
                             headers={"Authorization": "Bearer {}".format(access_token)},
-                            timeout=cc_conf.connector.request_timeout
+                            timeout=cc_conf.connector.request_timeout,
+                            pool=self.__http_pool
                         )
                         resp = req.send()
                         if resp.status == 400:
@@ -254,11 +386,11 @@ class Client:
         self.__hub_sync_event.set()
         self.__hub_sync_lock.release()
 
-    def __add_device(self, device: Device, worker: bool = False) -> None:
-        if self.__hub_id:
+    def __add_device(self, device: Device, worker: bool = False, consistency_delay: bool = True, sync_wait: bool = True) -> bool:
+        if self.__hub_id and sync_wait:
             self.__hub_sync_event.wait()
         if worker:
-            self.__workers.append(threading.current_thread())
+            self.__workers.append(current_task())
         try:
             logger.info("adding device '{}' to platform ...".format(device.id))
             access_token = self.__auth.get_access_token()
@@ -269,7 +401,8 @@ class Client:
                 ),
                 method=http.Method.GET,
                 headers={"Authorization": "Bearer {}".format(access_token)},
-                timeout=cc_conf.connector.request_timeout
+                timeout=cc_conf.connector.request_timeout,
+                pool=self.__http_pool
             )
             resp = req.send()
             if resp.status == 404:
@@ -284,7 +417,8 @@ class Client:
                     },
                     content_type=http.ContentType.json,
                     headers={"Authorization": "Bearer {}".format(access_token)},
-                    timeout=cc_conf.connector.request_timeout
+                    timeout=cc_conf.connector.request_timeout,
+                    pool=self.__http_pool
                 )
                 resp = req.send()
                 if not resp.status == 200:
@@ -292,16 +426,18 @@ class Client:
                         "adding device '{}' to platform failed - {} {}".format(device.id, resp.status, resp.body)
                     )
                     raise DeviceAddError
-                logger.debug(
-                    "adding device '{}' to platform - waiting {}s for eventual consistency".format(
-                        device.id,
-                        cc_conf.connector.eventual_consistency_delay
+                if consistency_delay:
+                    logger.debug(
+                        "adding device '{}' to platform - waiting {}s for eventual consistency".format(
+                            device.id,
+                            cc_conf.connector.eventual_consistency_delay
+                        )
                     )
-                )
-                time.sleep(cc_conf.connector.eventual_consistency_delay)
+                    time.sleep(cc_conf.connector.eventual_consistency_delay)
                 logger.info("adding device '{}' to platform successful".format(device.id))
                 device_atr = json.loads(resp.body)
                 setattr(device, '_{}__{}'.format(Device.__name__, "remote_id"), device_atr["id"])
+                return True
             elif resp.status == 200:
                 logger.warning("adding device '{}' to platform - device exists - updating device ...".format(device.id))
                 device_atr = json.loads(resp.body)
@@ -320,12 +456,70 @@ class Client:
             logger.warning("adding device '{}' to platform - could not decode response - {}".format(device.id, ex))
         except KeyError as ex:
             logger.warning("adding device '{}' to platform - malformed response - missing key {}".format(device.id, ex))
+        return False
+
+    def __add_devices(self, devices: typing.List[Device], concurrency: int, worker: bool = False) -> BatchResult:
+        if self.__hub_id:
+            self.__hub_sync_event.wait()
+        if worker:
+            self.__workers.append(current_task())
+        logger.info("adding {} devices to platform ...".format(len(devices)))
+        results = dict()
+        created = list()
+        device_queue = queue.Queue()
+        for device in devices:
+            device_queue.put_nowait(device)
+        remaining = [len(devices)]
+        finished = threading.Condition()
+
+        def add():
+            while True:
+                try:
+                    device = device_queue.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    # the calling task already waited for hub synchronization and is tracked by sync_hub
+                    if self.__add_device(device, consistency_delay=False, sync_wait=False):
+                        created.append(device.id)
+                    results[device.id] = None
+                except Exception as ex:
+                    results[device.id] = ex
+                with finished:
+                    remaining[0] -= 1
+                    if not remaining[0]:
+                        finished.notify_all()
+
+        # helpers run on the shared executor, the calling thread works the queue too so progress
+        # does not depend on free executor threads
+        for num in range(min(concurrency, len(devices)) - 1):
+            try:
+                self.__executor.submit(target=add, name="add-devices-{}".format(num), block=False)
+            except queue.Full:
+                break
+        add()
+        with finished:
+            finished.wait_for(lambda: not remaining[0])
+        if created:
+            logger.debug(
+                "adding {} devices to platform - waiting {}s for eventual consistency".format(
+                    len(created),
+                    cc_conf.connector.eventual_consistency_delay
+                )
+            )
+            time.sleep(cc_conf.connector.eventual_consistency_delay)
+        result = BatchResult(results)
+        if result.ok():
+            logger.info("adding {} devices to platform successful".format(len(devices)))
+        else:
+            logger.error("adding devices to platform failed for {} of {} devices".format(len(result.failed), len(devices)))
+        return result
 
     def __delete_device(self, device_id: str, worker: bool = False) -> None:
         if self.__hub_id:
             self.__hub_sync_event.wait()
         if worker:
-            self.__workers.append(threading.current_thread())
+            self.__workers.append(current_task())
         try:
             logger.info("deleting device '{}' from platform ...".format(device_id))
             access_token = self.__auth.get_access_token()
@@ -336,7 +530,8 @@ class Client:
                 ),
                 method=http.Method.DELETE,
                 headers={"Authorization": "Bearer {}".format(access_token)},
-                timeout=cc_conf.connector.request_timeout
+                timeout=cc_conf.connector.request_timeout,
+                pool=self.__http_pool
             )
             resp = req.send()
             if resp.status == 200:
@@ -377,7 +572,8 @@ class Client:
                 },
                 content_type=http.ContentType.json,
                 headers={"Authorization": "Bearer {}".format(access_token)},
-                timeout=cc_conf.connector.request_timeout
+                timeout=cc_conf.connector.request_timeout,
+                pool=self.__http_pool
             )
             resp = req.send()
             if resp.status == 200:
@@ -434,14 +630,139 @@ class Client:
             logger.error("connecting to fog {} failed - {}".format(event_worker.usr_data, ex))
             raise FogConnectError
 
+    def __route_subscribe_on_done(self, event_worker):
+        if event_worker.exception:
+            try:
+                raise event_worker.exception
+            except mqtt.SubscribeError as ex:
+                event_worker.exception = RouteSubscribeError(ex)
+                logger.error("subscribing route '{}' failed - {}".format(event_worker.usr_data, ex))
+        else:
+            logger.debug("subscribing route '{}' successful".format(event_worker.usr_data))
+
+    def __route_subscribe(self, topic_filter: str, event_worker) -> None:
+        if not self.__connected_flag:
+            logger.debug("subscribing route '{}' on connect".format(topic_filter))
+            event_worker.set()
+            return
+        try:
+            self.__comm.subscribe(topic=topic_filter, qos=cc_conf.connector.qos, event_worker=event_worker)
+        except mqtt.NotConnectedError:
+            logger.debug("subscribing route '{}' on connect".format(topic_filter))
+            event_worker.set()
+        except mqtt.SubscribeError as ex:
+            logger.error("subscribing route '{}' failed - {}".format(topic_filter, ex))
+            raise RouteSubscribeError(ex)
+
+    def __route_unsubscribe_on_done(self, event_worker):
+        if event_worker.exception:
+            event_worker.exception = RouteError(event_worker.exception)
+            logger.error("unsubscribing route '{}' failed - {}".format(event_worker.usr_data, event_worker.exception))
+
+    def __route_unsubscribe(self, topic_filter: str, event_worker) -> None:
+        if not self.__connected_flag:
+            event_worker.set()
+            return
+        try:
+            self.__comm.unsubscribe(topic=topic_filter, event_worker=event_worker)
+        except mqtt.NotConnectedError:
+            event_worker.set()
+        except mqtt.UnsubscribeError as ex:
+            logger.error("unsubscribing route '{}' failed - {}".format(topic_filter, ex))
+            raise RouteError(ex)
+
+    def __spool_messages(self, messages: typing.List[typing.Tuple[str, str]], qos: int) -> bool:
+        with self.__spool_lock:
+            if self.__connected_flag and not self.__spool_draining:
+                return False
+            for topic, payload in messages:
+                if not self.__spool.put(topic=topic, payload=payload, qos=qos):
+                    raise SendError("spool full")
+        return True
+
+    def __drain_spool(self):
+        logger.info("draining spool - {} messages ...".format(len(self.__spool)))
+        try:
+            while self.__connected_flag:
+                start = time.time()
+                items = self.__spool.peek(cc_conf.spool.drain_batch_size)
+                if not items:
+                    logger.info("draining spool successful")
+                    break
+                futures = list()
+                for qos, group in itertools.groupby(items, key=lambda item: item[3]):
+                    worker = EventWorker(
+                        target=self.__comm.publish_batch,
+                        args=([(item[1], item[2]) for item in group], qos),
+                        name="drain-spool",
+                        usr_method=lambda event_worker: None
+                    )
+                    futures.append(worker.start())
+                try:
+                    for future in futures:
+                        future.wait()
+                        future.result()
+                except Exception as ex:
+                    if not self.__connected_flag or isinstance(ex, mqtt.NotConnectedError):
+                        logger.warning("draining spool interrupted - {}".format(ex))
+                        break
+                    logger.error("draining spool - dropping {} messages - {}".format(len(items), ex))
+                self.__spool.remove([item[0] for item in items])
+                if cc_conf.spool.drain_rate > 0:
+                    delay = len(items) / cc_conf.spool.drain_rate - (time.time() - start)
+                    if delay > 0:
+                        time.sleep(delay)
+        finally:
+            with self.__spool_lock:
+                restart = self.__connected_flag and len(self.__spool) > 0
+                if not restart:
+                    self.__spool_draining = False
+            if restart:
+                self.__submit_from_loop(target=self.__drain_spool, args=(), name="drain-spool")
+
+    def __submit_from_loop(self, target: typing.Callable, args: tuple, name: str) -> None:
+        """
+        Submit work from the MQTT loop or an executor thread without blocking it. Runs the work on a dedicated thread if the executor queue is full.
+        """
+        try:
+            self.__executor.submit(target=target, args=args, name=name, block=False)
+        except queue.Full:
+            logger.warning("executor queue full - running '{}' on a dedicated thread".format(name))
+            threading.Thread(target=target, args=args, name=name, daemon=True).start()
+
     def __on_connect(self) -> None:
-        self.__connected_flag = True
+        if self.__spool is not None:
+            with self.__spool_lock:
+                self.__connected_flag = True
+                drain = len(self.__spool) > 0 and not self.__spool_draining
+                if drain:
+                    self.__spool_draining = True
+            if drain:
+                self.__submit_from_loop(target=self.__drain_spool, args=(), name="drain-spool")
+        else:
+            self.__connected_flag = True
         logger.info(
             "connecting to '{}' on '{}' successful".format(
                 cc_conf.connector.host,
                 cc_conf.connector.port
             )
         )
+        if len(self.__subscriptions):
+            self.__submit_from_loop(
+                target=self.__restore_subscriptions,
+                args=(self.__subscriptions.keys(), ),
+                name="restore-subscriptions"
+            )
+        with self.__routes_lock:
+            routes = list(self.__routes)
+        for topic_filter in routes:
+            EventWorker(
+                target=self.__route_subscribe,
+                args=(topic_filter, ),
+                name="subscribe-route-{}".format(topic_filter),
+                usr_method=self.__route_subscribe_on_done,
+                usr_data=topic_filter
+            ).start()
         if self.__fog_processes:
             worker = EventWorker(
                 target=self.__fog_subscribe,
@@ -461,8 +782,7 @@ class Client:
         #     )
         #     worker.start()
         if self.__connect_clbk:
-            clbk_thread = threading.Thread(target=self.__connect_clbk, args=(self, ), name="user-connect-callback", daemon=True)
-            clbk_thread.start()
+            self.__submit_from_loop(target=self.__connect_clbk, args=(self, ), name="user-connect-callback")
 
     def __on_disconnect(self, code: int, reason: str) -> None:
         self.__connected_flag = False
@@ -475,13 +795,7 @@ class Client:
         else:
             logger.info("client disconnected")
         if self.__disconnect_clbk:
-            clbk_thread = threading.Thread(
-                target=self.__disconnect_clbk,
-                args=(self, ),
-                name="user-disconnect-callback",
-                daemon=True
-            )
-            clbk_thread.start()
+            self.__submit_from_loop(target=self.__disconnect_clbk, args=(self, ), name="user-disconnect-callback")
         if self.__reconnect_flag:
             reconnect_thread = threading.Thread(target=self.__reconnect, name="reconnect", daemon=True)
             reconnect_thread.start()
@@ -504,7 +818,15 @@ class Client:
         self.__connect_lock.release()
 
     def __connect(self, event_worker) -> None:
-        self.__connect_lock.acquire()
+        if not self.__connect_lock.acquire(blocking=not self.__on_event_loop()):
+            # a pending connect is completed by the event loop this call is blocking
+            logger.error(
+                "connecting to '{}' on '{}' failed - connect in progress".format(
+                    cc_conf.connector.host,
+                    cc_conf.connector.port
+                )
+            )
+            raise ConnectError("connect in progress")
         if self.__connected_flag:
             self.__connect_lock.release()
             logger.error(
@@ -525,6 +847,10 @@ class Client:
                 msg_retry=cc_conf.connector.msg_retry,
                 keepalive=cc_conf.connector.keepalive,
                 loop_time=cc_conf.connector.loop_time,
+                loop_mode=mqtt.LoopMode.asyncio if self.__event_loop else cc_conf.connector.loop_mode,
+                event_loop=self.__event_loop,
+                publish_timeout=cc_conf.connector.publish_timeout,
+                subscribe_timeout=cc_conf.connector.subscribe_timeout,
                 tls=cc_conf.connector.tls,
                 clean_session=cc_conf.connector.clean_session,
                 logging=cc_conf.connector.low_level_logger
@@ -540,6 +866,14 @@ class Client:
             event_worker=event_worker
         )
 
+    def __on_event_loop(self) -> bool:
+        if not self.__event_loop:
+            return False
+        try:
+            return asyncio.get_running_loop() is self.__event_loop
+        except RuntimeError:
+            return False
+
     def __reconnect(self, retry: int = 0):
         while not self.__connected_flag:
             if not self.__reconnect_flag:
@@ -582,6 +916,7 @@ class Client:
                 event_worker.exception = NotConnectedError
                 logger.error("connecting device '{}' to platform failed - not connected".format(event_worker.usr_data))
         else:
+            self.__subscriptions.add((event_worker.usr_data, ))
             logger.info("connecting device '{}' to platform successful".format(event_worker.usr_data))
 
     def __connect_device(self, device_id: str, event_worker) -> None:
@@ -591,9 +926,7 @@ class Client:
             raise NotConnectedError
         try:
             self.__comm.subscribe(
-                topic=cc_conf.api.command_sub_topic.format(
-                    device_id=self.__prefix_device_id(device_id) if self.__device_id_prefix else device_id
-                ),
+                topic=self.__topics.command_sub(device_id),
                 qos=cc_conf.connector.qos,
                 event_worker=event_worker
             )
@@ -612,6 +945,7 @@ class Client:
                 event_worker.exception = DeviceDisconnectError(ex)
                 logger.error("disconnecting device '{}' from platform failed - {}".format(event_worker.usr_data, ex))
         else:
+            self.__subscriptions.remove((event_worker.usr_data, ))
             logger.info("disconnecting device '{}' from platform successful".format(event_worker.usr_data))
 
     def __disconnect_device(self, device_id: str, event_worker) -> None:
@@ -621,9 +955,7 @@ class Client:
             raise NotConnectedError
         try:
             self.__comm.unsubscribe(
-                topic=cc_conf.api.command_sub_topic.format(
-                    device_id=self.__prefix_device_id(device_id) if self.__device_id_prefix else device_id
-                ),
+                topic=self.__topics.command_sub(device_id),
                 event_worker=event_worker
             )
         except mqtt.NotConnectedError:
@@ -633,26 +965,149 @@ class Client:
             logger.error("disconnecting device '{}' from platform failed - {}".format(device_id, ex))
             raise DeviceDisconnectError
 
-    def __route_message(self, payload: typing.Union[str, bytes], topic: str):
+    def __subscribe_devices(self, topics: typing.List[str], event_worker) -> None:
+        if not self.__connected_flag:
+            raise NotConnectedError
         try:
-            topic_parts = topic.split("/")
-            if topic_parts[self.__command_sub_topic_map["identifier"]] == cc_conf.router.command_sub_topic_identifier:
-                self.__handle_command(
-                    payload=payload,
-                    device_id=topic_parts[self.__command_sub_topic_map["device_id"]],
-                    service_uri=topic_parts[self.__command_sub_topic_map["service_id"]]
+            self.__comm.subscribe_many(topics=topics, qos=cc_conf.connector.qos, event_worker=event_worker)
+        except mqtt.NotConnectedError:
+            raise NotConnectedError
+
+    def __unsubscribe_devices(self, topics: typing.List[str], event_worker) -> None:
+        if not self.__connected_flag:
+            raise NotConnectedError
+        try:
+            self.__comm.unsubscribe_many(topics=topics, event_worker=event_worker)
+        except mqtt.NotConnectedError:
+            raise NotConnectedError
+
+    def __device_chunks(self, device_ids: typing.List[str], target: typing.Callable, name: str) -> typing.List[typing.Tuple[typing.List[str], Future]]:
+        chunk_size = cc_conf.connector.subscribe_chunk_size
+        chunks = list()
+        for pos in range(0, len(device_ids), chunk_size):
+            chunk = device_ids[pos:pos + chunk_size]
+            worker = EventWorker(
+                target=target,
+                args=(
+                    [self.__topics.command_sub(device_id) for device_id in chunk],
+                ),
+                name="{}-{}".format(name, pos),
+                usr_method=lambda event_worker: None,
+                usr_data=chunk
+            )
+            chunks.append((chunk, worker.start()))
+        return chunks
+
+    def __subscribe_results(self, chunk: typing.List[str], future: Future) -> typing.Dict[str, typing.Optional[Exception]]:
+        future.wait()
+        results = dict()
+        try:
+            for device_id, qos in zip(chunk, future.result()):
+                if qos == 128:
+                    results[device_id] = DeviceConnectNotAllowedError("subscribe request not allowed")
+                else:
+                    results[device_id] = None
+        except (NotConnectedError, mqtt.NotConnectedError):
+            for device_id in chunk:
+                results[device_id] = NotConnectedError()
+        except Exception as ex:
+            for device_id in chunk:
+                results[device_id] = DeviceConnectError(ex)
+        self.__subscriptions.add(device_id for device_id, ex in results.items() if ex is None)
+        return results
+
+    def __connect_devices(self, device_ids: typing.List[str]) -> BatchResult:
+        logger.info("connecting {} devices to platform ...".format(len(device_ids)))
+        results = dict()
+        for chunk, future in self.__device_chunks(device_ids, self.__subscribe_devices, "subscribe-devices"):
+            results.update(self.__subscribe_results(chunk, future))
+        result = BatchResult(results)
+        if result.ok():
+            logger.info("connecting {} devices to platform successful".format(len(device_ids)))
+        else:
+            logger.error(
+                "connecting devices to platform failed for {} of {} devices".format(len(result.failed), len(device_ids))
+            )
+        return result
+
+    def __disconnect_devices(self, device_ids: typing.List[str]) -> BatchResult:
+        logger.info("disconnecting {} devices from platform ...".format(len(device_ids)))
+        results = dict()
+        for chunk, future in self.__device_chunks(device_ids, self.__unsubscribe_devices, "unsubscribe-devices"):
+            future.wait()
+            try:
+                future.result()
+                for device_id in chunk:
+                    results[device_id] = None
+            except (NotConnectedError, mqtt.NotConnectedError):
+                for device_id in chunk:
+                    results[device_id] = NotConnectedError()
+            except Exception as ex:
+                for device_id in chunk:
+                    results[device_id] = DeviceDisconnectError(ex)
+        self.__subscriptions.remove(device_id for device_id, ex in results.items() if ex is None)
+        result = BatchResult(results)
+        if result.ok():
+            logger.info("disconnecting {} devices from platform successful".format(len(device_ids)))
+        else:
+            logger.error(
+                "disconnecting devices from platform failed for {} of {} devices".format(len(result.failed), len(device_ids))
+            )
+        return result
+
+    def __restore_subscriptions(self, device_ids: typing.List[str]) -> BatchResult:
+        logger.info("restoring subscriptions for {} devices ...".format(len(device_ids)))
+        start = time.time()
+        self.__resubscribe_metrics["resubscribe_pending"] = len(device_ids)
+        self.__resubscribe_metrics["resubscribe_restored"] = 0
+        self.__resubscribe_metrics["resubscribe_failed"] = 0
+        results = dict()
+        for chunk, future in self.__device_chunks(device_ids, self.__subscribe_devices, "restore-subscriptions"):
+            chunk_results = self.__subscribe_results(chunk, future)
+            failed = sum(1 for ex in chunk_results.values() if ex is not None)
+            self.__resubscribe_metrics["resubscribe_pending"] -= len(chunk)
+            self.__resubscribe_metrics["resubscribe_restored"] += len(chunk) - failed
+            self.__resubscribe_metrics["resubscribe_failed"] += failed
+            results.update(chunk_results)
+        self.__resubscribe_metrics["resubscribe_duration"] = time.time() - start
+        result = BatchResult(results)
+        if result.ok():
+            logger.info(
+                "restoring subscriptions for {} devices successful - took {:.3f}s".format(
+                    len(device_ids),
+                    self.__resubscribe_metrics["resubscribe_duration"]
                 )
-            elif topic_parts[self.__fog_processes_sub_topic_map["identifier"]] == cc_conf.router.fog_processes_sub_topic_identifier:
-                self.__handle_fog_process(
-                    payload=payload,
-                    sub_topic="/".join(topic_parts[self.__fog_processes_sub_topic_map["sub_topic"]:]))
+            )
+        else:
+            logger.error(
+                "restoring subscriptions failed for {} of {} devices".format(len(result.failed), len(device_ids))
+            )
+        with self.__set_clbk_lock:
+            clbk = self.__resubscribe_clbk
+        if clbk:
+            try:
+                clbk(self, result)
+            except Exception:
+                logger.exception("resubscribe callback failed")
+        return result
+
+    def __route_message(self, payload: typing.Union[str, bytes], topic: str):
+        try:
+            route = self.__router.match(topic)
+            if route:
+                handler, params = route
+                handler(payload, topic, **params)
+            else:
+                logger.debug("no route for received message - topic: {}".format(topic))
         except Exception as ex:
             logger.error("routing received message failed - {}\ntopic: {}\npayload: {}".format(ex, topic, payload))
 
-    def __handle_fog_process(self, payload: typing.Union[str, bytes], sub_topic: str):
+    def __handle_fog_process(self, payload: typing.Union[str, bytes], topic: str, sub_topic: str):
         logger.debug("received fog processes message ...\nsub id: {}\npayload: '{}'".format(sub_topic, payload))
         try:
-            self.__fog_prcs_queue.put_nowait(FogProcessesEnvelope(sub_topic=sub_topic, message=payload))
+            self.__fog_prcs_queue.put(FogProcessesEnvelope(sub_topic=sub_topic, message=payload))
+            if self.__fog_prcs_clbk:
+                self.__fog_prcs_clbk()
         except Exception as ex:
             logger.error(
                 "could not handle fog processes message - {}\nsub topic: {}\npayload: '{}'".format(ex, sub_topic, payload)
@@ -661,7 +1116,7 @@ class Client:
     # def __handle_fog_analytics(self, payload: typing.Union[str, bytes]):
     #     logger.debug("received fog analytics message ...\npayload: '{}'".format(payload))
 
-    def __handle_command(self, payload: typing.Union[str, bytes], device_id, service_uri: str) -> None:
+    def __handle_command(self, payload: typing.Union[str, bytes], topic: str, device_id: str, service_uri: str) -> None:
         logger.debug(
             "received command message ...\ndevice id: '{}'\nservice uri: '{}'\npayload: '{}'".format(
                 device_id,
@@ -670,9 +1125,16 @@ class Client:
             )
         )
         try:
-            payload = json.loads(payload)
-            self.__cmd_queue.put_nowait(
-                CommandEnvelope(
+            if cc_conf.connector.lazy_command_decoding:
+                envelope = LazyCommandEnvelope(
+                    device=self.__parse_device_id(device_id) if self.__device_id_prefix else device_id,
+                    service=service_uri,
+                    raw=payload,
+                    loads=self.__serializer.loads
+                )
+            else:
+                payload = self.__serializer.loads(payload)
+                envelope = CommandEnvelope(
                     device=self.__parse_device_id(device_id) if self.__device_id_prefix else device_id,
                     service=service_uri,
                     message=DeviceMessage(
@@ -683,7 +1145,29 @@ class Client:
                     completion_strategy=payload["completion_strategy"],
                     timestamp=payload["timestamp"]
                 )
-            )
+            if self.__cmd_dedup is not None:
+                corr_id = self.__command_field(envelope, "correlation_id")
+                if corr_id is not None and not self.__cmd_dedup.add(corr_id):
+                    response = self.__cmd_dedup.get_response(corr_id)
+                    logger.warning(
+                        "dropped duplicate command '{}'{}".format(
+                            corr_id,
+                            " - resending response" if response else str()
+                        )
+                    )
+                    if response:
+                        self.send_command_response(response, asynchronous=True)
+                    return
+            max_age = self.__cmd_max_age.get(service_uri, cc_conf.connector.command_max_age)
+            if max_age and self.__command_expired(envelope, self.__command_field(envelope, "timestamp"), max_age):
+                return
+            handler = self.__cmd_handlers.get(service_uri) or self.__cmd_handlers.get("*")
+            if handler:
+                self.__cmd_dispatcher.submit(key=device_id, target=self.__run_command_handler, args=(handler, envelope))
+            else:
+                self.__cmd_queue.put(envelope)
+                if self.__command_clbk:
+                    self.__command_clbk()
         except Exception as ex:
             logger.error(
                 "could not handle command message - '{}'\ndevice id: '{}'\nservice uri: '{}'\npayload: '{}'".format(
@@ -694,6 +1178,73 @@ class Client:
                 )
             )
 
+    @staticmethod
+    def __command_field(envelope: CommandEnvelope, name: str) -> typing.Any:
+        # lazy envelopes are only decoded if the field can not be read from the raw payload
+        raw = envelope.raw if isinstance(envelope, LazyCommandEnvelope) else None
+        if raw is not None:
+            value = _raw_field(raw, name)
+            if value is not None:
+                return value
+        try:
+            return getattr(envelope, name)
+        except Exception:
+            # decoding errors of lazy envelopes are raised on access by the consumer
+            return None
+
+    def __command_expired(self, envelope: CommandEnvelope, timestamp: typing.Any, max_age: typing.Union[int, float]) -> bool:
+        try:
+            timestamp = float(timestamp)
+        except (TypeError, ValueError):
+            logger.debug("could not check age of command - invalid timestamp '{}'".format(timestamp))
+            return False
+        if not timestamp:
+            return False
+        # platform timestamps are seconds, values in milliseconds are converted
+        if timestamp > 1e11:
+            timestamp = timestamp / 1000
+        age = time.time() - timestamp
+        if age <= max_age:
+            return False
+        self.__cmd_expired += 1
+        logger.warning("dropped expired command '{}' - age: {}s".format(envelope.correlation_id, round(age, 3)))
+        if cc_conf.connector.command_expired_reply:
+            self.send_command_error(
+                error_from_command_envelope("command expired - age: {}s".format(round(age, 3)), envelope),
+                asynchronous=True
+            )
+        return True
+
+    def __run_command_handler(self, handler: typing.Callable, envelope: CommandEnvelope) -> None:
+        try:
+            envelope.correlation_id
+        except Exception as ex:
+            logger.error(
+                "could not decode command message - '{}'\ndevice id: '{}'\nservice uri: '{}'".format(
+                    ex,
+                    envelope.device_id,
+                    envelope.service_uri
+                )
+            )
+            return
+        try:
+            result = handler(envelope)
+        except Exception as ex:
+            logger.error("handling command '{}' failed - {}".format(envelope.correlation_id, ex))
+            self.send_command_error(error_from_command_envelope(str(ex), envelope), asynchronous=True)
+            return
+        if isinstance(result, DeviceMessage):
+            self.send_command_response(response_from_command_envelope(result, envelope), asynchronous=True)
+        elif isinstance(result, CommandResponseEnvelope):
+            self.send_command_response(result, asynchronous=True)
+        elif result is not None:
+            logger.error(
+                "handling command '{}' failed - handler returned unsupported type {}".format(
+                    envelope.correlation_id,
+                    type(result)
+                )
+            )
+
     def __send_on_done(self, event_worker):
         if event_worker.exception:
             try:
@@ -702,58 +1253,133 @@ class Client:
                 event_worker.exception = SendError(ex)
                 logger.error(
                     "sending {} '{}' to platform failed - {}".format(
-                        event_worker.usr_data.__class__.__name__,
-                        event_worker.usr_data.correlation_id, ex
+                        event_worker.usr_data[0].__class__.__name__,
+                        event_worker.usr_data[0].correlation_id, ex
                     )
                 )
-        elif cc_conf.connector.qos > 0:
+        elif event_worker.usr_data[1] > 0 and logger.isEnabledFor(logging.DEBUG):
             logger.debug(
                 "sending {} '{}' to platform successful".format(
-                    event_worker.usr_data.__class__.__name__,
-                    event_worker.usr_data.correlation_id
+                    event_worker.usr_data[0].__class__.__name__,
+                    event_worker.usr_data[0].correlation_id
                 )
             )
 
-    def __send(self, topic: str, payload: str, envelope_type: str, correlation_id: str, event_worker):
-        logger.debug("sending {} '{}' to platform ...".format(envelope_type, correlation_id))
+    def __send(self, topic: str, payload: str, envelope, envelope_type: str, qos: int, event_worker):
+        # correlation IDs are only read if logged, lazy IDs are not generated otherwise
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("sending {} '{}' to platform ...".format(envelope_type, envelope.correlation_id))
+        if self.__spool is not None and self.__spool_messages([(topic, payload)], qos):
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("sending {} '{}' to platform - spooled".format(envelope_type, envelope.correlation_id))
+            event_worker.set()
+            return
         if not self.__connected_flag:
             logger.error(
-                "sending {} '{}' to platform failed - not connected".format(envelope_type, correlation_id)
+                "sending {} '{}' to platform failed - not connected".format(envelope_type, envelope.correlation_id)
             )
             raise NotConnectedError
         try:
-            self.__comm.publish(topic=topic, payload=payload, qos=cc_conf.connector.qos, event_worker=event_worker)
+            self.__comm.publish(topic=topic, payload=payload, qos=qos, event_worker=event_worker)
         except mqtt.NotConnectedError:
             logger.error(
-                "sending {} '{}' to platform failed - not connected".format(envelope_type, correlation_id)
+                "sending {} '{}' to platform failed - not connected".format(envelope_type, envelope.correlation_id)
             )
             raise NotConnectedError
         except mqtt.PublishError as ex:
             logger.error(
-                "sending {} '{}' to platform failed - {}".format(envelope_type, correlation_id, ex)
+                "sending {} '{}' to platform failed - {}".format(envelope_type, envelope.correlation_id, ex)
             )
             raise SendError
 
-    def __send_wrapper(self, topic, payload, envelope, asynchronous) -> typing.Optional[Future]:
-        validate_instance(asynchronous, bool)
-        worker = EventWorker(
-            target=self.__send,
-            args=(
-                topic,
-                payload,
-                envelope.__class__.__name__,
-                envelope.correlation_id
-            ),
-            name="send-{}-{}".format(envelope.__class__.__name__, envelope.correlation_id),
+    def __send_batch_on_done(self, event_worker):
+        if event_worker.exception:
+            try:
+                raise event_worker.exception
+            except Exception as ex:
+                event_worker.exception = SendError(ex)
+                logger.error(
+                    "sending {} {} to platform failed - {}".format(
+                        len(event_worker.usr_data[1]),
+                        event_worker.usr_data[0],
+                        ex
+                    )
+                )
+        elif event_worker.usr_data[2] > 0:
+            logger.debug(
+                "sending {} {} to platform successful".format(len(event_worker.usr_data[1]), event_worker.usr_data[0])
+            )
+
+    def __send_batch(self, messages: typing.List[typing.Tuple[str, str]], envelope_type: str, qos: int, event_worker):
+        logger.debug("sending {} {} to platform ...".format(len(messages), envelope_type))
+        if self.__spool is not None and self.__spool_messages(messages, qos):
+            logger.debug("sending {} {} to platform - spooled".format(len(messages), envelope_type))
+            event_worker.set()
+            return
+        if not self.__connected_flag:
+            logger.error("sending {} {} to platform failed - not connected".format(len(messages), envelope_type))
+            raise NotConnectedError
+        try:
+            self.__comm.publish_batch(messages=messages, qos=qos, event_worker=event_worker)
+        except mqtt.NotConnectedError:
+            logger.error("sending {} {} to platform failed - not connected".format(len(messages), envelope_type))
+            raise NotConnectedError
+        except mqtt.PublishError as ex:
+            logger.error("sending {} {} to platform failed - {}".format(len(messages), envelope_type, ex))
+            raise SendError
+
+    @staticmethod
+    def __get_qos(qos: typing.Optional[int], default: typing.Optional[int]) -> int:
+        if qos is None:
+            return cc_conf.connector.qos if default is None else default
+        if TypeValidation.enabled:
+            validate_instance(qos, int)
+        if qos not in (0, 1, 2):
+            raise ValueError("qos must be 0, 1 or 2")
+        return qos
+
+    def __send_wrapper(self, topic, payload, envelope, qos, asynchronous) -> typing.Optional[Future]:
+        if TypeValidation.enabled:
+            validate_instance(asynchronous, bool)
+        envelope._use_correlation_ids(self.__correlation_ids)
+        envelope_type = envelope.__class__.__name__
+        completion = (Completion if asynchronous else Completion.acquire)(
+            name="send-{}-{.correlation_id}",
+            name_args=(envelope_type, envelope),
             usr_method=self.__send_on_done,
-            usr_data=envelope
+            usr_data=(envelope, qos)
         )
-        future = worker.start()
+        try:
+            self.__send(topic, payload, envelope, envelope_type, qos, completion)
+        except Exception as ex:
+            completion.exception = ex
+            completion.set()
         if asynchronous:
-            return future
-        else:
-            future.wait()
-            future.result()
+            return Future(completion)
+        completion.join()
+        ex = completion.exception
+        completion.release()
+        if ex:
+            raise ex
+
+    def __encode_message(self, message: DeviceMessage) -> typing.Union[str, bytes]:
+        encoded = message.encoded
+        if encoded is not None:
+            return encoded
+        return self.__serializer.dumps({"metadata": message.metadata, "data": message.data})
+
+    def __encode_response(self, envelope: CommandResponseEnvelope) -> typing.Union[str, bytes]:
+        encoded = envelope.message.encoded
+        if encoded is None:
+            return self.__serializer.dumps(
+                {
+                    "correlation_id": envelope.correlation_id,
+                    "payload": {"metadata": envelope.message.metadata, "data": envelope.message.data}
+                }
+            )
+        if isinstance(encoded, bytes):
+            return b"".join((b'{"correlation_id": ', json.dumps(envelope.correlation_id).encode(), b', "payload": ', encoded, b"}"))
+        return "".join(('{"correlation_id": ', json.dumps(envelope.correlation_id), ', "payload": ', encoded, "}"))
 
     def __prefix_device_id(self, device_id: str) -> str:
         """
@@ -761,7 +1387,7 @@ class Client:
         :param device_id: Device ID.
         :return: Prefixed device ID.
         """
-        return "{}-{}".format(self.__device_id_prefix, device_id)
+        return self.__topics.prefix_id(device_id)
 
     def __parse_device_id(self, device_id: str) -> str:
         """
@@ -769,7 +1395,7 @@ class Client:
         :param device_id: Device ID with prefix.
         :return: Device ID.
         """
-        return device_id.replace("{}-".format(self.__device_id_prefix), "")
+        return self.__topics.parse_id(device_id)
 
     def __add_device_attribute_origin(self, attributes: typing.List[typing.Dict[str, typing.Union[str, int, float]]]):
         for attr in attributes:
@@ -800,6 +1426,183 @@ class Client:
         with self.__set_clbk_lock:
             self.__disconnect_clbk = func
 
+    def set_resubscribe_clbk(self, func: typing.Callable[['Client', BatchResult], None]) -> None:
+        """
+        Set a callback function to be called when subscriptions of connected devices have been restored after a (re)connect.
+        :param func: User function receiving the client and a BatchResult object.
+        :return: None.
+        """
+        if not callable(func):
+            raise TypeError(type(func))
+        with self.__set_clbk_lock:
+            self.__resubscribe_clbk = func
+
+    def set_command_clbk(self, func: typing.Optional[typing.Callable[[], None]]) -> None:
+        """
+        Set a callback function to be called after a command has been queued for receive_command.
+        The function is called from the MQTT loop and must not block.
+        :param func: User function or None.
+        :return: None.
+        """
+        if func is not None and not callable(func):
+            raise TypeError(type(func))
+        with self.__set_clbk_lock:
+            self.__command_clbk = func
+
+    def set_fog_processes_clbk(self, func: typing.Optional[typing.Callable[[], None]]) -> None:
+        """
+        Set a callback function to be called after a fog processes message has been queued for receive_fog_processes.
+        The function is called from the MQTT loop and must not block.
+        :param func: User function or None.
+        :return: None.
+        """
+        if func is not None and not callable(func):
+            raise TypeError(type(func))
+        with self.__set_clbk_lock:
+            self.__fog_prcs_clbk = func
+
+    def register_command_handler(self, service_uri: str, func: typing.Callable[[CommandEnvelope], typing.Optional[typing.Union[DeviceMessage, CommandResponseEnvelope]]]) -> None:
+        """
+        Handle commands for a service with a user function instead of queuing them for receive_command.
+        Handlers are executed by a pool of connector.command_workers threads, commands of the same device are handled in order.
+        A returned DeviceMessage or CommandResponseEnvelope is sent as command response, exceptions are sent as command error.
+        :param service_uri: Service URI or '*' to handle commands of services without a dedicated handler.
+        :param func: User function receiving a CommandEnvelope.
+        :return: None.
+        """
+        validate_instance(service_uri, str)
+        if not callable(func):
+            raise TypeError(type(func))
+        with self.__cmd_handler_lock:
+            if not self.__cmd_dispatcher:
+                self.__cmd_dispatcher = KeyedDispatcher(
+                    workers=cc_conf.connector.command_workers,
+                    queue_size=cc_conf.connector.command_worker_queue_size,
+                    name="command-handler"
+                )
+            self.__cmd_handlers[service_uri] = func
+
+    def unregister_command_handler(self, service_uri: str) -> None:
+        """
+        Remove a command handler. Subsequent commands for the service are queued for receive_command.
+        Unknown services are ignored.
+        :param service_uri: Service URI or '*'.
+        :return: None.
+        """
+        validate_instance(service_uri, str)
+        with self.__cmd_handler_lock:
+            self.__cmd_handlers.pop(service_uri, None)
+
+    def set_command_max_age(self, service_uri: str, max_age: typing.Optional[typing.Union[int, float]]) -> None:
+        """
+        Set the maximum age of commands for a service, overrides connector.command_max_age.
+        Older commands are dropped on arrival and answered with a command error if connector.command_expired_reply is set.
+        :param service_uri: Service URI.
+        :param max_age: Maximum age in seconds, '0' disables the check for the service and None restores the global setting.
+        :return: None.
+        """
+        validate_instance(service_uri, str)
+        validate_instance(max_age, (int, float, type(None)))
+        if max_age is None:
+            self.__cmd_max_age.pop(service_uri, None)
+        else:
+            self.__cmd_max_age[service_uri] = max_age
+
+    def register_route(self, topic_filter: str, func: typing.Callable[..., None], names: typing.Optional[typing.Sequence[str]] = None, asynchronous: bool = False) -> typing.Optional[Future]:
+        """
+        Subscribe to a topic filter and route received messages to a user function. Replaces an existing route with the same filter.
+        The function is called from the MQTT loop with the payload, the topic and the values captured by the named wildcards as keyword arguments, it must not block.
+        Routes are subscribed on every connect, filters overlapping the command or fog processes topics are rejected.
+        :param topic_filter: MQTT topic filter with optional '+' and '#' wildcards.
+        :param func: User function.
+        :param names: Names of the values captured by the wildcards, in order of appearance.
+        :param asynchronous: If 'True' method returns a Future object.
+        :return: Future or None.
+        """
+        validate_instance(topic_filter, str)
+        validate_instance(asynchronous, bool)
+        if not callable(func):
+            raise TypeError(type(func))
+        for reserved in self.__reserved_filters:
+            if filters_overlap(topic_filter, reserved):
+                raise RouteError("topic filter '{}' overlaps reserved topic filter '{}'".format(topic_filter, reserved))
+        try:
+            self.__router.add(topic_filter, func, names)
+        except ValueError as ex:
+            raise RouteError(ex)
+        with self.__routes_lock:
+            self.__routes[topic_filter] = func
+        worker = EventWorker(
+            target=self.__route_subscribe,
+            args=(topic_filter, ),
+            name="subscribe-route-{}".format(topic_filter),
+            usr_method=self.__route_subscribe_on_done,
+            usr_data=topic_filter
+        )
+        future = worker.start()
+        if asynchronous:
+            return future
+        else:
+            future.wait()
+            future.result()
+
+    def unregister_route(self, topic_filter: str, asynchronous: bool = False) -> typing.Optional[Future]:
+        """
+        Remove a route added via register_route and unsubscribe from its topic filter. Unknown topic filters are ignored.
+        :param topic_filter: MQTT topic filter.
+        :param asynchronous: If 'True' method returns a Future object.
+        :return: Future or None.
+        """
+        validate_instance(topic_filter, str)
+        validate_instance(asynchronous, bool)
+        with self.__routes_lock:
+            if topic_filter not in self.__routes:
+                return None
+            del self.__routes[topic_filter]
+            self.__router.remove(topic_filter)
+        worker = EventWorker(
+            target=self.__route_unsubscribe,
+            args=(topic_filter, ),
+            name="unsubscribe-route-{}".format(topic_filter),
+            usr_method=self.__route_unsubscribe_on_done,
+            usr_data=topic_filter
+        )
+        future = worker.start()
+        if asynchronous:
+            return future
+        else:
+            future.wait()
+            future.result()
+
+    def get_metrics(self) -> typing.Dict[str, typing.Union[int, float]]:
+        """
+        Get metrics for monitoring the client.
+        :return: Dictionary containing metrics.
+        """
+        metrics = {
+            "executor_workers": self.__executor.workers,
+            "executor_queue_length": self.__executor.queue_length,
+            "subscriptions": len(self.__subscriptions),
+            "command_queue_length": self.__cmd_queue.qsize()
+        }
+        for prefix, msg_queue in (("command_queue", self.__cmd_queue), ("fog_processes_queue", self.__fog_prcs_queue)):
+            metrics["{}_dropped".format(prefix)] = msg_queue.dropped
+            metrics["{}_high_water_mark".format(prefix)] = msg_queue.high_water_mark
+            metrics["{}_spilled".format(prefix)] = msg_queue.spilled
+        metrics["commands_expired"] = self.__cmd_expired
+        if self.__comm:
+            metrics["mqtt_in_flight"] = self.__comm.in_flight
+            metrics["mqtt_oldest_in_flight_age"] = self.__comm.oldest_in_flight_age
+        if self.__cmd_dedup is not None:
+            metrics["command_duplicates"] = self.__cmd_dedup.duplicates
+        if self.__cmd_dispatcher:
+            metrics["command_handler_queue_length"] = self.__cmd_dispatcher.queue_length
+        metrics.update(self.__resubscribe_metrics)
+        if self.__spool is not None:
+            metrics["spool_length"] = len(self.__spool)
+            metrics["spool_dropped"] = self.__spool.dropped
+        return metrics
+
     def init_hub(self, hub_id: typing.Optional[str] = None, hub_name: typing.Optional[str] = None, asynchronous: bool = False) -> typing.Union[str, Future]:
         """
         Initialize a hub. Check if hub exists and create new hub if necessary.
@@ -811,9 +1614,7 @@ class Client:
         validate_instance(hub_id, (str, type(None)))
         validate_instance(asynchronous, bool)
         if asynchronous:
-            worker = ThreadWorker(target=self.__init_hub, args=(hub_id,), name="init-hub", daemon=True)
-            future = worker.start()
-            return future
+            return self.__executor.submit(target=self.__init_hub, args=(hub_id, hub_name), name="init-hub")
         else:
             return self.__init_hub(hub_id=hub_id, hub_name=hub_name)
 
@@ -829,9 +1630,7 @@ class Client:
         for device in devices:
             validate_instance(device, Device)
         if asynchronous:
-            worker = ThreadWorker(target=self.__sync_hub, args=(devices,), name="sync-hub", daemon=True)
-            future = worker.start()
-            return future
+            return self.__executor.submit(target=self.__sync_hub, args=(devices,), name="sync-hub")
         else:
             self.__sync_hub(devices)
 
@@ -845,17 +1644,38 @@ class Client:
         validate_instance(device, Device)
         validate_instance(asynchronous, bool)
         if asynchronous:
-            worker = ThreadWorker(
+            return self.__executor.submit(
                 target=self.__add_device,
                 args=(device, True),
-                name="add-device-{}".format(device.id),
-                daemon=True
+                name="add-device-{}".format(device.id)
             )
-            future = worker.start()
-            return future
         else:
             self.__add_device(device)
 
+    def add_devices(self, devices: typing.List[Device], concurrency: int = 8, asynchronous: bool = False) -> typing.Union[BatchResult, Future]:
+        """
+        Add multiple devices to the remote platform concurrently. Waits once for eventual consistency. Blocks by default.
+        :param devices: List of Device objects.
+        :param concurrency: Maximum number of devices added at the same time.
+        :param asynchronous: If 'True' method returns a Future object.
+        :return: Future or BatchResult object containing an exception for every failed device ID.
+        """
+        validate_instance(devices, list)
+        validate_instance(concurrency, int)
+        validate_instance(asynchronous, bool)
+        if concurrency < 1:
+            raise ValueError("concurrency must be larger than 0")
+        for device in devices:
+            validate_instance(device, Device)
+        if asynchronous:
+            return self.__executor.submit(
+                target=self.__add_devices,
+                args=(devices, concurrency, True),
+                name="add-devices"
+            )
+        else:
+            return self.__add_devices(devices, concurrency)
+
     def delete_device(self, device: typing.Union[Device, str], asynchronous: bool = False) -> typing.Optional[Future]:
         """
         Delete a device from local device manager and remote platform. Blocks by default.
@@ -869,14 +1689,11 @@ class Client:
             device = device.id
             validate_instance(device, str)
         if asynchronous:
-            worker = ThreadWorker(
+            return self.__executor.submit(
                 target=self.__delete_device,
                 args=(device, True),
-                name="delete-device-{}".format(device),
-                daemon=True
+                name="delete-device-{}".format(device)
             )
-            future = worker.start()
-            return future
         else:
             self.__delete_device(device)
 
@@ -890,14 +1707,11 @@ class Client:
         validate_instance(device, Device)
         validate_instance(asynchronous, bool)
         if asynchronous:
-            worker = ThreadWorker(
+            return self.__executor.submit(
                 target=self.__update_device,
                 args=(device, ),
-                name="update-device-{}".format(device.id),
-                daemon=True
+                name="update-device-{}".format(device.id)
             )
-            future = worker.start()
-            return future
         else:
             self.__update_device(device)
 
@@ -997,6 +1811,42 @@ class Client:
             future.wait()
             future.result()
 
+    def connect_devices(self, devices: typing.List[typing.Union[Device, str]], asynchronous: bool = False) -> typing.Union[BatchResult, Future]:
+        """
+        Connect multiple devices to the platform. Subscriptions are requested in chunks of multiple topics.
+        :param devices: List of Device objects or device IDs.
+        :param asynchronous: If 'True' method returns a Future object.
+        :return: Future or BatchResult object containing an exception for every failed device ID.
+        """
+        validate_instance(devices, list)
+        validate_instance(asynchronous, bool)
+        device_ids = list()
+        for device in devices:
+            validate_instance(device, (Device, str))
+            device_ids.append(device.id if isinstance(device, Device) else device)
+        if asynchronous:
+            return self.__executor.submit(target=self.__connect_devices, args=(device_ids, ), name="connect-devices")
+        else:
+            return self.__connect_devices(device_ids)
+
+    def disconnect_devices(self, devices: typing.List[typing.Union[Device, str]], asynchronous: bool = False) -> typing.Union[BatchResult, Future]:
+        """
+        Disconnect multiple devices from the platform. Unsubscribe requests contain multiple topics.
+        :param devices: List of Device objects or device IDs.
+        :param asynchronous: If 'True' method returns a Future object.
+        :return: Future or BatchResult object containing an exception for every failed device ID.
+        """
+        validate_instance(devices, list)
+        validate_instance(asynchronous, bool)
+        device_ids = list()
+        for device in devices:
+            validate_instance(device, (Device, str))
+            device_ids.append(device.id if isinstance(device, Device) else device)
+        if asynchronous:
+            return self.__executor.submit(target=self.__disconnect_devices, args=(device_ids, ), name="disconnect-devices")
+        else:
+            return self.__disconnect_devices(device_ids)
+
     def receive_command(self, block: bool = True, timeout: typing.Optional[typing.Union[int, float]] = None) -> CommandEnvelope:
         """
         Receive a command.
@@ -1011,42 +1861,102 @@ class Client:
         except queue.Empty:
             raise QueueEmptyError
 
-    def send_command_response(self, envelope: CommandResponseEnvelope, asynchronous: bool = False) -> typing.Optional[Future]:
+    def receive_commands(self, max_commands: int, block: bool = True, timeout: typing.Optional[typing.Union[int, float]] = None, window: typing.Optional[typing.Union[int, float]] = None) -> typing.List[CommandEnvelope]:
+        """
+        Receive multiple commands at once.
+        :param max_commands: Maximum number of commands to return.
+        :param block: If 'True' blocks until a command is available.
+        :param timeout: Return after set amount of time if no command is available.
+        :param window: Wait up to set amount of time after the first command for more commands.
+        :return: List of envelope objects.
+        """
+        validate_instance(max_commands, int)
+        validate_instance(block, bool)
+        validate_instance(timeout, (int, float, type(None)))
+        validate_instance(window, (int, float, type(None)))
+        try:
+            return self.__cmd_queue.get_batch(max_items=max_commands, block=block, timeout=timeout, window=window)
+        except queue.Empty:
+            raise QueueEmptyError
+
+    def send_command_response(self, envelope: CommandResponseEnvelope, asynchronous: bool = False, qos: typing.Optional[int] = None) -> typing.Optional[Future]:
         """
         Send a response to the platform after handling a command.
         :param envelope: Envelope object received from a command via receiveCommand.
         :param asynchronous: If 'True' method returns a Future object.
+        :param qos: MQTT QoS level, defaults to connector.command_response_qos or connector.qos.
         :return: Future or None.
         """
-        validate_instance(envelope, CommandResponseEnvelope)
+        if TypeValidation.enabled:
+            validate_instance(envelope, CommandResponseEnvelope)
+        envelope._use_correlation_ids(self.__correlation_ids)
+        if self.__cmd_dedup is not None:
+            self.__cmd_dedup.set_response(envelope.correlation_id, envelope)
         return self.__send_wrapper(
-            topic=cc_conf.api.command_response_pub_topic.format(
-                device_id=self.__prefix_device_id(envelope.device_id) if self.__device_id_prefix else envelope.device_id,
-                service_id=envelope.service_uri
-            ),
-            payload=json.dumps(dict(envelope)),
+            topic=self.__topics.command_response(envelope.device_id, envelope.service_uri),
+            payload=self.__encode_response(envelope),
             envelope=envelope,
+            qos=self.__get_qos(qos, cc_conf.connector.command_response_qos),
             asynchronous=asynchronous
         )
 
-    def send_event(self, envelope: EventEnvelope, asynchronous: bool = False) -> typing.Optional[Future]:
+    def send_event(self, envelope: EventEnvelope, asynchronous: bool = False, qos: typing.Optional[int] = None) -> typing.Optional[Future]:
         """
         Send an event to the platform.
         :param envelope: Envelope object.
         :param asynchronous: If 'True' method returns a Future object.
+        :param qos: MQTT QoS level, defaults to connector.event_qos or connector.qos.
         :return: Future or None.
         """
-        validate_instance(envelope, EventEnvelope)
+        if TypeValidation.enabled:
+            validate_instance(envelope, EventEnvelope)
         return self.__send_wrapper(
-            topic=cc_conf.api.event_pub_topic.format(
-                device_id=self.__prefix_device_id(envelope.device_id) if self.__device_id_prefix else envelope.device_id,
-                service_id=envelope.service_uri
-            ),
-            payload=json.dumps(dict(envelope.message)),
+            topic=self.__topics.event(envelope.device_id, envelope.service_uri),
+            payload=self.__encode_message(envelope.message),
             envelope=envelope,
+            qos=self.__get_qos(qos, cc_conf.connector.event_qos),
             asynchronous=asynchronous
         )
 
+    def send_events(self, envelopes: typing.Union[typing.List[EventEnvelope], typing.Tuple[EventEnvelope]], asynchronous: bool = False, qos: typing.Optional[int] = None) -> typing.Optional[Future]:
+        """
+        Send multiple events to the platform in one pass. The returned Future is done after all events are sent.
+        :param envelopes: List or tuple of EventEnvelope objects.
+        :param asynchronous: If 'True' method returns a Future object.
+        :param qos: MQTT QoS level, defaults to connector.event_qos or connector.qos.
+        :return: Future or None.
+        """
+        if TypeValidation.enabled:
+            validate_instance(envelopes, (list, tuple))
+            validate_instance(asynchronous, bool)
+            for envelope in envelopes:
+                validate_instance(envelope, EventEnvelope)
+        qos = self.__get_qos(qos, cc_conf.connector.event_qos)
+        event_topic = self.__topics.event
+        encode = self.__encode_message
+        correlation_ids = self.__correlation_ids
+        messages = list()
+        for envelope in envelopes:
+            envelope._use_correlation_ids(correlation_ids)
+            messages.append((event_topic(envelope.device_id, envelope.service_uri), encode(envelope.message)))
+        completion = Completion(
+            name="send-{}-batch",
+            name_args=(EventEnvelope.__name__, ),
+            usr_method=self.__send_batch_on_done,
+            usr_data=(EventEnvelope.__name__, envelopes, qos)
+        )
+        try:
+            self.__send_batch(messages, EventEnvelope.__name__, qos, completion)
+        except Exception as ex:
+            completion.exception = ex
+            completion.set()
+        future = Future(completion)
+        if asynchronous:
+            return future
+        else:
+            future.wait()
+            future.result()
+
     def receive_fog_processes(self, block: bool = True, timeout: typing.Optional[typing.Union[int, float]] = None) -> FogProcessesEnvelope:
         """
         Receive fog processes and control data.
@@ -1061,62 +1971,93 @@ class Client:
         except queue.Empty:
             raise QueueEmptyError
 
-    def send_fog_process_sync(self, envelope: FogProcessesEnvelope, asynchronous: bool = False) -> typing.Optional[Future]:
+    def receive_fog_processes_batch(self, max_items: int, block: bool = True, timeout: typing.Optional[typing.Union[int, float]] = None, window: typing.Optional[typing.Union[int, float]] = None) -> typing.List[FogProcessesEnvelope]:
+        """
+        Receive multiple fog processes messages at once.
+        :param max_items: Maximum number of messages to return.
+        :param block: If 'True' blocks until a message is available.
+        :param timeout: Return after set amount of time if no message is available.
+        :param window: Wait up to set amount of time after the first message for more messages.
+        :return: List of FogProcessesEnvelope objects.
+        """
+        validate_instance(max_items, int)
+        validate_instance(block, bool)
+        validate_instance(timeout, (int, float, type(None)))
+        validate_instance(window, (int, float, type(None)))
+        try:
+            return self.__fog_prcs_queue.get_batch(max_items=max_items, block=block, timeout=timeout, window=window)
+        except queue.Empty:
+            raise QueueEmptyError
+
+    def send_fog_process_sync(self, envelope: FogProcessesEnvelope, asynchronous: bool = False, qos: typing.Optional[int] = None) -> typing.Optional[Future]:
         """
             Send fog processes sync data to the platform.
             :param envelope: FogProcessesEnvelope object.
             :param asynchronous: If 'True' method returns a Future object.
+            :param qos: MQTT QoS level, defaults to connector.fog_processes_qos or connector.qos.
             :return: Future or None.
         """
-        validate_instance(envelope, FogProcessesEnvelope)
+        if TypeValidation.enabled:
+            validate_instance(envelope, FogProcessesEnvelope)
         return self.__send_wrapper(
-            topic=cc_conf.api.fog_processes_pub_topic.format(hub_id=self.__hub_id, sub_topic=envelope.sub_topic),
+            topic=self.__topics.fog_processes_pub(self.__hub_id, envelope.sub_topic),
             payload=envelope.message,
             envelope=envelope,
+            qos=self.__get_qos(qos, cc_conf.connector.fog_processes_qos),
             asynchronous=asynchronous
         )
 
-    def send_client_error(self, envelope: ClientErrorEnvelope, asynchronous: bool = False) -> typing.Optional[Future]:
+    def send_client_error(self, envelope: ClientErrorEnvelope, asynchronous: bool = False, qos: typing.Optional[int] = None) -> typing.Optional[Future]:
         """
             Send a client error to the platform.
             :param envelope: ClientErrorEnvelope object.
             :param asynchronous: If 'True' method returns a Future object.
+            :param qos: MQTT QoS level, defaults to connector.error_qos or connector.qos.
             :return: Future or None.
         """
-        validate_instance(envelope, ClientErrorEnvelope)
+        if TypeValidation.enabled:
+            validate_instance(envelope, ClientErrorEnvelope)
         return self.__send_wrapper(
-            topic=cc_conf.api.client_error_pub_topic,
+            topic=self.__topics.client_error,
             payload=envelope.message,
             envelope=envelope,
+            qos=self.__get_qos(qos, cc_conf.connector.error_qos),
             asynchronous=asynchronous
         )
 
-    def send_device_error(self, envelope: DeviceErrorEnvelope, asynchronous: bool = False) -> typing.Optional[Future]:
+    def send_device_error(self, envelope: DeviceErrorEnvelope, asynchronous: bool = False, qos: typing.Optional[int] = None) -> typing.Optional[Future]:
         """
             Send a device error to the platform.
             :param envelope: ClientErrorEnvelope object.
             :param asynchronous: If 'True' method returns a Future object.
+            :param qos: MQTT QoS level, defaults to connector.error_qos or connector.qos.
             :return: Future or None.
         """
-        validate_instance(envelope, DeviceErrorEnvelope)
+        if TypeValidation.enabled:
+            validate_instance(envelope, DeviceErrorEnvelope)
         return self.__send_wrapper(
-            topic=cc_conf.api.device_error_pub_topic.format(device_id=envelope.device_id),
+            topic=self.__topics.device_error(envelope.device_id),
             payload=envelope.message,
             envelope=envelope,
+            qos=self.__get_qos(qos, cc_conf.connector.error_qos),
             asynchronous=asynchronous
         )
 
-    def send_command_error(self, envelope: CommandErrorEnvelope, asynchronous: bool = False) -> typing.Optional[Future]:
+    def send_command_error(self, envelope: CommandErrorEnvelope, asynchronous: bool = False, qos: typing.Optional[int] = None) -> typing.Optional[Future]:
         """
             Send a command error to the platform.
             :param envelope: ClientErrorEnvelope object.
             :param asynchronous: If 'True' method returns a Future object.
+            :param qos: MQTT QoS level, defaults to connector.error_qos or connector.qos.
             :return: Future or None.
         """
-        validate_instance(envelope, CommandErrorEnvelope)
+        if TypeValidation.enabled:
+            validate_instance(envelope, CommandErrorEnvelope)
+        envelope._use_correlation_ids(self.__correlation_ids)
         return self.__send_wrapper(
-            topic=cc_conf.api.command_error_pub_topic.format(correlation_id=envelope.correlation_id),
+            topic=self.__topics.command_error(envelope.correlation_id),
             payload=envelope.message,
             envelope=envelope,
+            qos=self.__get_qos(qos, cc_conf.connector.error_qos),
             asynchronous=asynchronous
         )
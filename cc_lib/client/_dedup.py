@@ -0,0 +1,93 @@
+"""
+   Copyright 2019 InfAI (CC SES)
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+__all__ = ("CommandDeduplicator", )
+
+
+import collections
+import threading
+import typing
+import time
+
+
+class CommandDeduplicator:
+    """
+    Bounded set of recently seen correlation IDs with an optional cached response per ID.
+    IDs expire after ttl seconds or are evicted in order of arrival if max_size is exceeded.
+    """
+
+    __slots__ = ('__max_size', '__ttl', '__entries', '__lock', '__duplicates')
+
+    def __init__(self, max_size: int = 10000, ttl: typing.Union[int, float] = 3600):
+        if max_size < 1:
+            raise ValueError("max size must be larger than 0")
+        self.__max_size = max_size
+        self.__ttl = ttl
+        self.__entries = collections.OrderedDict()
+        self.__lock = threading.Lock()
+        self.__duplicates = 0
+
+    @property
+    def duplicates(self) -> int:
+        return self.__duplicates
+
+    def __expire(self, now: float) -> None:
+        while self.__entries:
+            key, entry = next(iter(self.__entries.items()))
+            if entry[0] > now and len(self.__entries) <= self.__max_size:
+                break
+            self.__entries.popitem(last=False)
+
+    def add(self, key: str) -> bool:
+        """
+        Record a correlation ID.
+        :param key: Correlation ID.
+        :return: 'False' if the ID has already been seen.
+        """
+        now = time.monotonic()
+        with self.__lock:
+            self.__expire(now)
+            if key in self.__entries:
+                self.__duplicates += 1
+                return False
+            self.__entries[key] = [now + self.__ttl, None]
+            self.__expire(now)
+            return True
+
+    def set_response(self, key: str, response: typing.Any) -> None:
+        """
+        Cache the response for a recorded correlation ID.
+        :param key: Correlation ID.
+        :param response: Response envelope.
+        :return: None.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry:
+                entry[1] = response
+
+    def get_response(self, key: str) -> typing.Any:
+        """
+        Get the cached response for a correlation ID.
+        :param key: Correlation ID.
+        :return: Response envelope or None.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            return entry[1] if entry else None
+
+    def __len__(self):
+        return len(self.__entries)
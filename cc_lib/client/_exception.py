@@ -39,7 +39,9 @@ __all__ = (
     'SendError',
     'FutureNotDoneError',
     'FogError',
-    'FogConnectError'
+    'FogConnectError',
+    'RouteError',
+    'RouteSubscribeError'
 )
 
 
@@ -208,3 +210,17 @@ class FogConnectError(FogError):
     Error connecting to fog service.
     """
     pass
+
+
+class RouteError(ClientError):
+    """
+    Route error.
+    """
+    pass
+
+
+class RouteSubscribeError(RouteError):
+    """
+    Error subscribing to the topic of a route.
+    """
+    pass
@@ -15,7 +15,9 @@
 """
 
 from .request import *
+from .pool import *
 
 __all__ = (
-    request.__all__
+    request.__all__,
+    pool.__all__
 )
\ No newline at end of file
@@ -0,0 +1,183 @@
+"""
+   Copyright 2019 InfAI (CC SES)
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+__all__ = ('ConnectionPool', )
+
+
+from ...._util import get_logger
+from .request import ca_file
+import http.client
+import urllib.parse
+import threading
+import select
+import typing
+import time
+import ssl
+
+
+logger = get_logger(__name__.split('.', 1)[-1].replace("_", ""))
+
+
+stale_errors = (http.client.RemoteDisconnected, ConnectionResetError, ConnectionAbortedError, BrokenPipeError)
+
+default_ports = {"http": 80, "https": 443}
+
+idempotent_methods = ("GET", "HEAD", "PUT", "DELETE", "OPTIONS")
+
+redirect_codes = (301, 302, 303, 307, 308)
+
+max_redirects = 10
+
+
+class ConnectionPool:
+    """
+    Keep-alive connections grouped by scheme, host and port.
+    """
+    def __init__(self, size: int = 4, idle_timeout: typing.Union[int, float] = 60, retries: int = 1):
+        """
+        :param size: Maximum number of idle connections kept per scheme, host and port.
+        :param idle_timeout: Seconds after which an idle connection is discarded.
+        :param retries: Number of retries with a new connection if a reused connection turns out to be stale.
+        """
+        if size < 1:
+            raise ValueError("pool size must be larger than 0")
+        self.__size = size
+        self.__idle_timeout = idle_timeout
+        self.__retries = retries
+        self.__ssl_context = ssl.create_default_context(cafile=ca_file)
+        self.__idle = dict()
+        self.__lock = threading.Lock()
+
+    def __get(self, key: tuple) -> typing.Optional[http.client.HTTPConnection]:
+        now = time.monotonic()
+        expired = list()
+        conn = None
+        with self.__lock:
+            idle = self.__idle.get(key)
+            while idle:
+                item, last_used = idle.pop()
+                if now - last_used < self.__idle_timeout and not self.__dropped(item):
+                    conn = item
+                    break
+                expired.append(item)
+        for item in expired:
+            item.close()
+        return conn
+
+    @staticmethod
+    def __dropped(conn: http.client.HTTPConnection) -> bool:
+        # an idle connection has nothing to read unless the server closed it, e.g. after its keep-alive timeout
+        if conn.sock is None:
+            return True
+        try:
+            return bool(select.select([conn.sock], [], [], 0)[0])
+        except (OSError, ValueError):
+            return True
+
+    def __put(self, key: tuple, conn: http.client.HTTPConnection) -> None:
+        with self.__lock:
+            idle = self.__idle.setdefault(key, list())
+            if len(idle) < self.__size:
+                idle.append((conn, time.monotonic()))
+                return
+        conn.close()
+
+    def __new(self, scheme: str, host: str, port: int, timeout: typing.Union[int, float]) -> http.client.HTTPConnection:
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=timeout, context=self.__ssl_context)
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def __send(self, method: str, url: str, body: typing.Optional[bytes], headers: dict, timeout: typing.Union[int, float]) -> typing.Tuple[int, str, bytes, dict]:
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in default_ports:
+            raise ValueError("unsupported scheme '{}'".format(parts.scheme))
+        key = (parts.scheme, parts.hostname, parts.port or default_ports[parts.scheme])
+        path = parts.path or "/"
+        if parts.query:
+            path = "{}?{}".format(path, parts.query)
+        retry = 0
+        while True:
+            conn = self.__get(key)
+            reused = conn is not None
+            if reused:
+                conn.timeout = timeout
+                if conn.sock:
+                    conn.sock.settimeout(timeout)
+            else:
+                conn = self.__new(*key, timeout)
+            try:
+                conn.request(method, path, body=body, headers=headers)
+            except stale_errors as ex:
+                conn.close()
+                # the request has not been delivered and can be retried regardless of the method
+                if reused and retry < self.__retries:
+                    retry += 1
+                    logger.debug("stale connection to '{}:{}' - {} - retrying ...".format(key[1], key[2], ex))
+                    continue
+                raise
+            except BaseException:
+                conn.close()
+                raise
+            try:
+                resp = conn.getresponse()
+                data = resp.read()
+            except stale_errors as ex:
+                conn.close()
+                # a non idempotent request may have been processed before the connection dropped
+                if reused and retry < self.__retries and method in idempotent_methods:
+                    retry += 1
+                    logger.debug("stale connection to '{}:{}' - {} - retrying ...".format(key[1], key[2], ex))
+                    continue
+                raise
+            except BaseException:
+                conn.close()
+                raise
+            if resp.will_close:
+                conn.close()
+            else:
+                self.__put(key, conn)
+            return resp.status, resp.reason, data, dict(resp.getheaders())
+
+    def request(self, method: str, url: str, body: typing.Optional[bytes] = None, headers: typing.Optional[dict] = None, timeout: typing.Union[int, float] = 30) -> typing.Tuple[int, str, bytes, dict]:
+        """
+        Send a request via a pooled connection.
+        Redirects are followed like urllib does: GET and HEAD requests for all redirect codes,
+        POST requests as GET without body for 301, 302 and 303.
+        :param method: HTTP method.
+        :param url: Absolute URL.
+        :param body: Encoded body.
+        :param headers: Request headers.
+        :param timeout: Socket timeout.
+        :return: Tuple containing status, reason, body and headers of the response.
+        """
+        headers = headers or dict()
+        redirects = 0
+        while True:
+            status, reason, data, resp_headers = self.__send(method, url, body, headers, timeout)
+            location = resp_headers.get("Location") or resp_headers.get("location")
+            if status not in redirect_codes or not location or redirects >= max_redirects:
+                return status, reason, data, resp_headers
+            if method in ("GET", "HEAD"):
+                pass
+            elif method == "POST" and status in (301, 302, 303):
+                method = "GET"
+                body = None
+                headers = {k: v for k, v in headers.items() if k.lower() not in ("content-length", "content-type")}
+            else:
+                return status, reason, data, resp_headers
+            redirects += 1
+            url = urllib.parse.urljoin(url, location)
+            logger.debug("redirected to '{}'".format(url))
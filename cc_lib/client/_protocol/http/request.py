@@ -21,6 +21,7 @@ from ...._util import get_logger
 from .response import Response
 import typing
 import socket
+import http.client
 import urllib.error
 import urllib.request
 import urllib.parse
@@ -97,12 +98,16 @@ class ContentType:
 
 
 class Request:
-    def __init__(self, url: str, method: str = Method.GET, body: typing.Optional[typing.Union[typing.Iterable, typing.SupportsAbs]] = None, content_type: typing.Optional[str] = None, headers: typing.Optional[dict] = None, timeout: int = 30):
+    def __init__(self, url: str, method: str = Method.GET, body: typing.Optional[typing.Union[typing.Iterable, typing.SupportsAbs]] = None, content_type: typing.Optional[str] = None, headers: typing.Optional[dict] = None, timeout: int = 30, pool=None):
+        """
+        :param pool: Optional ConnectionPool used to send the request via a keep-alive connection.
+        """
         self.__url = url
         self.__method = method
         self.__body = body
         self.__headers = headers or dict()
         self.__timeout = timeout
+        self.__pool = pool
         self.__request = None
         if self.__body and not content_type:
             raise RuntimeError('missing content type for body')
@@ -118,14 +123,36 @@ class Request:
             else:
                 raise RuntimeError("unsupported content type '{}'".format(content_type))
             self.__headers['content-type'] = content_type
-        self.__request = urllib.request.Request(
-            self.__url,
-            data=self.__body,
-            headers=self.__headers,
-            method=self.__method
-        )
+        if not self.__pool:
+            self.__request = urllib.request.Request(
+                self.__url,
+                data=self.__body,
+                headers=self.__headers,
+                method=self.__method
+            )
+
+    def __send_pooled(self) -> Response:
+        try:
+            status, reason, body, headers = self.__pool.request(
+                method=self.__method,
+                url=self.__url,
+                body=self.__body,
+                headers=self.__headers,
+                timeout=self.__timeout
+            )
+        except socket.timeout as ex:
+            logger.error("timed out - '{}' - {}".format(self.__url, self.__method))
+            raise SocketTimeout(ex)
+        except (OSError, ValueError, http.client.HTTPException) as ex:
+            logger.error("{} - '{}'".format(ex, self.__url))
+            raise URLError(ex)
+        if status >= 400:
+            return Response(status=status, body=reason, headers=headers)
+        return Response(status=status, body=body.decode(), headers=headers)
 
     def send(self) -> Response:
+        if self.__pool:
+            return self.__send_pooled()
         try:
             resp = urllib.request.urlopen(
                 self.__request,
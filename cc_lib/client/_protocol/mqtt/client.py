@@ -16,18 +16,28 @@
 
 __all__ = (
     'Client',
+    'LoopMode',
     'MqttClientError',
     'NotConnectedError',
     'SubscribeError',
     'UnsubscribeError',
     'PublishError',
+    'RequestTimeoutError',
+    'PublishTimeoutError',
+    'SubscribeTimeoutError',
+    'UnsubscribeTimeoutError',
     'SubscribeNotAllowedError',
     'ConnectError'
 )
 
 from ...._util import get_logger
+from .inflight import InFlightTracker
 import paho.mqtt.client
+import functools
+import selectors
+import asyncio
 import threading
+import socket
 import typing
 import ssl
 
@@ -65,8 +75,77 @@ class PublishError(MqttClientError):
     pass
 
 
+class RequestTimeoutError(MqttClientError):
+    pass
+
+
+class PublishTimeoutError(PublishError, RequestTimeoutError):
+    pass
+
+
+class SubscribeTimeoutError(SubscribeError, RequestTimeoutError):
+    pass
+
+
+class UnsubscribeTimeoutError(UnsubscribeError, RequestTimeoutError):
+    pass
+
+
+class LoopMode:
+    poll = "poll"
+    event = "event"
+    asyncio = "asyncio"
+
+
+class BatchEvent:
+    """
+    Bundle the requests of a batch so that the provided event worker is set once all requests completed.
+    """
+
+    __slots__ = ('__event_worker', '__pending', '__lock', '__closed')
+
+    def __init__(self, event_worker, size: int):
+        self.__event_worker = event_worker
+        self.__pending = size
+        self.__lock = threading.Lock()
+        self.__closed = False
+
+    @property
+    def exception(self) -> typing.Optional[Exception]:
+        return self.__event_worker.exception
+
+    @exception.setter
+    def exception(self, ex: Exception):
+        if not self.__event_worker.exception:
+            self.__event_worker.exception = ex
+
+    def usr_method(self, event) -> None:
+        pass
+
+    def set(self) -> None:
+        with self.__lock:
+            if self.__closed:
+                return
+            self.__pending -= 1
+            if self.__pending > 0:
+                return
+            self.__closed = True
+        self.__event_worker.usr_method(self.__event_worker)
+        self.__event_worker.set()
+
+    def abort(self) -> None:
+        with self.__lock:
+            self.__closed = True
+
+
 class Client:
-    def __init__(self, client_id: str, msg_retry: int, keepalive: int, loop_time: float, tls: bool, clean_session: bool, logging: bool):
+    def __init__(self, client_id: str, msg_retry: int, keepalive: int, loop_time: float, tls: bool, clean_session: bool, logging: bool, loop_mode: str = LoopMode.poll, publish_timeout: typing.Optional[float] = None, subscribe_timeout: typing.Optional[float] = None, event_loop: typing.Optional[asyncio.AbstractEventLoop] = None):
+        if loop_mode not in (LoopMode.poll, LoopMode.event, LoopMode.asyncio):
+            raise MqttClientError("unknown loop mode '{}'".format(loop_mode))
+        if loop_mode == LoopMode.asyncio and not event_loop:
+            raise MqttClientError("loop mode '{}' requires an event loop".format(loop_mode))
+        if loop_mode in (LoopMode.event, LoopMode.asyncio) and not hasattr(paho.mqtt.client.Client, "on_socket_register_write"):
+            raise MqttClientError("loop mode '{}' requires paho-mqtt 1.5 or newer".format(loop_mode))
         if not loop_time > 0.0:
             raise MqttClientError("loop time must be larger than 0")
         if keepalive <= loop_time:
@@ -76,9 +155,19 @@ class Client:
         self.__msg_retry = msg_retry
         self.__keepalive = keepalive
         self.__loop_time = loop_time
+        self.__loop_mode = loop_mode
+        self.__wakeup_r = None
+        self.__wakeup_w = None
+        self.__aio_loop = event_loop
+        self.__aio_thread_id = None
+        self.__aio_wake = None
+        self.__aio_rc = None
         self.__tls = tls
         self.__logging = logging
-        self.__events = dict()
+        self.__publish_timeout = publish_timeout
+        self.__subscribe_timeout = subscribe_timeout
+        self.__in_flight = InFlightTracker(resolution=min(0.5, loop_time), early_ttl=3 * min(0.5, loop_time))
+        self.__idle_wait = False
         self.__loop_thread = None
         self.__usr_disconn = False
         self.__mqtt = paho.mqtt.client.Client(client_id=client_id, clean_session=clean_session)
@@ -98,25 +187,259 @@ class Client:
         self.__mqtt.on_subscribe = self.__subscribe_clbk
         self.__mqtt.on_unsubscribe = self.__unsubscribe_clbk
         self.__mqtt.on_connect = self.__connect_clbk
+        if self.__loop_mode == LoopMode.event:
+            self.__mqtt.on_socket_register_write = self.__register_write_clbk
+        if self.__loop_mode == LoopMode.asyncio:
+            self.__mqtt.on_socket_register_write = self.__aio_register_write_clbk
+            self.__mqtt.on_socket_unregister_write = self.__aio_unregister_write_clbk
+            self.__mqtt.on_socket_close = self.__aio_socket_close_clbk
+
+    @property
+    def in_flight(self) -> int:
+        return len(self.__in_flight)
+
+    @property
+    def oldest_in_flight_age(self) -> float:
+        return self.__in_flight.oldest_age
 
     def __clean_events(self):
-        for event in self.__events.values():
+        for event in self.__in_flight.clear():
             event.exception = NotConnectedError("aborted due to disconnect")
             event.usr_method(event)
             event.set()
-        self.__events.clear()
 
-    def __set_event(self, e_id: typing.Union[int, str], ex: Exception = None) -> bool:
-        try:
-            event = self.__events[e_id]
-            del self.__events[e_id]
-            if ex:
-                event.exception = ex
+    def __expire_events(self):
+        for event, data in self.__in_flight.expire():
+            event.exception = data[0]("no acknowledgement received in time")
             event.usr_method(event)
             event.set()
-            return True
-        except KeyError:
+
+    def __set_event(self, e_id: typing.Union[int, str], ex: Exception = None) -> bool:
+        item = self.__in_flight.pop(e_id, defer=False)
+        if not item:
             return False
+        event = item[0]
+        if ex:
+            event.exception = ex
+        event.usr_method(event)
+        event.set()
+        return True
+
+    @staticmethod
+    def __complete(event, multi_topic: bool = False, granted_qos: typing.Optional[typing.Sequence[int]] = None) -> None:
+        if granted_qos is not None:
+            if multi_topic:
+                event.result = tuple(granted_qos)
+            elif 128 in granted_qos:
+                event.exception = SubscribeNotAllowedError("subscribe request not allowed")
+        event.usr_method(event)
+        event.set()
+
+    def __register(self, mid: int, event, timeout: typing.Optional[float], timeout_error: typing.Type[RequestTimeoutError], multi_topic: bool = False) -> None:
+        early = self.__in_flight.add(mid, event, timeout=timeout, data=(timeout_error, multi_topic))
+        if early is not None:
+            self.__complete(event, multi_topic, *early)
+        elif timeout and self.__idle_wait:
+            self.__idle_wait = False
+            self.__wakeup()
+
+    def __acknowledge(self, mid: int, *args) -> None:
+        item = self.__in_flight.pop(mid, args)
+        if item:
+            self.__complete(item[0], item[1][1], *args)
+
+    def __wakeup(self) -> None:
+        if self.__aio_wake:
+            self.__aio_call(self.__aio_wake.set)
+            return
+        try:
+            self.__wakeup_w.send(b"\0")
+        except (AttributeError, OSError):
+            pass
+
+    def __register_write_clbk(self, client: paho.mqtt.client.Client, userdata: typing.Any, sock) -> None:
+        if threading.current_thread() is not self.__loop_thread:
+            self.__wakeup()
+
+    def __select_timeout(self) -> float:
+        self.__idle_wait = True
+        if len(self.__in_flight):
+            self.__idle_wait = False
+            return min(1.0, self.__msg_retry, self.__in_flight.resolution)
+        return self.__keepalive / 4
+
+    def __poll_loop(self) -> int:
+        rc = paho.mqtt.client.MQTT_ERR_SUCCESS
+        while rc == paho.mqtt.client.MQTT_ERR_SUCCESS and self.__mqtt.socket():
+            rc = self.__mqtt.loop(timeout=self.__loop_time)
+            self.__expire_events()
+            if self.__usr_disconn:
+                self.__usr_disconn = False
+                self.__mqtt.disconnect()
+                break
+        return rc
+
+    def __event_loop(self) -> int:
+        rc = paho.mqtt.client.MQTT_ERR_SUCCESS
+        sock = self.__mqtt.socket()
+        self.__wakeup_r, self.__wakeup_w = socket.socketpair()
+        self.__wakeup_r.setblocking(False)
+        selector = selectors.DefaultSelector()
+        try:
+            selector.register(self.__wakeup_r, selectors.EVENT_READ)
+            selector.register(sock, selectors.EVENT_READ)
+            while rc == paho.mqtt.client.MQTT_ERR_SUCCESS and self.__mqtt.socket():
+                if self.__usr_disconn:
+                    self.__usr_disconn = False
+                    self.__mqtt.disconnect()
+                    break
+                if self.__mqtt.want_write():
+                    selector.modify(sock, selectors.EVENT_READ | selectors.EVENT_WRITE)
+                else:
+                    selector.modify(sock, selectors.EVENT_READ)
+                pending = sock.pending() if hasattr(sock, "pending") else 0
+                for key, mask in selector.select(0 if pending else self.__select_timeout()):
+                    if key.fileobj is self.__wakeup_r:
+                        try:
+                            self.__wakeup_r.recv(4096)
+                        except BlockingIOError:
+                            pass
+                        continue
+                    if mask & selectors.EVENT_READ:
+                        pending = 0
+                        rc = self.__mqtt.loop_read()
+                        if rc or not self.__mqtt.socket():
+                            break
+                    if mask & selectors.EVENT_WRITE:
+                        rc = self.__mqtt.loop_write()
+                        if rc or not self.__mqtt.socket():
+                            break
+                if rc == paho.mqtt.client.MQTT_ERR_SUCCESS and pending:
+                    rc = self.__mqtt.loop_read()
+                if rc == paho.mqtt.client.MQTT_ERR_SUCCESS and self.__mqtt.socket():
+                    rc = self.__mqtt.loop_misc()
+                self.__expire_events()
+        finally:
+            selector.close()
+            wakeup_r, wakeup_w = self.__wakeup_r, self.__wakeup_w
+            self.__wakeup_r = self.__wakeup_w = None
+            wakeup_r.close()
+            wakeup_w.close()
+        return rc
+
+    def __aio_call(self, func: typing.Callable, *args) -> None:
+        if threading.get_ident() == self.__aio_thread_id:
+            func(*args)
+        else:
+            self.__aio_loop.call_soon_threadsafe(func, *args)
+
+    def __aio_stop(self, rc: int) -> None:
+        if self.__aio_rc is None:
+            self.__aio_rc = rc
+        if self.__aio_wake:
+            self.__aio_wake.set()
+
+    def __aio_read(self) -> None:
+        rc = self.__mqtt.loop_read()
+        sock = self.__mqtt.socket()
+        while rc == paho.mqtt.client.MQTT_ERR_SUCCESS and sock and hasattr(sock, "pending") and sock.pending():
+            rc = self.__mqtt.loop_read()
+            sock = self.__mqtt.socket()
+        if rc or not sock:
+            self.__aio_stop(rc)
+
+    def __aio_write(self) -> None:
+        rc = self.__mqtt.loop_write()
+        if rc or not self.__mqtt.socket():
+            self.__aio_stop(rc)
+
+    def __aio_register_write_clbk(self, client: paho.mqtt.client.Client, userdata: typing.Any, sock) -> None:
+        self.__aio_call(self.__aio_loop.add_writer, sock, self.__aio_write)
+
+    def __aio_unregister_write_clbk(self, client: paho.mqtt.client.Client, userdata: typing.Any, sock) -> None:
+        self.__aio_call(self.__aio_loop.remove_writer, sock)
+
+    def __aio_socket_close_clbk(self, client: paho.mqtt.client.Client, userdata: typing.Any, sock) -> None:
+        self.__aio_call(self.__aio_loop.remove_reader, sock)
+        self.__aio_call(self.__aio_loop.remove_writer, sock)
+
+    async def __asyncio_loop(self) -> int:
+        sock = self.__mqtt.socket()
+        self.__aio_rc = None
+        self.__aio_wake = asyncio.Event()
+        self.__aio_loop.add_reader(sock, self.__aio_read)
+        if self.__mqtt.want_write():
+            self.__aio_loop.add_writer(sock, self.__aio_write)
+        rc = paho.mqtt.client.MQTT_ERR_SUCCESS
+        try:
+            while self.__aio_rc is None and self.__mqtt.socket():
+                if self.__usr_disconn:
+                    self.__usr_disconn = False
+                    self.__mqtt.disconnect()
+                    break
+                try:
+                    await asyncio.wait_for(self.__aio_wake.wait(), self.__select_timeout())
+                except asyncio.TimeoutError:
+                    pass
+                self.__aio_wake.clear()
+                if self.__aio_rc is None and self.__mqtt.socket():
+                    rc = self.__mqtt.loop_misc()
+                    if rc:
+                        break
+                self.__expire_events()
+            if self.__aio_rc:
+                rc = self.__aio_rc
+        finally:
+            self.__aio_wake = None
+            if sock.fileno() >= 0:
+                self.__aio_loop.remove_reader(sock)
+                self.__aio_loop.remove_writer(sock)
+        return rc
+
+    async def __asyncio_run(self, host: str, port: int):
+        self.__aio_thread_id = threading.get_ident()
+        try:
+            rc = await self.__aio_loop.run_in_executor(
+                None,
+                functools.partial(self.__mqtt.connect, host=host, port=port, keepalive=self.__keepalive)
+            )
+            if rc == paho.mqtt.client.MQTT_ERR_SUCCESS:
+                logger.debug("starting loop")
+                loop_ex = None
+                try:
+                    rc = await self.__asyncio_loop()
+                    if rc == paho.mqtt.client.MQTT_ERR_SUCCESS and not self.__mqtt.socket():
+                        rc = paho.mqtt.client.MQTT_ERR_NO_CONN
+                except OSError as ex:
+                    loop_ex = ex
+                    logger.error("socket error - {}".format(ex))
+                logger.debug("loop stopped")
+                self.__loop_stopped(rc, loop_ex)
+            else:
+                self.__set_event("connect_event", ConnectError(paho.mqtt.client.error_string(rc).replace(".", "").lower()))
+        except Exception as ex:
+            self.__set_event("connect_event", ConnectError(ex))
+
+    def __loop_stopped(self, rc: int, loop_ex: typing.Optional[Exception]) -> None:
+        try:
+            event = self.__in_flight.get("connect_event")
+            if not event.exception:
+                if loop_ex:
+                    event.exception = loop_ex
+                elif not rc == paho.mqtt.client.MQTT_ERR_SUCCESS:
+                    event.exception = ConnectError(paho.mqtt.client.error_string(rc).replace(".", "").lower())
+        except KeyError:
+            pass
+        if not self.__set_event("connect_event"):
+            self.__clean_events()
+            if loop_ex:
+                self.on_disconnect(99, loop_ex)
+            else:
+                # https://github.com/eclipse/paho.mqtt.python/issues/340#issuecomment-447632278
+                self.on_disconnect(
+                    rc,
+                    "generic error" if rc == 1 else paho.mqtt.client.error_string(rc).replace(".", "").lower()
+                )
 
     def __loop(self, host: str, port: int):
         try:
@@ -125,36 +448,17 @@ class Client:
                 logger.debug("starting loop")
                 loop_ex = None
                 try:
-                    while rc == paho.mqtt.client.MQTT_ERR_SUCCESS and self.__mqtt.socket():
-                        rc = self.__mqtt.loop(timeout=self.__loop_time)
-                        if self.__usr_disconn:
-                            self.__usr_disconn = False
-                            self.__mqtt.disconnect()
-                            break
+                    if self.__loop_mode == LoopMode.event:
+                        rc = self.__event_loop()
+                    else:
+                        rc = self.__poll_loop()
                     if rc == paho.mqtt.client.MQTT_ERR_SUCCESS and not self.__mqtt.socket():
                         rc = paho.mqtt.client.MQTT_ERR_NO_CONN
-                except OSError as loop_ex:
-                    logger.error("socket error - {}".format(loop_ex))
+                except OSError as ex:
+                    loop_ex = ex
+                    logger.error("socket error - {}".format(ex))
                 logger.debug("loop stopped")
-                try:
-                    event = self.__events["connect_event"]
-                    if not event.exception:
-                        if loop_ex:
-                            event.exception = loop_ex
-                        elif not rc == paho.mqtt.client.MQTT_ERR_SUCCESS:
-                            event.exception = ConnectError(paho.mqtt.client.error_string(rc).replace(".", "").lower())
-                except KeyError:
-                    pass
-                if not self.__set_event("connect_event"):
-                    self.__clean_events()
-                    if loop_ex:
-                        self.on_disconnect(99, loop_ex)
-                    else:
-                        # https://github.com/eclipse/paho.mqtt.python/issues/340#issuecomment-447632278
-                        self.on_disconnect(
-                            rc,
-                            "generic error" if rc == 1 else paho.mqtt.client.error_string(rc).replace(".", "").lower()
-                        )
+                self.__loop_stopped(rc, loop_ex)
             else:
                 self.__set_event("connect_event", ConnectError(paho.mqtt.client.error_string(rc).replace(".", "").lower()))
         except ssl.CertificateError as ex:
@@ -167,7 +471,7 @@ class Client:
     def __connect_clbk(self, client: paho.mqtt.client.Client, userdata: typing.Any, flags: dict, rc: int) -> None:
         if rc > 0:
             try:
-                event = self.__events["connect_event"]
+                event = self.__in_flight.get("connect_event")
                 event.exception = ConnectError(paho.mqtt.client.connack_string(rc).replace(".", "").lower())
             except KeyError:
                 pass
@@ -179,22 +483,22 @@ class Client:
         self.on_message(message.payload, message.topic)
 
     def __publish_clbk(self, client: paho.mqtt.client.Client, userdata: typing.Any, mid: int) -> None:
-        self.__set_event(mid)
+        self.__acknowledge(mid)
 
     def __subscribe_clbk(self, client: paho.mqtt.client.Client, userdata: typing.Any, mid: int, granted_qos: int) -> None:
-        if 128 in granted_qos:
-            self.__set_event(mid, SubscribeNotAllowedError("subscribe request not allowed"))
-        else:
-            self.__set_event(mid)
+        self.__acknowledge(mid, granted_qos)
 
     def __unsubscribe_clbk(self, client: paho.mqtt.client.Client, userdata: typing.Any, mid: int) -> None:
-        self.__set_event(mid)
+        self.__acknowledge(mid)
 
     def connect(self, host: str, port: int, usr: str, pw: str, event_worker) -> None:
         self.__mqtt.username_pw_set(usr, pw)
-        self.__events["connect_event"] = event_worker
-        self.__loop_thread = threading.Thread(target=self.__loop, name="mqtt-loop", args=(host, port), daemon=True)
-        self.__loop_thread.start()
+        self.__in_flight.add("connect_event", event_worker)
+        if self.__loop_mode == LoopMode.asyncio:
+            asyncio.run_coroutine_threadsafe(self.__asyncio_run(host, port), self.__aio_loop)
+        else:
+            self.__loop_thread = threading.Thread(target=self.__loop, name="mqtt-loop", args=(host, port), daemon=True)
+            self.__loop_thread.start()
 
     def reset(self, client_id: str):
         self.__mqtt.reinitialise(client_id=client_id, clean_session=True)
@@ -204,12 +508,14 @@ class Client:
         if self.__mqtt._sock is None:
             raise NotConnectedError
         self.__usr_disconn = True
+        self.__wakeup()
 
     def subscribe(self, topic: str, qos: int, event_worker) -> None:
+        self.__in_flight.begin()
         try:
             res = self.__mqtt.subscribe(topic=topic, qos=qos)
             if res[0] is paho.mqtt.client.MQTT_ERR_SUCCESS:
-                self.__events[res[1]] = event_worker
+                self.__register(res[1], event_worker, self.__subscribe_timeout, SubscribeTimeoutError)
                 logger.debug("request subscribe for '{}'".format(topic))
             elif res[0] == paho.mqtt.client.MQTT_ERR_NO_CONN:
                 raise NotConnectedError
@@ -217,12 +523,53 @@ class Client:
                 raise SubscribeError(paho.mqtt.client.error_string(res[0]).replace(".", "").lower())
         except OSError as ex:
             raise SubscribeError(ex)
+        finally:
+            self.__in_flight.end()
+
+    def subscribe_many(self, topics: typing.List[str], qos: int, event_worker) -> None:
+        """
+        Subscribe to multiple topics with one request. The event worker's result is set to the granted QoS of each topic.
+        """
+        self.__in_flight.begin()
+        try:
+            res = self.__mqtt.subscribe(topic=[(topic, qos) for topic in topics])
+            if res[0] is paho.mqtt.client.MQTT_ERR_SUCCESS:
+                self.__register(res[1], event_worker, self.__subscribe_timeout, SubscribeTimeoutError, multi_topic=True)
+                logger.debug("request subscribe for {} topics".format(len(topics)))
+            elif res[0] == paho.mqtt.client.MQTT_ERR_NO_CONN:
+                raise NotConnectedError
+            else:
+                raise SubscribeError(paho.mqtt.client.error_string(res[0]).replace(".", "").lower())
+        except (ValueError, OSError) as ex:
+            raise SubscribeError(ex)
+        finally:
+            self.__in_flight.end()
+
+    def unsubscribe_many(self, topics: typing.List[str], event_worker) -> None:
+        """
+        Unsubscribe from multiple topics with one request.
+        """
+        self.__in_flight.begin()
+        try:
+            res = self.__mqtt.unsubscribe(topic=list(topics))
+            if res[0] is paho.mqtt.client.MQTT_ERR_SUCCESS:
+                self.__register(res[1], event_worker, self.__subscribe_timeout, UnsubscribeTimeoutError)
+                logger.debug("request unsubscribe for {} topics".format(len(topics)))
+            elif res[0] == paho.mqtt.client.MQTT_ERR_NO_CONN:
+                raise NotConnectedError
+            else:
+                raise UnsubscribeError(paho.mqtt.client.error_string(res[0]).replace(".", "").lower())
+        except (ValueError, OSError) as ex:
+            raise UnsubscribeError(ex)
+        finally:
+            self.__in_flight.end()
 
     def unsubscribe(self, topic: str, event_worker) -> None:
+        self.__in_flight.begin()
         try:
             res = self.__mqtt.unsubscribe(topic=topic)
             if res[0] is paho.mqtt.client.MQTT_ERR_SUCCESS:
-                self.__events[res[1]] = event_worker
+                self.__register(res[1], event_worker, self.__subscribe_timeout, UnsubscribeTimeoutError)
                 logger.debug("request unsubscribe for '{}'".format(topic))
             elif res[0] == paho.mqtt.client.MQTT_ERR_NO_CONN:
                 raise NotConnectedError
@@ -230,13 +577,17 @@ class Client:
                 raise UnsubscribeError(paho.mqtt.client.error_string(res[0]).replace(".", "").lower())
         except OSError as ex:
             raise UnsubscribeError(ex)
+        finally:
+            self.__in_flight.end()
 
     def publish(self, topic: str, payload: str, qos: int, event_worker) -> None:
+        if qos > 0:
+            self.__in_flight.begin()
         try:
             msg_info = self.__mqtt.publish(topic=topic, payload=payload, qos=qos, retain=False)
             if msg_info.rc == paho.mqtt.client.MQTT_ERR_SUCCESS:
                 if qos > 0:
-                    self.__events[msg_info.mid] = event_worker
+                    self.__register(msg_info.mid, event_worker, self.__publish_timeout, PublishTimeoutError)
                 else:
                     event_worker.usr_method(event_worker)
                     event_worker.set()
@@ -247,3 +598,37 @@ class Client:
                 raise PublishError(paho.mqtt.client.error_string(msg_info.rc).replace(".", "").lower())
         except (ValueError, OSError) as ex:
             raise PublishError(ex)
+        finally:
+            if qos > 0:
+                self.__in_flight.end()
+
+    def publish_batch(self, messages: typing.List[typing.Tuple[str, str]], qos: int, event_worker) -> None:
+        if not messages:
+            event_worker.usr_method(event_worker)
+            event_worker.set()
+            return
+        batch = BatchEvent(event_worker, len(messages))
+        if qos > 0:
+            self.__in_flight.begin()
+        try:
+            for topic, payload in messages:
+                msg_info = self.__mqtt.publish(topic=topic, payload=payload, qos=qos, retain=False)
+                if msg_info.rc == paho.mqtt.client.MQTT_ERR_SUCCESS:
+                    if qos > 0:
+                        self.__register(msg_info.mid, batch, self.__publish_timeout, PublishTimeoutError)
+                    else:
+                        batch.set()
+                elif msg_info.rc == paho.mqtt.client.MQTT_ERR_NO_CONN:
+                    raise NotConnectedError
+                else:
+                    raise PublishError(paho.mqtt.client.error_string(msg_info.rc).replace(".", "").lower())
+            logger.debug("publish batch of {} messages - (q{})".format(len(messages), qos))
+        except MqttClientError:
+            batch.abort()
+            raise
+        except (ValueError, OSError) as ex:
+            batch.abort()
+            raise PublishError(ex)
+        finally:
+            if qos > 0:
+                self.__in_flight.end()
@@ -0,0 +1,190 @@
+"""
+   Copyright 2019 InfAI (CC SES)
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+__all__ = ('InFlightTracker', )
+
+
+import threading
+import typing
+import time
+
+
+class _Entry:
+
+    __slots__ = ('event', 'data', 'created', 'deadline', 'slot')
+
+    def __init__(self, event, data, created: float, deadline: typing.Optional[float], slot: typing.Optional[int]):
+        self.event = event
+        self.data = data
+        self.created = created
+        self.deadline = deadline
+        self.slot = slot
+
+
+class InFlightTracker:
+    """
+    Thread safe registry of requests awaiting acknowledgement.
+    Deadlines are enforced by a timer wheel advanced via expire().
+    Acknowledgements arriving before their request is registered are kept and applied on registration, but only while
+    requests announced via begin() are being sent. Acknowledgements of expired requests are discarded.
+    """
+    def __init__(self, resolution: typing.Union[int, float] = 0.5, slots: int = 128, early_ttl: typing.Union[int, float] = 1.5):
+        """
+        :param resolution: Seconds per wheel slot.
+        :param slots: Number of wheel slots.
+        :param early_ttl: Seconds an acknowledgement without matching request is kept.
+        """
+        if not resolution > 0:
+            raise ValueError("resolution must be larger than 0")
+        if slots < 1:
+            raise ValueError("slots must be larger than 0")
+        self.__resolution = resolution
+        self.__wheel = [set() for _ in range(slots)]
+        self.__early_ttl = early_ttl
+        self.__entries = dict()
+        self.__early = dict()
+        self.__expired = set()
+        self.__sending = 0
+        self.__tick = int(time.monotonic() / resolution)
+        self.__lock = threading.Lock()
+
+    @property
+    def resolution(self) -> typing.Union[int, float]:
+        return self.__resolution
+
+    @property
+    def oldest_age(self) -> float:
+        with self.__lock:
+            for entry in self.__entries.values():
+                return time.monotonic() - entry.created
+        return 0.0
+
+    def begin(self) -> None:
+        """
+        Announce a request that is about to be sent and registered. Must be followed by end().
+        :return: None.
+        """
+        with self.__lock:
+            self.__sending += 1
+
+    def end(self) -> None:
+        """
+        Finish an announcement after the request has been registered or sending failed.
+        Acknowledgements without matching request are discarded once no requests are announced.
+        :return: None.
+        """
+        with self.__lock:
+            self.__sending -= 1
+            if not self.__sending:
+                self.__early.clear()
+
+    def add(self, key: typing.Hashable, event, timeout: typing.Optional[typing.Union[int, float]] = None, data: typing.Any = None) -> typing.Optional[tuple]:
+        """
+        Register a request.
+        :param key: Message ID or other unique key.
+        :param event: Object completed once the request is acknowledged.
+        :param timeout: Seconds until the request expires or None.
+        :param data: Additional data returned together with the event.
+        :return: Arguments of an acknowledgement received before registration or None.
+        """
+        now = time.monotonic()
+        with self.__lock:
+            self.__expired.discard(key)
+            early = self.__early.pop(key, None)
+            if early:
+                return early[0]
+            self.__remove(key)
+            deadline = slot = None
+            if timeout:
+                deadline = now + timeout
+                slot = int(deadline / self.__resolution) % len(self.__wheel)
+                self.__wheel[slot].add(key)
+            self.__entries[key] = _Entry(event, data, now, deadline, slot)
+        return None
+
+    def __remove(self, key: typing.Hashable) -> typing.Optional[_Entry]:
+        entry = self.__entries.pop(key, None)
+        if entry and entry.slot is not None:
+            self.__wheel[entry.slot].discard(key)
+        return entry
+
+    def get(self, key: typing.Hashable):
+        """
+        Get the event of a registered request.
+        :param key: Key used during registration.
+        :return: Event object.
+        """
+        with self.__lock:
+            return self.__entries[key].event
+
+    def pop(self, key: typing.Hashable, args: tuple = (), defer: bool = True) -> typing.Optional[typing.Tuple[typing.Any, typing.Any]]:
+        """
+        Remove a request after it has been acknowledged.
+        :param key: Key used during registration.
+        :param args: Arguments of the acknowledgement, kept if the request has not been registered yet.
+        :param defer: Keep acknowledgements of unknown requests while requests are announced.
+        :return: Tuple containing the event and data of the request or None.
+        """
+        with self.__lock:
+            entry = self.__remove(key)
+            if entry:
+                return entry.event, entry.data
+            if key in self.__expired:
+                self.__expired.discard(key)
+            elif defer and self.__sending:
+                self.__early[key] = (args, time.monotonic())
+        return None
+
+    def expire(self) -> typing.List[typing.Tuple[typing.Any, typing.Any]]:
+        """
+        Advance the timer wheel and remove requests with passed deadlines.
+        :return: List of tuples containing event and data of expired requests.
+        """
+        now = time.monotonic()
+        tick = int(now / self.__resolution)
+        expired = list()
+        with self.__lock:
+            if tick == self.__tick:
+                return expired
+            slots = len(self.__wheel)
+            for num in range(self.__tick, min(tick, self.__tick + slots)):
+                bucket = self.__wheel[num % slots]
+                for key in [key for key in bucket if self.__entries[key].deadline <= now]:
+                    entry = self.__remove(key)
+                    expired.append((entry.event, entry.data))
+                    self.__expired.add(key)
+            self.__tick = tick
+            if self.__early:
+                for key in [key for key, item in self.__early.items() if now - item[1] > self.__early_ttl]:
+                    del self.__early[key]
+        return expired
+
+    def clear(self) -> typing.List[typing.Any]:
+        """
+        Remove all requests and pending acknowledgements.
+        :return: List of removed events.
+        """
+        with self.__lock:
+            events = [entry.event for entry in self.__entries.values()]
+            self.__entries.clear()
+            for bucket in self.__wheel:
+                bucket.clear()
+            self.__early.clear()
+            self.__expired.clear()
+        return events
+
+    def __len__(self):
+        return len(self.__entries)
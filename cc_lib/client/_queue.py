@@ -0,0 +1,180 @@
+"""
+   Copyright 2019 InfAI (CC SES)
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+__all__ = ("MessageQueue", "OverflowPolicy")
+
+
+import tempfile
+import typing
+import pickle
+import queue
+import time
+
+
+class OverflowPolicy:
+    block = "block"
+    drop_oldest = "drop_oldest"
+    drop_newest = "drop_newest"
+    spill = "spill"
+
+
+class SpillFile:
+    """
+    Append-only temporary file storing pickled items in FIFO order.
+    """
+    def __init__(self, directory: typing.Optional[str] = None):
+        self.__file = tempfile.TemporaryFile(dir=directory)
+        self.__read_pos = 0
+        self.__write_pos = 0
+        self.__count = 0
+
+    def append(self, item: typing.Any) -> None:
+        self.__file.seek(self.__write_pos)
+        pickle.dump(item, self.__file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.__write_pos = self.__file.tell()
+        self.__count += 1
+
+    def pop(self) -> typing.Any:
+        if not self.__count:
+            raise IndexError("pop from empty spill file")
+        self.__file.seek(self.__read_pos)
+        item = pickle.load(self.__file)
+        self.__read_pos = self.__file.tell()
+        self.__count -= 1
+        if not self.__count:
+            self.__file.truncate(0)
+            self.__read_pos = self.__write_pos = 0
+        return item
+
+    def __len__(self):
+        return self.__count
+
+
+class MessageQueue(queue.Queue):
+    """
+    FIFO queue allowing to remove multiple items at once.
+    If maxsize is set, items put into a full queue are handled according to the overflow policy:
+    block the caller, drop the oldest item, drop the new item or spill items to a temporary file until space is available.
+    """
+    def __init__(self, maxsize: int = 0, overflow_policy: str = OverflowPolicy.block, spill_dir: typing.Optional[str] = None):
+        if overflow_policy not in (OverflowPolicy.block, OverflowPolicy.drop_oldest, OverflowPolicy.drop_newest, OverflowPolicy.spill):
+            raise ValueError("unknown overflow policy '{}'".format(overflow_policy))
+        super().__init__(maxsize=maxsize)
+        self.__overflow_policy = overflow_policy
+        self.__spill = SpillFile(spill_dir) if maxsize > 0 and overflow_policy == OverflowPolicy.spill else None
+        self.__dropped = 0
+        self.__high_water_mark = 0
+
+    @property
+    def dropped(self) -> int:
+        return self.__dropped
+
+    @property
+    def high_water_mark(self) -> int:
+        """
+        Largest number of items held at once, including spilled items.
+        """
+        return self.__high_water_mark
+
+    @property
+    def spilled(self) -> int:
+        return len(self.__spill) if self.__spill else 0
+
+    def __update_high_water_mark(self) -> None:
+        size = self._qsize() + (len(self.__spill) if self.__spill else 0)
+        if size > self.__high_water_mark:
+            self.__high_water_mark = size
+
+    def _put(self, item):
+        super()._put(item)
+        self.__update_high_water_mark()
+
+    def _get(self):
+        item = super()._get()
+        if self.__spill:
+            self._put(self.__spill.pop())
+        return item
+
+    def put(self, item, block: bool = True, timeout: typing.Optional[float] = None) -> None:
+        """
+        Put an item into the queue. Only blocks if the overflow policy is 'block'.
+        """
+        if self.maxsize <= 0 or self.__overflow_policy == OverflowPolicy.block:
+            return super().put(item, block=block, timeout=timeout)
+        with self.not_full:
+            if self.__spill is not None:
+                if len(self.__spill) or self._qsize() >= self.maxsize:
+                    self.__spill.append(item)
+                    self.__update_high_water_mark()
+                    self.unfinished_tasks += 1
+                    return
+            elif self._qsize() >= self.maxsize:
+                self.__dropped += 1
+                if self.__overflow_policy == OverflowPolicy.drop_newest:
+                    return
+                self._get()
+                self.unfinished_tasks -= 1
+            self._put(item)
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+
+    def __take(self, items: list, max_items: int) -> None:
+        count = 0
+        while self._qsize() and len(items) < max_items:
+            items.append(self._get())
+            count += 1
+        if count:
+            self.not_full.notify(count)
+
+    def get_batch(self, max_items: int, block: bool = True, timeout: typing.Optional[float] = None, window: typing.Optional[float] = None) -> list:
+        """
+        Remove and return up to max_items items while acquiring the queue's lock only once.
+        :param max_items: Maximum number of items.
+        :param block: If 'True' blocks until at least one item is available.
+        :param timeout: Raise queue.Empty after set amount of time if no item is available.
+        :param window: Wait up to set amount of time after the first item for more items to arrive.
+        :return: List of items.
+        """
+        if max_items < 1:
+            raise ValueError("max items must be larger than 0")
+        items = list()
+        with self.not_empty:
+            if not block:
+                if not self._qsize():
+                    raise queue.Empty
+            elif timeout is None:
+                while not self._qsize():
+                    self.not_empty.wait()
+            elif timeout < 0:
+                raise ValueError("'timeout' must be a non-negative number")
+            else:
+                end_time = time.monotonic() + timeout
+                while not self._qsize():
+                    remaining = end_time - time.monotonic()
+                    if remaining <= 0.0:
+                        raise queue.Empty
+                    self.not_empty.wait(remaining)
+            self.__take(items, max_items)
+            if window:
+                end_time = time.monotonic() + window
+                while len(items) < max_items:
+                    remaining = end_time - time.monotonic()
+                    if remaining <= 0.0:
+                        break
+                    if not self._qsize():
+                        self.not_empty.wait(remaining)
+                    self.__take(items, max_items)
+        return items
@@ -0,0 +1,53 @@
+"""
+   Copyright 2019 InfAI (CC SES)
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+__all__ = ("SubscriptionRegistry", )
+
+
+import threading
+import typing
+
+
+class SubscriptionRegistry:
+    """
+    Thread safe index of active subscriptions keyed by device ID.
+    """
+
+    __slots__ = ('__subscriptions', '__lock')
+
+    def __init__(self):
+        self.__subscriptions = dict()
+        self.__lock = threading.Lock()
+
+    def add(self, keys: typing.Iterable[str]) -> None:
+        with self.__lock:
+            for key in keys:
+                self.__subscriptions[key] = None
+
+    def remove(self, keys: typing.Iterable[str]) -> None:
+        with self.__lock:
+            for key in keys:
+                self.__subscriptions.pop(key, None)
+
+    def keys(self) -> typing.List[str]:
+        with self.__lock:
+            return list(self.__subscriptions)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__subscriptions
+
+    def __len__(self):
+        return len(self.__subscriptions)
@@ -0,0 +1,173 @@
+"""
+   Copyright 2019 InfAI (CC SES)
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+__all__ = ("TopicRouter", "filter_from_template", "filters_overlap")
+
+
+import threading
+import typing
+
+
+def filter_from_template(template: str, names: typing.Dict[str, str]) -> typing.Tuple[str, typing.Tuple[typing.Optional[str], ...]]:
+    """
+    Create a topic filter from a topic template like 'command/{device_id}/+'.
+    Placeholders become single level wildcards.
+    :param template: Topic template.
+    :param names: Maps placeholder names, '+' or '#' to the names of the captured values.
+    :return: Tuple containing the topic filter and the names of its wildcards. Wildcards without name are not captured.
+    """
+    levels = list()
+    wildcard_names = list()
+    for level in template.split("/"):
+        if level.startswith("{") and level.endswith("}"):
+            levels.append("+")
+            wildcard_names.append(names.get(level[1:-1]))
+        elif level in ("+", "#"):
+            levels.append(level)
+            wildcard_names.append(names.get(level))
+        else:
+            levels.append(level)
+    return "/".join(levels), tuple(wildcard_names)
+
+
+def filters_overlap(filter_a: str, filter_b: str) -> bool:
+    """
+    Check if a topic exists that matches both topic filters.
+    :param filter_a: MQTT topic filter.
+    :param filter_b: MQTT topic filter.
+    :return: True if the filters overlap.
+    """
+    levels_a = filter_a.split("/")
+    levels_b = filter_b.split("/")
+    for pos in range(max(len(levels_a), len(levels_b))):
+        if pos == len(levels_a):
+            return levels_b[pos:] == ["#"]
+        if pos == len(levels_b):
+            return levels_a[pos:] == ["#"]
+        level_a = levels_a[pos]
+        level_b = levels_b[pos]
+        if level_a == "#" or level_b == "#":
+            return True
+        if level_a != level_b and "+" not in (level_a, level_b):
+            return False
+    return True
+
+
+class _Node:
+
+    __slots__ = ('children', 'single', 'multi', 'route')
+
+    def __init__(self):
+        self.children = dict()
+        self.single = None
+        self.multi = None
+        self.route = None
+
+
+class TopicRouter:
+    """
+    Resolve topics to handlers by matching against MQTT topic filters stored in a trie.
+    Literal levels take precedence over '+' which takes precedence over '#'.
+    """
+    def __init__(self):
+        self.__root = _Node()
+        self.__lock = threading.Lock()
+
+    def add(self, topic_filter: str, handler: typing.Callable, names: typing.Optional[typing.Sequence[typing.Optional[str]]] = None) -> None:
+        """
+        Add a route. Replaces an existing route with the same topic filter.
+        :param topic_filter: MQTT topic filter with optional '+' and '#' wildcards.
+        :param handler: Callable associated with the topic filter.
+        :param names: Names of the values captured by the wildcards, in order of appearance.
+        :return: None.
+        """
+        levels = topic_filter.split("/")
+        wildcards = sum(1 for level in levels if level in ("+", "#"))
+        if "#" in levels[:-1]:
+            raise ValueError("'#' must be the last level of '{}'".format(topic_filter))
+        names = tuple(names or (None, ) * wildcards)
+        if len(names) != wildcards:
+            raise ValueError("'{}' contains {} wildcards but got {} names".format(topic_filter, wildcards, len(names)))
+        with self.__lock:
+            node = self.__root
+            for level in levels:
+                if level == "+":
+                    if not node.single:
+                        node.single = _Node()
+                    node = node.single
+                elif level == "#":
+                    if not node.multi:
+                        node.multi = _Node()
+                    node = node.multi
+                else:
+                    if level not in node.children:
+                        node.children[level] = _Node()
+                    node = node.children[level]
+            node.route = (handler, names)
+
+    def remove(self, topic_filter: str) -> None:
+        """
+        Remove a route.
+        :param topic_filter: Topic filter used to add the route.
+        :return: None.
+        """
+        with self.__lock:
+            node = self.__root
+            for level in topic_filter.split("/"):
+                if level == "+":
+                    node = node.single
+                elif level == "#":
+                    node = node.multi
+                else:
+                    node = node.children.get(level)
+                if not node:
+                    raise KeyError(topic_filter)
+            if not node.route:
+                raise KeyError(topic_filter)
+            node.route = None
+
+    def match(self, topic: str) -> typing.Optional[typing.Tuple[typing.Callable, typing.Dict[str, str]]]:
+        """
+        Find the route for a topic.
+        :param topic: Topic of a received message.
+        :return: Tuple containing the handler and the named values captured by wildcards or None.
+        """
+        levels = topic.split("/")
+        match = self.__match(self.__root, levels, 0, list())
+        if match:
+            handler, names, values = match
+            return handler, {name: value for name, value in zip(names, values) if name}
+        return None
+
+    def __match(self, node: _Node, levels: typing.List[str], pos: int, values: typing.List[str]):
+        if pos == len(levels):
+            if node.route:
+                return node.route[0], node.route[1], values
+            if node.multi and node.multi.route:
+                return node.multi.route[0], node.multi.route[1], values + [""]
+            return None
+        child = node.children.get(levels[pos])
+        if child:
+            match = self.__match(child, levels, pos + 1, values)
+            if match:
+                return match
+        if node.single:
+            match = self.__match(node.single, levels, pos + 1, values + [levels[pos]])
+            if match:
+                return match
+        if node.multi and node.multi.route:
+            return node.multi.route[0], node.multi.route[1], values + ["/".join(levels[pos:])]
+        return None
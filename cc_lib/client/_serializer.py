@@ -0,0 +1,99 @@
+"""
+   Copyright 2019 InfAI (CC SES)
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+__all__ = ('Serializer', 'JSONSerializer', 'ORJSONSerializer', 'get_serializer')
+
+
+import importlib
+import typing
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class Serializer:
+    """
+    Base class for codecs used to encode outgoing and decode incoming messages.
+    Encoded messages must be JSON compatible for the platform.
+    """
+    def dumps(self, obj: typing.Any) -> typing.Union[str, bytes]:
+        """
+        Encode an object.
+        :param obj: Dictionary containing strings.
+        :return: String or bytes.
+        """
+        raise NotImplementedError
+
+    def loads(self, data: typing.Union[str, bytes]) -> typing.Any:
+        """
+        Decode a message.
+        :param data: String or bytes.
+        :return: Decoded object.
+        """
+        raise NotImplementedError
+
+
+class JSONSerializer(Serializer):
+    """
+    Codec using the json module of the standard library.
+    """
+    def dumps(self, obj: typing.Any) -> str:
+        return json.dumps(obj)
+
+    def loads(self, data: typing.Union[str, bytes]) -> typing.Any:
+        return json.loads(data)
+
+
+class ORJSONSerializer(Serializer):
+    """
+    Codec using orjson. Requires the orjson package.
+    """
+    def __init__(self):
+        if orjson is None:
+            raise RuntimeError("orjson not installed")
+
+    def dumps(self, obj: typing.Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def loads(self, data: typing.Union[str, bytes]) -> typing.Any:
+        return orjson.loads(data)
+
+
+def get_serializer(name: str) -> Serializer:
+    """
+    Create a serializer.
+    :param name: 'json', 'orjson', 'auto' (orjson if installed, otherwise json) or import path of a
+    Serializer class or instance ('package.module:attribute').
+    :return: Serializer object.
+    """
+    if name == "json":
+        return JSONSerializer()
+    if name == "orjson":
+        return ORJSONSerializer()
+    if name == "auto":
+        return ORJSONSerializer() if orjson is not None else JSONSerializer()
+    module, sep, attr = name.partition(":")
+    if not sep or not module or not attr:
+        raise ValueError("unknown serializer '{}'".format(name))
+    obj = getattr(importlib.import_module(module), attr)
+    if isinstance(obj, type):
+        obj = obj()
+    if not isinstance(obj, Serializer):
+        raise TypeError("instance of {} required but got {}".format(Serializer, type(obj)))
+    return obj
@@ -0,0 +1,106 @@
+"""
+   Copyright 2019 InfAI (CC SES)
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+__all__ = ("Spool", "EvictionPolicy")
+
+
+from .._util import get_logger
+import threading
+import sqlite3
+import typing
+
+
+logger = get_logger(__name__.rsplit(".", 1)[-1].replace("_", ""))
+
+
+class EvictionPolicy:
+    drop_oldest = "drop_oldest"
+    drop_newest = "drop_newest"
+
+
+class Spool:
+    """
+    Persistent first-in-first-out store for outbound messages backed by SQLite.
+    """
+    def __init__(self, path: str, max_messages: int, eviction_policy: str = EvictionPolicy.drop_oldest):
+        if eviction_policy not in (EvictionPolicy.drop_oldest, EvictionPolicy.drop_newest):
+            raise ValueError("unknown eviction policy '{}'".format(eviction_policy))
+        if max_messages < 1:
+            raise ValueError("max messages must be larger than 0")
+        self.__max_messages = max_messages
+        self.__eviction_policy = eviction_policy
+        self.__lock = threading.Lock()
+        self.__dropped = 0
+        self.__conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.__conn.execute("PRAGMA journal_mode=WAL")
+        self.__conn.execute("PRAGMA synchronous=NORMAL")
+        self.__conn.execute(
+            "CREATE TABLE IF NOT EXISTS spool (id INTEGER PRIMARY KEY AUTOINCREMENT, topic TEXT NOT NULL, payload BLOB, qos INTEGER NOT NULL)"
+        )
+        self.__count = self.__conn.execute("SELECT COUNT(*) FROM spool").fetchone()[0]
+        if self.__count:
+            logger.info("spool contains {} messages from previous run".format(self.__count))
+
+    @property
+    def dropped(self) -> int:
+        return self.__dropped
+
+    def put(self, topic: str, payload: typing.Union[str, bytes], qos: int) -> bool:
+        """
+        Append a message. Evicts a message according to the eviction policy if the spool is full.
+        :param topic: Message topic.
+        :param payload: Message payload.
+        :param qos: Message QoS.
+        :return: 'False' if the message has been dropped.
+        """
+        if isinstance(payload, str):
+            payload = payload.encode()
+        with self.__lock:
+            if self.__count >= self.__max_messages:
+                self.__dropped += 1
+                if self.__eviction_policy == EvictionPolicy.drop_newest:
+                    logger.warning("spool full - dropped newest message")
+                    return False
+                self.__conn.execute("DELETE FROM spool WHERE id = (SELECT MIN(id) FROM spool)")
+                self.__count -= 1
+                logger.warning("spool full - dropped oldest message")
+            self.__conn.execute("INSERT INTO spool (topic, payload, qos) VALUES (?, ?, ?)", (topic, payload, qos))
+            self.__count += 1
+        return True
+
+    def peek(self, count: int) -> typing.List[typing.Tuple[int, str, bytes, int]]:
+        """
+        Get the oldest messages without removing them.
+        :param count: Maximum number of messages.
+        :return: List of (id, topic, payload, qos) tuples.
+        """
+        with self.__lock:
+            return self.__conn.execute(
+                "SELECT id, topic, payload, qos FROM spool ORDER BY id LIMIT ?", (count, )
+            ).fetchall()
+
+    def remove(self, ids: typing.List[int]) -> None:
+        """
+        Remove messages after they have been forwarded.
+        :param ids: Message IDs returned by peek.
+        :return: None.
+        """
+        with self.__lock:
+            cursor = self.__conn.executemany("DELETE FROM spool WHERE id = ?", ((m_id, ) for m_id in ids))
+            self.__count -= cursor.rowcount
+
+    def __len__(self):
+        return self.__count
@@ -0,0 +1,156 @@
+"""
+   Copyright 2019 InfAI (CC SES)
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+__all__ = ("compile_template", "TopicCache")
+
+
+import threading
+import string
+import typing
+
+
+def compile_template(template: str, fields: typing.Sequence[str]) -> typing.Callable[..., str]:
+    """
+    Validate a topic template and return its format function.
+    :param template: Template string, e.g. 'event/{device_id}/{service_id}'.
+    :param fields: Allowed field names.
+    :return: Bound format method of the template.
+    """
+    for _, field, _, _ in string.Formatter().parse(template):
+        if field is not None and field not in fields:
+            raise ValueError("unknown field '{}' in topic template '{}'".format(field, template))
+    return template.format
+
+
+class TopicCache:
+    """
+    Bounded cache of topics and prefixed device IDs. Topics are built once per device and service from
+    templates compiled on creation, the oldest entries are evicted if max_size is exceeded.
+    """
+
+    __slots__ = (
+        '__prefix',
+        '__max_size',
+        '__entries',
+        '__lock',
+        '__event',
+        '__cmd_resp',
+        '__cmd_sub',
+        '__fog_prcs_pub',
+        '__dev_err',
+        '__cmd_err',
+        '__client_err'
+    )
+
+    def __init__(self, api_conf, device_id_prefix: typing.Optional[str] = None, max_size: int = 10000):
+        """
+        :param api_conf: Configuration providing the topic templates.
+        :param device_id_prefix: Prefix added to device IDs.
+        :param max_size: Maximum number of cached entries.
+        """
+        if max_size < 1:
+            raise ValueError("max size must be larger than 0")
+        self.__prefix = "{}-".format(device_id_prefix) if device_id_prefix else None
+        self.__max_size = max_size
+        self.__entries = dict()
+        self.__lock = threading.Lock()
+        self.__event = compile_template(api_conf.event_pub_topic, ("device_id", "service_id"))
+        self.__cmd_resp = compile_template(api_conf.command_response_pub_topic, ("device_id", "service_id"))
+        self.__cmd_sub = compile_template(api_conf.command_sub_topic, ("device_id", ))
+        self.__fog_prcs_pub = compile_template(api_conf.fog_processes_pub_topic, ("hub_id", "sub_topic"))
+        self.__dev_err = compile_template(api_conf.device_error_pub_topic, ("device_id", ))
+        self.__cmd_err = compile_template(api_conf.command_error_pub_topic, ("correlation_id", ))
+        self.__client_err = compile_template(api_conf.client_error_pub_topic, ())()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __store(self, key: tuple, value: str) -> str:
+        with self.__lock:
+            if len(self.__entries) >= self.__max_size:
+                del self.__entries[next(iter(self.__entries))]
+            self.__entries[key] = value
+        return value
+
+    def prefix_id(self, device_id: str) -> str:
+        """
+        Add the prefix to a device ID.
+        :param device_id: Device ID.
+        :return: Prefixed device ID or unchanged device ID if no prefix is set.
+        """
+        if not self.__prefix:
+            return device_id
+        key = (0, device_id)
+        try:
+            return self.__entries[key]
+        except KeyError:
+            return self.__store(key, self.__prefix + device_id)
+
+    def parse_id(self, device_id: str) -> str:
+        """
+        Remove the prefix from a device ID.
+        :param device_id: Prefixed device ID.
+        :return: Device ID.
+        """
+        if not self.__prefix:
+            return device_id
+        key = (1, device_id)
+        try:
+            return self.__entries[key]
+        except KeyError:
+            return self.__store(key, device_id.replace(self.__prefix, ""))
+
+    def event(self, device_id: str, service_uri: str) -> str:
+        key = (2, device_id, service_uri)
+        try:
+            return self.__entries[key]
+        except KeyError:
+            return self.__store(key, self.__event(device_id=self.prefix_id(device_id), service_id=service_uri))
+
+    def command_response(self, device_id: str, service_uri: str) -> str:
+        key = (3, device_id, service_uri)
+        try:
+            return self.__entries[key]
+        except KeyError:
+            return self.__store(key, self.__cmd_resp(device_id=self.prefix_id(device_id), service_id=service_uri))
+
+    def command_sub(self, device_id: str) -> str:
+        key = (4, device_id)
+        try:
+            return self.__entries[key]
+        except KeyError:
+            return self.__store(key, self.__cmd_sub(device_id=self.prefix_id(device_id)))
+
+    def device_error(self, device_id: str) -> str:
+        key = (5, device_id)
+        try:
+            return self.__entries[key]
+        except KeyError:
+            return self.__store(key, self.__dev_err(device_id=device_id))
+
+    def fog_processes_pub(self, hub_id: str, sub_topic: str) -> str:
+        key = (6, hub_id, sub_topic)
+        try:
+            return self.__entries[key]
+        except KeyError:
+            return self.__store(key, self.__fog_prcs_pub(hub_id=hub_id, sub_topic=sub_topic))
+
+    def command_error(self, correlation_id: str) -> str:
+        return self.__cmd_err(correlation_id=correlation_id)
+
+    @property
+    def client_error(self) -> str:
+        return self.__client_err
@@ -17,9 +17,11 @@
 
 from ._message import *
 from ._envelope import *
+from ._correlation import *
 
 
 __all__ = (
     _message.__all__,
-    _envelope.__all__
+    _envelope.__all__,
+    _correlation.__all__
 )
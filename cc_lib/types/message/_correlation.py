@@ -0,0 +1,123 @@
+"""
+   Copyright 2019 InfAI (CC SES)
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+__all__ = ("CorrelationIdStrategy", "CorrelationIds", "correlation_ids")
+
+
+import itertools
+import threading
+import typing
+import uuid
+import os
+
+
+class CorrelationIdStrategy:
+    uuid4 = "uuid4"
+    pool = "pool"
+    counter = "counter"
+
+
+def _uuid4() -> str:
+    return str(uuid.uuid4())
+
+
+class _RandomPool:
+    """
+    Random IDs (32 hex characters) taken from a batch of random bytes requested at once.
+    """
+    def __init__(self, size: int = 1024):
+        self.__size = size
+        self.__ids = iter(())
+        self.__lock = threading.Lock()
+
+    def __call__(self) -> str:
+        try:
+            return next(self.__ids)
+        except StopIteration:
+            with self.__lock:
+                try:
+                    return next(self.__ids)
+                except StopIteration:
+                    raw = os.urandom(16 * self.__size).hex()
+                    self.__ids = iter([raw[pos:pos + 32] for pos in range(0, len(raw), 32)])
+                    return next(self.__ids)
+
+
+class _Counter:
+    """
+    IDs built from a scope, a random token generated per scope and a monotonic counter, e.g. '<hub id>-<token>-<n>'.
+    """
+    def __init__(self):
+        self.__count = itertools.count()
+        self.__prefix = None
+        self.set_scope(None)
+
+    def set_scope(self, scope: typing.Optional[str]) -> None:
+        token = os.urandom(4).hex()
+        self.__prefix = "{}-{}-".format(scope, token) if scope else "{}-".format(token)
+
+    def __call__(self) -> str:
+        return self.__prefix + str(next(self.__count))
+
+
+class CorrelationIds:
+    """
+    Correlation ID generator for envelopes created without a correlation ID.
+    If lazy is enabled IDs are generated on first access instead of on envelope creation.
+    """
+    def __init__(self, strategy: str = CorrelationIdStrategy.uuid4, lazy: bool = False):
+        self.generate = _uuid4
+        self.lazy = False
+        self.__strategy = CorrelationIdStrategy.uuid4
+        self.__counter = None
+        self.configure(strategy=strategy, lazy=lazy)
+
+    @property
+    def strategy(self) -> str:
+        return self.__strategy
+
+    def configure(self, strategy: str = CorrelationIdStrategy.uuid4, lazy: bool = False) -> None:
+        """
+        Set the strategy used for new IDs.
+        :param strategy: 'uuid4', 'pool' (random IDs from batched random bytes) or 'counter' (scope prefixed counter).
+        :param lazy: Generate IDs on first access.
+        """
+        if strategy != self.__strategy:
+            if strategy == CorrelationIdStrategy.uuid4:
+                self.generate = _uuid4
+                self.__counter = None
+            elif strategy == CorrelationIdStrategy.pool:
+                self.generate = _RandomPool()
+                self.__counter = None
+            elif strategy == CorrelationIdStrategy.counter:
+                self.__counter = _Counter()
+                self.generate = self.__counter
+            else:
+                raise ValueError("unknown correlation id strategy '{}'".format(strategy))
+            self.__strategy = strategy
+        self.lazy = lazy
+
+    def set_scope(self, scope: typing.Optional[str]) -> None:
+        """
+        Set the scope (e.g. hub ID) prefixed to counter IDs.
+        :param scope: Scope string or None.
+        """
+        if self.__counter:
+            self.__counter.set_scope(scope)
+
+
+# global fallback, lazy so envelopes sent by a client receive IDs from the client's own generator
+correlation_ids = CorrelationIds(lazy=True)
@@ -15,29 +15,50 @@
 """
 
 
-__all__ = ("CommandEnvelope", "CommandResponseEnvelope", "EventEnvelope", "FogProcessesEnvelope", "ClientErrorEnvelope", "DeviceErrorEnvelope", "CommandErrorEnvelope", "response_from_command_envelope", "error_from_command_envelope")
+__all__ = ("CommandEnvelope", "LazyCommandEnvelope", "CommandResponseEnvelope", "EventEnvelope", "FogProcessesEnvelope", "ClientErrorEnvelope", "DeviceErrorEnvelope", "CommandErrorEnvelope", "response_from_command_envelope", "error_from_command_envelope", "event_envelope_unchecked", "command_response_envelope_unchecked", "response_from_command_envelope_unchecked")
 
 
 from ._message import *
+from ._correlation import correlation_ids, CorrelationIds
 from ...types import Device
-from ..._util import validate_instance
+from ..._util import validate_instance, TypeValidation
+import threading
 import typing
-import uuid
+import json
 
 
 class Envelope:
 
-    __slots__ = ('__message', '__correlation_id')
+    __slots__ = ('__message', '__correlation_id', '__correlation_ids')
 
     def __init__(self, message: typing.Any = None, corr_id: typing.Optional[str] = None):
-        if corr_id:
+        if corr_id and TypeValidation.enabled:
             validate_instance(corr_id, str)
-        self.__correlation_id = corr_id or str(uuid.uuid4())
+        if corr_id:
+            self.__correlation_id = corr_id
+        else:
+            self.__correlation_id = None if correlation_ids.lazy else correlation_ids.generate()
+        self.__correlation_ids = None
         self.message = message
 
+    def _use_correlation_ids(self, generator: CorrelationIds) -> None:
+        """
+        Take the correlation ID from the given generator instead of the global one, if no ID has been set yet.
+        :param generator: CorrelationIds object.
+        """
+        if self.__correlation_id is None:
+            if generator.lazy:
+                self.__correlation_ids = generator
+            else:
+                self.__correlation_id = generator.generate()
+
     @property
     def correlation_id(self) -> str:
-        return self.__correlation_id
+        corr_id = self.__correlation_id
+        if corr_id is None:
+            corr_id = self.__correlation_id = (self.__correlation_ids or correlation_ids).generate()
+            self.__correlation_ids = None
+        return corr_id
 
     @property
     def message(self) -> typing.Any:
@@ -83,7 +104,8 @@ class DeviceEnvelope(Envelope):
             self.__device_id = device.id
         else:
             raise TypeError(type(device))
-        validate_instance(service, str)
+        if TypeValidation.enabled:
+            validate_instance(service, str)
         self.__service_uri = service
 
     @property
@@ -100,16 +122,13 @@ class DeviceEnvelope(Envelope):
 
     @message.setter
     def message(self, arg):
-        validate_instance(arg, DeviceMessage)
+        if TypeValidation.enabled:
+            validate_instance(arg, DeviceMessage)
         Envelope.message.fset(self, arg)
 
     def __iter__(self):
-        items = (
-            ('correlation_id', self.correlation_id),
-            ('payload', dict(self.message))
-        )
-        for item in items:
-            yield item
+        yield 'correlation_id', self.correlation_id
+        yield 'payload', dict(self.message)
 
     def __str__(self, **kwargs):
         return super().__str__(device_id=self.device_id, service_uri=self.service_uri, **kwargs)
@@ -144,6 +163,113 @@ class CommandEnvelope(DeviceEnvelope):
         return super().__str__(completion_strategy=self.completion_strategy, timestamp=self.timestamp)
 
 
+_decoding = object()
+
+
+class LazyCommandEnvelope(CommandEnvelope):
+    """
+    Command envelope holding the raw command payload. Device ID and service URI are taken from the topic,
+    all other fields are decoded on first access. Decoding errors are raised on access.
+    """
+
+    __slots__ = ('__device_id', '__service_uri', '__raw', '__loads', '__lock')
+
+    def __init__(self, device: str, service: str, raw: typing.Union[str, bytes], loads: typing.Callable[[typing.Union[str, bytes]], typing.Any] = json.loads):
+        validate_instance(device, str)
+        validate_instance(service, str)
+        validate_instance(raw, (str, bytes))
+        self.__device_id = device
+        self.__service_uri = service
+        self.__raw = raw
+        self.__loads = loads
+        self.__lock = threading.RLock()
+
+    def __getstate__(self) -> dict:
+        # the lock can not be pickled, e.g. if the queue spills envelopes to disk
+        with self.__lock:
+            state = dict()
+            for cls in type(self).__mro__:
+                for name in getattr(cls, "__slots__", ()):
+                    if name.startswith("__"):
+                        name = "_{}{}".format(cls.__name__.lstrip("_"), name)
+                    if name != "_LazyCommandEnvelope__lock" and hasattr(self, name):
+                        state[name] = getattr(self, name)
+            return state
+
+    def __setstate__(self, state: dict) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+        self.__lock = threading.RLock()
+
+    def __decode(self):
+        if self.__raw is None:
+            return
+        with self.__lock:
+            raw = self.__raw
+            # the envelope's own setters are called while decoding
+            if raw is None or raw is _decoding:
+                return
+            payload = self.__loads(raw)
+            message = DeviceMessage(
+                data=payload["payload"].get("data"),
+                metadata=payload["payload"].get("metadata")
+            )
+            self.__raw = _decoding
+            try:
+                CommandEnvelope.__init__(
+                    self,
+                    device=self.__device_id,
+                    service=self.__service_uri,
+                    message=message,
+                    corr_id=payload["correlation_id"],
+                    completion_strategy=payload["completion_strategy"],
+                    timestamp=payload["timestamp"]
+                )
+            except Exception:
+                self.__raw = raw
+                raise
+            # set last, other threads only skip the lock once all fields are set
+            self.__raw = None
+
+    @property
+    def raw(self) -> typing.Optional[typing.Union[str, bytes]]:
+        with self.__lock:
+            return self.__raw
+
+    @property
+    def device_id(self) -> str:
+        return self.__device_id
+
+    @property
+    def service_uri(self) -> str:
+        return self.__service_uri
+
+    @property
+    def correlation_id(self) -> str:
+        self.__decode()
+        return CommandEnvelope.correlation_id.fget(self)
+
+    @property
+    def message(self) -> DeviceMessage:
+        self.__decode()
+        return CommandEnvelope.message.fget(self)
+
+    @message.setter
+    def message(self, arg):
+        self.__decode()
+        CommandEnvelope.message.fset(self, arg)
+
+    @property
+    def completion_strategy(self) -> str:
+        self.__decode()
+        return CommandEnvelope.completion_strategy.fget(self)
+
+    @property
+    def timestamp(self) -> float:
+        self.__decode()
+        return CommandEnvelope.timestamp.fget(self)
+
+
 class CommandResponseEnvelope(DeviceEnvelope):
     def __init__(
             self,
@@ -156,7 +282,8 @@ class CommandResponseEnvelope(DeviceEnvelope):
 
 
 def response_from_command_envelope(message: DeviceMessage, envelope: CommandEnvelope) -> CommandResponseEnvelope:
-    validate_instance(envelope, CommandEnvelope)
+    if TypeValidation.enabled:
+        validate_instance(envelope, CommandEnvelope)
     return CommandResponseEnvelope(
         device=envelope.device_id,
         service=envelope.service_uri,
@@ -171,6 +298,61 @@ class EventEnvelope(DeviceEnvelope):
         super().__init__(device=device, service=service, message=message)
 
 
+def _device_envelope_unchecked(cls, device_id: str, service_uri: str, message: DeviceMessage, corr_id: typing.Optional[str]) -> DeviceEnvelope:
+    envelope = cls.__new__(cls)
+    envelope._Envelope__correlation_id = corr_id
+    envelope._Envelope__correlation_ids = None
+    envelope._Envelope__message = message
+    envelope._DeviceEnvelope__device_id = device_id
+    envelope._DeviceEnvelope__service_uri = service_uri
+    return envelope
+
+
+def event_envelope_unchecked(device_id: str, service_uri: str, message: DeviceMessage) -> EventEnvelope:
+    """
+    Create an EventEnvelope without type validation, for trusted callers only.
+    :param device_id: Device ID.
+    :param service_uri: Service URI.
+    :param message: DeviceMessage object.
+    :return: EventEnvelope object.
+    """
+    return _device_envelope_unchecked(
+        EventEnvelope,
+        device_id,
+        service_uri,
+        message,
+        None if correlation_ids.lazy else correlation_ids.generate()
+    )
+
+
+def command_response_envelope_unchecked(device_id: str, service_uri: str, message: DeviceMessage, corr_id: str) -> CommandResponseEnvelope:
+    """
+    Create a CommandResponseEnvelope without type validation, for trusted callers only.
+    :param device_id: Device ID.
+    :param service_uri: Service URI.
+    :param message: DeviceMessage object.
+    :param corr_id: Correlation ID of the command.
+    :return: CommandResponseEnvelope object.
+    """
+    return _device_envelope_unchecked(CommandResponseEnvelope, device_id, service_uri, message, corr_id)
+
+
+def response_from_command_envelope_unchecked(message: DeviceMessage, envelope: CommandEnvelope) -> CommandResponseEnvelope:
+    """
+    Create a response for a command without type validation, for trusted callers only.
+    :param message: DeviceMessage object.
+    :param envelope: CommandEnvelope object.
+    :return: CommandResponseEnvelope object.
+    """
+    return _device_envelope_unchecked(
+        CommandResponseEnvelope,
+        envelope.device_id,
+        envelope.service_uri,
+        message,
+        envelope.correlation_id
+    )
+
+
 class FogProcessesEnvelope(Envelope):
 
     __slots__ = ('__sub_topic',)
@@ -15,43 +15,86 @@
 """
 
 
-__all__ = ("DeviceMessage", )
+__all__ = ("DeviceMessage", "device_message_unchecked", "set_type_validation")
 
 
-from ..._util import validate_instance
+from ..._util import validate_instance, TypeValidation
 import typing
+import json
+
+
+_not_decoded = object()
 
 
 class DeviceMessage:
 
-    __slots__ = ('__metadata', '__data')
+    __slots__ = ('__metadata', '__data', '__encoded', '__loads')
 
     def __init__(self, data: typing.Optional[str] = None, metadata: typing.Optional[str] = None):
         self.__metadata = metadata or str()
         self.__data = data or str()
+        self.__encoded = None
+        self.__loads = None
+
+    @classmethod
+    def from_encoded(cls, payload: typing.Union[str, bytes], loads: typing.Callable[[typing.Union[str, bytes]], typing.Any] = json.loads) -> "DeviceMessage":
+        """
+        Create a message from an already JSON encoded payload ('{"metadata": ..., "data": ...}').
+        The payload is published as is, data and metadata are decoded on first access.
+        :param payload: Encoded payload.
+        :param loads: Function decoding the payload, e.g. the loads method of the client's serializer.
+        :return: DeviceMessage object.
+        """
+        validate_instance(payload, (str, bytes))
+        message = cls.__new__(cls)
+        message.__metadata = _not_decoded
+        message.__data = _not_decoded
+        message.__encoded = payload
+        message.__loads = loads
+        return message
+
+    def __decode(self):
+        if self.__data is _not_decoded:
+            payload = self.__loads(self.__encoded)
+            self.__metadata = payload.get("metadata") or str()
+            self.__data = payload.get("data") or str()
+
+    @property
+    def encoded(self) -> typing.Optional[typing.Union[str, bytes]]:
+        """
+        Pre-encoded payload or None.
+        """
+        return self.__encoded
 
     @property
     def metadata(self) -> str:
+        self.__decode()
         return self.__metadata
 
     @metadata.setter
     def metadata(self, arg: str):
-        validate_instance(arg, str)
+        if TypeValidation.enabled:
+            validate_instance(arg, str)
+        self.__decode()
         self.__metadata = arg
+        self.__encoded = None
 
     @property
     def data(self) -> str:
+        self.__decode()
         return self.__data
 
     @data.setter
     def data(self, arg: str):
-        validate_instance(arg, str)
+        if TypeValidation.enabled:
+            validate_instance(arg, str)
+        self.__decode()
         self.__data = arg
+        self.__encoded = None
 
     def __iter__(self):
-        items = (('metadata', self.metadata), ('data', self.data))
-        for item in items:
-            yield item
+        yield 'metadata', self.metadata
+        yield 'data', self.data
 
     def __repr__(self):
         """
@@ -62,3 +105,29 @@ class DeviceMessage:
         return "{}({})".format(
             __class__.__name__, ", ".join(["=".join([key, str(value)]) for key, value in attributes])
         )
+
+
+def device_message_unchecked(data: str = "", metadata: str = "") -> DeviceMessage:
+    """
+    Create a DeviceMessage without type validation, for trusted callers only.
+    :param data: Data string.
+    :param metadata: Metadata string.
+    :return: DeviceMessage object.
+    """
+    message = DeviceMessage.__new__(DeviceMessage)
+    message._DeviceMessage__metadata = metadata
+    message._DeviceMessage__data = data
+    message._DeviceMessage__encoded = None
+    message._DeviceMessage__loads = None
+    return message
+
+
+def set_type_validation(enabled: bool) -> None:
+    """
+    Enable or disable type validation of envelopes, messages and send methods for the whole process.
+    Enabled by default, disable only if all callers are trusted.
+    :param enabled: Validate types if 'True'.
+    :return: None.
+    """
+    validate_instance(enabled, bool)
+    TypeValidation.enabled = enabled
@@ -41,9 +41,12 @@ setuptools.setup(
     url=metadata.get('__url__'),
     copyright=metadata.get('__copyright__'),
     install_requires=[
-        'paho-mqtt>=1.4.0,<1.6',
+        'paho-mqtt>=1.5.0,<1.6',
         'simple-env-var-manager @ git+https://github.com/y-du/simple-env-var-manager.git@2.3.0'
     ],
+    extras_require={
+        'orjson': ['orjson']
+    },
     packages=setuptools.find_packages(),
     python_requires='>=3.7',
     classifiers=(
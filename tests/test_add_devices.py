@@ -0,0 +1,63 @@
+"""
+   Copyright 2019 InfAI (CC SES)
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+from cc_lib.client import Client, Executor
+from cc_lib.types import Device
+import threading
+import unittest
+
+
+class TestAddDevices(unittest.TestCase):
+    def setUp(self):
+        self.executor = Executor(max_workers=2)
+        self.client = Client(user="user", pw="pw", executor=self.executor)
+        self.calls = list()
+        self.lock = threading.Lock()
+
+        def add_device(device, worker=False, consistency_delay=True, sync_wait=True):
+            with self.lock:
+                self.calls.append((device.id, sync_wait, threading.current_thread().name))
+            if device.id == "fail":
+                raise RuntimeError("add failed")
+            return False
+
+        # replace the name mangled private method on the instance
+        self.client._Client__add_device = add_device
+        self.devices = [Device("dev-{}".format(num), "name", "type") for num in range(10)]
+
+    def test_results(self):
+        result = self.client.add_devices(self.devices + [Device("fail", "name", "type")], concurrency=4)
+        self.assertEqual(len(self.calls), 11)
+        self.assertEqual(list(result.failed), ["fail"])
+        # inner calls must not wait for hub synchronization again
+        self.assertTrue(all(not sync_wait for _, sync_wait, _ in self.calls))
+        # work is done by the caller and the shared executor only
+        self.assertTrue(all(name == threading.current_thread().name or name.startswith("executor") for _, _, name in self.calls))
+
+    def test_saturated_executor(self):
+        release = threading.Event()
+        for _ in range(2):
+            self.executor.submit(target=release.wait, args=(5, ))
+        try:
+            result = self.client.add_devices(self.devices, concurrency=4)
+            self.assertTrue(result.ok())
+            self.assertEqual(len(self.calls), 10)
+        finally:
+            release.set()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+"""
+   Copyright 2019 InfAI (CC SES)
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+from cc_lib.client import AsyncClient, ConnectError
+import threading
+import unittest
+import asyncio
+
+
+class TestAsyncClient(unittest.TestCase):
+    def test_connect_in_progress(self):
+        async def connect():
+            client = AsyncClient(user="user", pw="pw")
+            lock = client.client._Client__connect_lock
+            # simulate a pending connect completed by the event loop
+            lock.acquire()
+            # release eventually so a blocking acquire fails the test instead of hanging it
+            timer = threading.Timer(5, lock.release)
+            timer.start()
+            try:
+                with self.assertRaises(ConnectError):
+                    await client.connect()
+            finally:
+                timer.cancel()
+            self.assertTrue(lock.locked())
+            lock.release()
+
+        asyncio.run(asyncio.wait_for(connect(), 10))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+"""
+   Copyright 2019 InfAI (CC SES)
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+from cc_lib.client import Client
+from cc_lib.client._client import _raw_field
+from cc_lib._configuration import cc_conf
+import unittest
+import json
+import time
+
+
+def _raw(timestamp, data="data"):
+    return json.dumps({
+        "correlation_id": "corr",
+        "payload": {"data": data, "metadata": ""},
+        "completion_strategy": "optimistic",
+        "timestamp": timestamp
+    })
+
+
+class TestRawField(unittest.TestCase):
+    def test_parse(self):
+        self.assertEqual(_raw_field(_raw(1.5), "timestamp"), "1.5")
+        self.assertEqual(_raw_field(_raw(1500).encode(), "timestamp"), "1500")
+        self.assertEqual(_raw_field(_raw("2019-01-01"), "timestamp"), "2019-01-01")
+        # escaped keys inside string data are ignored
+        self.assertEqual(_raw_field(_raw(1.5, data=json.dumps({"timestamp": 2})), "timestamp"), "1.5")
+        # ambiguous payloads are decoded instead
+        self.assertIsNone(_raw_field(json.dumps({"payload": {"data": {"timestamp": 2}}, "timestamp": 1}), "timestamp"))
+        self.assertIsNone(_raw_field(json.dumps({"payload": {}}), "timestamp"))
+        self.assertEqual(_raw_field(_raw(1.5).encode(), "correlation_id"), "corr")
+        # strings with escape sequences are decoded instead
+        self.assertIsNone(_raw_field(json.dumps({"correlation_id": "a\"b"}), "correlation_id"))
+        self.assertIsNone(_raw_field(json.dumps({"correlation_id": 1}), "correlation_id"))
+
+
+class TestCommandAge(unittest.TestCase):
+    def setUp(self):
+        self.conf = (cc_conf.connector.command_max_age, cc_conf.connector.lazy_command_decoding)
+        cc_conf.connector.command_max_age = 60
+
+    def tearDown(self):
+        cc_conf.connector.command_max_age, cc_conf.connector.lazy_command_decoding = self.conf
+
+    def __receive(self, client, *timestamps):
+        for timestamp in timestamps:
+            client._Client__route_message(_raw(timestamp), "command/dev/srv")
+        try:
+            return client.receive_commands(max_commands=10, block=False)
+        except Exception:
+            return list()
+
+    def test_expired(self):
+        client = Client(user="user", pw="pw")
+        now = time.time()
+        envelopes = self.__receive(client, now, now - 120, (now - 120) * 1000, "invalid", str(now - 120), None)
+        self.assertEqual([envelope.timestamp for envelope in envelopes], [now, "invalid", None])
+        self.assertEqual(client.get_metrics()["commands_expired"], 3)
+
+    def test_service_max_age(self):
+        client = Client(user="user", pw="pw")
+        client.set_command_max_age("srv", 0)
+        self.assertEqual(len(self.__receive(client, time.time() - 120)), 1)
+
+    def test_lazy(self):
+        cc_conf.connector.lazy_command_decoding = True
+        client = Client(user="user", pw="pw")
+        now = time.time()
+        envelopes = self.__receive(client, now, now - 120, "invalid")
+        self.assertEqual(len(envelopes), 2)
+        # checking the age does not decode the command
+        self.assertTrue(all(envelope.raw is not None for envelope in envelopes))
+        self.assertEqual(client.get_metrics()["commands_expired"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+   Copyright 2019 InfAI (CC SES)
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+from cc_lib.client._asynchron import Completion, Future
+import threading
+import unittest
+import queue
+
+
+class TestCompletion(unittest.TestCase):
+    def test_join(self):
+        completion = Completion(name="send-{}", name_args=("event", ))
+        self.assertEqual(completion.name, "send-event")
+        with self.assertRaises(TimeoutError):
+            completion.join(0.01)
+        threading.Timer(0.02, completion.set).start()
+        completion.join(5)
+        self.assertTrue(completion.done)
+
+    def test_usr_method_and_future(self):
+        done = threading.Event()
+        completion = Completion()
+        future = Future(completion)
+        future.add_done_callback(lambda f: done.set())
+        completion.result = "result"
+        completion.set()
+        self.assertTrue(done.wait(5))
+        self.assertEqual(future.result(), "result")
+
+    def test_pool(self):
+        completion = Completion.acquire(usr_data="a")
+        with self.assertRaises(RuntimeError):
+            completion.release()
+        completion.result = "result"
+        completion.set()
+        completion.join()
+        completion.release()
+        recycled = Completion.acquire(usr_data="b")
+        self.assertIs(recycled, completion)
+        self.assertFalse(recycled.done)
+        self.assertIsNone(recycled.result)
+        self.assertEqual(recycled.usr_data, "b")
+        with self.assertRaises(TimeoutError):
+            recycled.join(0.01)
+        recycled.set()
+        recycled.release()
+
+    def test_recycle_waiter(self):
+        completion = Completion.acquire()
+        threading.Timer(0.02, completion.set).start()
+        completion.join(5)
+        waiter = completion._Completion__waiter
+        self.assertIsNotNone(waiter)
+        completion.release()
+        recycled = Completion.acquire()
+        self.assertIs(recycled, completion)
+        # a late set() of the previous use must not reach waiters of the next one
+        waiter.set()
+        with self.assertRaises(TimeoutError):
+            recycled.join(0.01)
+        recycled.set()
+        recycled.release()
+
+    def test_recycle_while_setting(self):
+        # completions are set on one thread and joined, released and reused on others
+        requests = queue.SimpleQueue()
+
+        def complete():
+            while True:
+                item = requests.get()
+                if item is None:
+                    return
+                completion, value = item
+                completion.result = value
+                completion.set()
+
+        def run(errors):
+            for value in range(2000):
+                completion = Completion.acquire()
+                requests.put((completion, value))
+                completion.join(5)
+                if completion.result != value:
+                    errors.append((value, completion.result))
+                completion.release()
+
+        setter = threading.Thread(target=complete)
+        setter.start()
+        errors = list()
+        threads = [threading.Thread(target=run, args=(errors, )) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(30)
+        requests.put(None)
+        setter.join(5)
+        self.assertEqual(errors, list())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+"""
+   Copyright 2019 InfAI (CC SES)
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+
+from cc_lib.client import Client, NotConnectedError
+from cc_lib._configuration import cc_conf
+from cc_lib.types.message import CorrelationIds, CorrelationIdStrategy, correlation_ids, EventEnvelope, CommandResponseEnvelope, DeviceMessage
+import unittest
+
+
+class TestCorrelationIds(unittest.TestCase):
+    def test_scope(self):
+        ids = CorrelationIds(strategy=CorrelationIdStrategy.counter)
+        ids.set_scope("hub")
+        self.assertTrue(ids.generate().startswith("hub-"))
+        self.assertNotEqual(ids.generate(), ids.generate())
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            CorrelationIds(strategy="unknown")
+
+
+class TestClientCorrelationIds(unittest.TestCase):
+    def setUp(self):
+        self.strategy = cc_conf.connector.correlation_id_strategy
+        self.lazy = cc_conf.connector.lazy_correlation_id
+        cc_conf.connector.correlation_id_strategy = CorrelationIdStrategy.counter
+
+    def tearDown(self):
+        cc_conf.connector.correlation_id_strategy = self.strategy
+        cc_conf.connector.lazy_correlation_id = self.lazy
+
+    def __send(self, client, envelope):
+        try:
+            client.send_event(envelope)
+        except NotConnectedError:
+            pass
+        return envelope
+
+    def __envelope(self):
+        return EventEnvelope(device="dev", service="srv", message=DeviceMessage(data="data"))
+
+    def test_scope_per_client(self):
+        client_a = Client(user="user", pw="pw")
+        client_a._Client__correlation_ids.set_scope("hub-a")
+        client_b = Client(user="user", pw="pw")
+        client_b._Client__correlation_ids.set_scope("hub-b")
+        self.assertTrue(self.__send(client_a, self.__envelope()).correlation_id.startswith("hub-a-"))
+        self.assertTrue(self.__send(client_b, self.__envelope()).correlation_id.startswith("hub-b-"))
+
+    def test_lazy(self):
+        cc_conf.connector.lazy_correlation_id = True
+        client = Client(user="user", pw="pw")
+        client._Client__correlation_ids.set_scope("hub")
+        envelope = self.__send(client, self.__envelope())
+        self.assertTrue(envelope.correlation_id.startswith("hub-"))
+
+    def test_global_not_overridden(self):
+        try:
+            correlation_ids.configure(strategy=CorrelationIdStrategy.pool)
+            Client(user="user", pw="pw")
+            self.assertEqual(correlation_ids.strategy, CorrelationIdStrategy.pool)
+            self.assertFalse(correlation_ids.lazy)
+            envelope = self.__envelope()
+            corr_id = envelope.correlation_id
+            self.assertEqual(len(corr_id), 32)
+            # IDs set by the global generator are kept
+            self.assertEqual(self.__send(Client(user="user", pw="pw"), envelope).correlation_id, corr_id)
+        finally:
+            correlation_ids.configure(lazy=True)
+
+    def test_explicit_id(self):
+        envelope = CommandResponseEnvelope(device="dev", service="srv", message=DeviceMessage(data="data"), corr_id="id")
+        try:
+            Client(user="user", pw="pw").send_command_response(envelope)
+        except NotConnectedError:
+            pass
+        self.assertEqual(envelope.correlation_id, "id")
+
+
+if __name__ == '__main__':
+    unittest.main()
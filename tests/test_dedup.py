@@ -0,0 +1,142 @@
+"""
+   Copyright 2019 InfAI (CC SES)
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+from cc_lib.client import Client
+from cc_lib.client._dedup import CommandDeduplicator
+from cc_lib._configuration import cc_conf
+from cc_lib.types.message import CommandResponseEnvelope, DeviceMessage
+import unittest
+import json
+import time
+
+
+class TestCommandDeduplicator(unittest.TestCase):
+    def test_add(self):
+        dedup = CommandDeduplicator(max_size=10)
+        self.assertTrue(dedup.add("a"))
+        self.assertFalse(dedup.add("a"))
+        self.assertTrue(dedup.add("b"))
+        self.assertEqual(dedup.duplicates, 1)
+        self.assertEqual(len(dedup), 2)
+
+    def test_max_size(self):
+        dedup = CommandDeduplicator(max_size=3)
+        for key in "abcd":
+            self.assertTrue(dedup.add(key))
+        self.assertEqual(len(dedup), 3)
+        # oldest ID was evicted
+        self.assertTrue(dedup.add("a"))
+        self.assertFalse(dedup.add("d"))
+
+    def test_ttl(self):
+        dedup = CommandDeduplicator(ttl=0.05)
+        self.assertTrue(dedup.add("a"))
+        self.assertFalse(dedup.add("a"))
+        time.sleep(0.1)
+        self.assertTrue(dedup.add("a"))
+
+    def test_response(self):
+        dedup = CommandDeduplicator()
+        dedup.set_response("a", "ignored")
+        self.assertIsNone(dedup.get_response("a"))
+        dedup.add("a")
+        self.assertIsNone(dedup.get_response("a"))
+        dedup.set_response("a", "response")
+        self.assertEqual(dedup.get_response("a"), "response")
+
+
+class TestClientDedup(unittest.TestCase):
+    def setUp(self):
+        self.dedup = cc_conf.connector.command_dedup
+        cc_conf.connector.command_dedup = True
+        self.client = Client(user="user", pw="pw")
+        self.sent = list()
+        self.client.send_command_response = lambda envelope, asynchronous=False, qos=None: self.sent.append(envelope)
+
+    def tearDown(self):
+        cc_conf.connector.command_dedup = self.dedup
+
+    def __command(self, corr_id):
+        command = {
+            "correlation_id": corr_id,
+            "payload": {"data": "data", "metadata": ""},
+            "completion_strategy": "optimistic",
+            "timestamp": time.time()
+        }
+        self.client._Client__route_message(json.dumps(command), "command/dev/srv")
+
+    def test_drop_duplicates(self):
+        self.__command("a")
+        self.__command("a")
+        self.__command("b")
+        envelopes = self.client.receive_commands(max_commands=10, block=False)
+        self.assertEqual([envelope.correlation_id for envelope in envelopes], ["a", "b"])
+        self.assertEqual(self.client.get_metrics()["command_duplicates"], 1)
+        self.assertEqual(self.sent, list())
+
+    def test_resend_response(self):
+        self.__command("a")
+        response = CommandResponseEnvelope("dev", "srv", DeviceMessage("ok"), "a")
+        self.client._Client__cmd_dedup.set_response("a", response)
+        self.__command("a")
+        self.assertEqual(self.sent, [response])
+
+
+class TestClientLazyDedup(unittest.TestCase):
+    def setUp(self):
+        self.conf = (cc_conf.connector.command_dedup, cc_conf.connector.lazy_command_decoding)
+        cc_conf.connector.command_dedup = True
+        cc_conf.connector.lazy_command_decoding = True
+        self.client = Client(user="user", pw="pw")
+
+    def tearDown(self):
+        cc_conf.connector.command_dedup, cc_conf.connector.lazy_command_decoding = self.conf
+
+    def __route(self, payload):
+        self.client._Client__route_message(payload, "command/dev/srv")
+
+    def test_drop_duplicates_without_decoding(self):
+        for corr_id in ("a", "a", "b"):
+            self.__route(json.dumps({"correlation_id": corr_id, "payload": {"data": "data"}}))
+        envelopes = self.client.receive_commands(max_commands=10, block=False)
+        # commands are incomplete, only the raw correlation ID was read
+        self.assertTrue(all(envelope.raw is not None for envelope in envelopes))
+        self.assertEqual(len(envelopes), 2)
+        self.assertEqual(self.client.get_metrics()["command_duplicates"], 1)
+
+    def test_decode_ambiguous(self):
+        payload = json.dumps({
+            "correlation_id": "a",
+            "payload": {"data": {"correlation_id": "b"}, "metadata": ""},
+            "completion_strategy": "optimistic",
+            "timestamp": time.time()
+        })
+        self.__route(payload)
+        self.__route(payload)
+        envelopes = self.client.receive_commands(max_commands=10, block=False)
+        self.assertEqual([envelope.correlation_id for envelope in envelopes], ["a"])
+
+    def test_keep_malformed(self):
+        self.__route("{")
+        self.__route("{")
+        envelopes = self.client.receive_commands(max_commands=10, block=False)
+        self.assertEqual(len(envelopes), 2)
+        with self.assertRaises(Exception):
+            envelopes[0].correlation_id
+
+
+if __name__ == "__main__":
+    unittest.main()
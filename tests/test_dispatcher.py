@@ -0,0 +1,88 @@
+"""
+   Copyright 2019 InfAI (CC SES)
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+from cc_lib.client import Client
+from cc_lib.client._asynchron import KeyedDispatcher
+import threading
+import unittest
+
+
+class TestKeyedDispatcher(unittest.TestCase):
+    def test_order_per_key(self):
+        dispatcher = KeyedDispatcher(workers=4)
+        results = {key: list() for key in range(8)}
+        done = threading.Semaphore(0)
+
+        def task(key, num):
+            results[key].append(num)
+            done.release()
+
+        for num in range(100):
+            for key in results:
+                dispatcher.submit(key, task, (key, num))
+        for _ in range(800):
+            self.assertTrue(done.acquire(timeout=5))
+        for key in results:
+            self.assertEqual(results[key], list(range(100)))
+        self.assertEqual(dispatcher.queue_length, 0)
+
+    def test_no_head_of_line_blocking(self):
+        dispatcher = KeyedDispatcher(workers=2)
+        release = threading.Event()
+        done = threading.Event()
+        # with static sharding every key could end up behind the blocked one
+        dispatcher.submit("slow", release.wait, (5, ))
+        for key in range(10):
+            dispatcher.submit(key, lambda: None)
+        dispatcher.submit("last", done.set)
+        try:
+            self.assertTrue(done.wait(5))
+        finally:
+            release.set()
+
+    def test_queue_size(self):
+        dispatcher = KeyedDispatcher(workers=1, queue_size=2)
+        release = threading.Event()
+        started = threading.Event()
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        dispatcher.submit("a", block)
+        self.assertTrue(started.wait(5))
+        dispatcher.submit("a", lambda: None)
+        dispatcher.submit("b", lambda: None)
+        blocked = threading.Thread(target=dispatcher.submit, args=("c", lambda: None), daemon=True)
+        blocked.start()
+        blocked.join(0.2)
+        self.assertTrue(blocked.is_alive())
+        release.set()
+        blocked.join(5)
+        self.assertFalse(blocked.is_alive())
+
+
+class TestCommandHandlers(unittest.TestCase):
+    def test_unregister_unknown(self):
+        client = Client(user="user", pw="pw")
+        client.unregister_command_handler("unknown")
+        client.register_command_handler("srv", lambda envelope: None)
+        client.unregister_command_handler("srv")
+        client.unregister_command_handler("srv")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+   Copyright 2019 InfAI (CC SES)
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+from cc_lib.types.message import LazyCommandEnvelope, DeviceMessage
+import threading
+import unittest
+import json
+import time
+
+
+def _raw(**kwargs):
+    command = {
+        "correlation_id": "corr",
+        "payload": {"data": "data", "metadata": "meta"},
+        "completion_strategy": "optimistic",
+        "timestamp": 1.5
+    }
+    command.update(kwargs)
+    return json.dumps(command)
+
+
+class TestLazyCommandEnvelope(unittest.TestCase):
+    def test_decode(self):
+        envelope = LazyCommandEnvelope("dev", "srv", _raw())
+        self.assertIsNotNone(envelope.raw)
+        self.assertEqual(envelope.device_id, "dev")
+        self.assertEqual(envelope.service_uri, "srv")
+        self.assertEqual(envelope.correlation_id, "corr")
+        self.assertEqual(envelope.message.data, "data")
+        self.assertEqual(envelope.timestamp, 1.5)
+        self.assertIsNone(envelope.raw)
+        envelope.message = DeviceMessage("new")
+        self.assertEqual(envelope.message.data, "new")
+
+    def test_decode_error(self):
+        envelope = LazyCommandEnvelope("dev", "srv", json.dumps({"payload": {}}))
+        for _ in range(2):
+            with self.assertRaises(KeyError):
+                envelope.correlation_id
+        self.assertIsNotNone(envelope.raw)
+
+    def test_concurrent_decode(self):
+        calls = list()
+
+        def loads(raw):
+            calls.append(raw)
+            time.sleep(0.05)
+            return json.loads(raw)
+
+        envelope = LazyCommandEnvelope("dev", "srv", _raw(), loads=loads)
+        messages = list()
+        start = threading.Barrier(8)
+
+        def access():
+            start.wait()
+            messages.append((envelope.message, envelope.correlation_id, envelope.timestamp))
+
+        threads = [threading.Thread(target=access) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(messages), 8)
+        self.assertTrue(all(item == (messages[0][0], "corr", 1.5) for item in messages))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+"""
+   Copyright 2019 InfAI (CC SES)
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+from cc_lib.client import Executor
+import threading
+import unittest
+import queue
+
+
+class TestExecutor(unittest.TestCase):
+    def test_submit(self):
+        executor = Executor(max_workers=2)
+        futures = [executor.submit(target=pow, args=(2, num)) for num in range(5)]
+        for num, future in enumerate(futures):
+            future.wait(timeout=5)
+            self.assertEqual(future.result(), 2 ** num)
+        self.assertLessEqual(executor.workers, 2)
+
+    def test_exception(self):
+        executor = Executor(max_workers=1)
+        future = executor.submit(target=int, args=("x", ))
+        future.wait(timeout=5)
+        with self.assertRaises(ValueError):
+            future.result()
+
+    def test_non_blocking_submit(self):
+        executor = Executor(max_workers=1, queue_size=1)
+        started = threading.Event()
+        release = threading.Event()
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        executor.submit(target=block)
+        self.assertTrue(started.wait(5))
+        executor.submit(target=block, block=False)
+        with self.assertRaises(queue.Full):
+            executor.submit(target=block, block=False)
+        release.set()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+"""
+   Copyright 2019 InfAI (CC SES)
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+from cc_lib.client._protocol.http.pool import ConnectionPool
+import http.server
+import http.client
+import threading
+import unittest
+import time
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests = list()
+    failed = set()
+
+    def log_message(self, *args):
+        pass
+
+    def __respond(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        self.requests.append((self.command, self.path, body))
+        if self.path.startswith("/fail") and self.path not in self.failed:
+            # drop the connection after receiving the request once
+            self.failed.add(self.path)
+            self.close_connection = True
+            return
+        if self.path.startswith("/redirect-"):
+            self.send_response(int(self.path.rsplit("-", 1)[-1]))
+            self.send_header("Location", "/target")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        data = "{} {}".format(self.command, self.path).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        if self.path == "/drop":
+            # close without announcing it, the client keeps a stale connection
+            self.close_connection = True
+
+    do_GET = __respond
+    do_POST = __respond
+    do_PUT = __respond
+
+
+class KeepAliveHandler(Handler):
+    # idle connections are closed by the server after this amount of time
+    timeout = 0.2
+
+
+class TestConnectionPool(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.url = "http://127.0.0.1:{}".format(cls.server.server_address[1])
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        Handler.requests.clear()
+        Handler.failed.clear()
+        self.pool = ConnectionPool(size=2, retries=1)
+
+    def test_keep_alive(self):
+        for _ in range(3):
+            status, _, data, _ = self.pool.request("GET", self.url + "/a")
+            self.assertEqual((status, data), (200, b"GET /a"))
+        self.assertEqual(len(Handler.requests), 3)
+
+    def test_retry_idempotent(self):
+        self.pool.request("GET", self.url + "/a")
+        status, _, data, _ = self.pool.request("PUT", self.url + "/fail-put", body=b"x")
+        self.assertEqual((status, data), (200, b"PUT /fail-put"))
+        self.assertEqual(len(Handler.requests), 3)
+
+    def test_no_retry_post(self):
+        self.pool.request("GET", self.url + "/a")
+        # the request reached the server, retrying could process it twice
+        with self.assertRaises((http.client.RemoteDisconnected, ConnectionError)):
+            self.pool.request("POST", self.url + "/fail-post", body=b"x", headers={"Content-Type": "text/plain"})
+        self.assertEqual(len(Handler.requests), 2)
+
+    def test_closed_by_server(self):
+        self.pool.request("GET", self.url + "/drop")
+        # the server closes after responding, wait until the close has reached the client
+        time.sleep(0.1)
+        status, _, data, _ = self.pool.request("POST", self.url + "/b", body=b"x")
+        self.assertEqual((status, data), (200, b"POST /b"))
+
+    def test_keep_alive_timeout(self):
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = "http://127.0.0.1:{}".format(server.server_address[1])
+        try:
+            for detect in (True, False):
+                pool = ConnectionPool(size=2, retries=1)
+                if not detect:
+                    # skip the idle check, sending to the closed connection fails and is retried
+                    pool._ConnectionPool__dropped = lambda conn: False
+                pool.request("GET", url + "/a")
+                time.sleep(0.5)
+                status, _, data, _ = pool.request("POST", url + "/b", body=b"x")
+                self.assertEqual((status, data), (200, b"POST /b"))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_redirect_get(self):
+        for code in (301, 302, 303, 307, 308):
+            status, _, data, _ = self.pool.request("GET", "{}/redirect-{}".format(self.url, code))
+            self.assertEqual((status, data), (200, b"GET /target"))
+
+    def test_redirect_post(self):
+        status, _, data, _ = self.pool.request("POST", self.url + "/redirect-303", body=b"x", headers={"Content-Type": "text/plain"})
+        self.assertEqual((status, data), (200, b"GET /target"))
+        self.assertEqual(Handler.requests[-1], ("GET", "/target", b""))
+        status, _, _, headers = self.pool.request("POST", self.url + "/redirect-307", body=b"x", headers={"Content-Type": "text/plain"})
+        self.assertEqual(status, 307)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+   Copyright 2019 InfAI (CC SES)
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+from cc_lib.client._protocol.mqtt.inflight import InFlightTracker
+import unittest
+import time
+
+
+class TestInFlightTracker(unittest.TestCase):
+    def test_ack(self):
+        tracker = InFlightTracker()
+        self.assertIsNone(tracker.add(1, "event", timeout=10, data="data"))
+        self.assertEqual(len(tracker), 1)
+        self.assertEqual(tracker.get(1), "event")
+        self.assertEqual(tracker.pop(1), ("event", "data"))
+        self.assertEqual(len(tracker), 0)
+        self.assertEqual(tracker.oldest_age, 0.0)
+
+    def test_expire(self):
+        tracker = InFlightTracker(resolution=0.01)
+        tracker.add(1, "event", timeout=0.02, data="data")
+        tracker.add(2, "other", timeout=10)
+        time.sleep(0.05)
+        self.assertEqual(tracker.expire(), [("event", "data")])
+        self.assertEqual(len(tracker), 1)
+        # late acknowledgement of an expired request is discarded
+        tracker.begin()
+        self.assertIsNone(tracker.pop(1, ("late", )))
+        self.assertIsNone(tracker.add(1, "new"))
+        tracker.end()
+
+    def test_early_ack(self):
+        tracker = InFlightTracker()
+        tracker.begin()
+        self.assertIsNone(tracker.pop(1, ("granted", )))
+        self.assertEqual(tracker.add(1, "event"), ("granted", ))
+        self.assertEqual(len(tracker), 0)
+        tracker.end()
+
+    def test_unannounced_ack(self):
+        # e.g. on_publish of QoS 0 messages
+        tracker = InFlightTracker()
+        self.assertIsNone(tracker.pop(1, ()))
+        tracker.begin()
+        self.assertIsNone(tracker.add(1, "event"))
+        tracker.end()
+        self.assertEqual(tracker.pop(1), ("event", None))
+
+    def test_early_ack_discarded(self):
+        tracker = InFlightTracker()
+        tracker.begin()
+        tracker.pop(1, ())
+        tracker.end()
+        tracker.begin()
+        self.assertIsNone(tracker.add(1, "event"))
+        tracker.end()
+
+    def test_early_ttl(self):
+        tracker = InFlightTracker(resolution=0.01, early_ttl=0.02)
+        tracker.begin()
+        tracker.pop(1, ())
+        time.sleep(0.05)
+        tracker.expire()
+        self.assertIsNone(tracker.add(1, "event"))
+        tracker.end()
+
+    def test_clear(self):
+        tracker = InFlightTracker()
+        tracker.add(1, "event", timeout=10)
+        tracker.add(2, "other")
+        self.assertEqual(sorted(tracker.clear()), ["event", "other"])
+        self.assertEqual(len(tracker), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
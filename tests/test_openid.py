@@ -0,0 +1,42 @@
+"""
+   Copyright 2019 InfAI (CC SES)
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+from cc_lib._configuration import cc_conf
+from cc_lib.client import Client
+import unittest
+
+
+class TestTokenRefreshFraction(unittest.TestCase):
+    def setUp(self):
+        self.fraction = cc_conf.connector.token_refresh_fraction
+
+    def tearDown(self):
+        cc_conf.connector.token_refresh_fraction = self.fraction
+
+    def test_valid(self):
+        for fraction in (0, 0.5, 0.99):
+            cc_conf.connector.token_refresh_fraction = fraction
+            Client(user="user", pw="pw")
+
+    def test_invalid(self):
+        for fraction in (1, 1.5, -0.2):
+            cc_conf.connector.token_refresh_fraction = fraction
+            with self.assertRaises(ValueError):
+                Client(user="user", pw="pw")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+   Copyright 2019 InfAI (CC SES)
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+from cc_lib.client._queue import MessageQueue, OverflowPolicy
+from cc_lib.types.message import LazyCommandEnvelope
+import threading
+import unittest
+import queue
+import json
+
+
+class TestMessageQueue(unittest.TestCase):
+    def test_drop_oldest(self):
+        msg_queue = MessageQueue(maxsize=3, overflow_policy=OverflowPolicy.drop_oldest)
+        for num in range(5):
+            msg_queue.put(num)
+        self.assertEqual(msg_queue.get_batch(10), [2, 3, 4])
+        self.assertEqual(msg_queue.dropped, 2)
+        self.assertEqual(msg_queue.high_water_mark, 3)
+
+    def test_drop_newest(self):
+        msg_queue = MessageQueue(maxsize=3, overflow_policy=OverflowPolicy.drop_newest)
+        for num in range(5):
+            msg_queue.put(num)
+        self.assertEqual(msg_queue.get_batch(10), [0, 1, 2])
+        self.assertEqual(msg_queue.dropped, 2)
+
+    def test_spill(self):
+        msg_queue = MessageQueue(maxsize=2, overflow_policy=OverflowPolicy.spill)
+        for num in range(6):
+            msg_queue.put({"num": num})
+        self.assertEqual(msg_queue.qsize(), 2)
+        self.assertEqual(msg_queue.spilled, 4)
+        self.assertEqual(msg_queue.high_water_mark, 6)
+        self.assertEqual([item["num"] for item in msg_queue.get_batch(3)], [0, 1, 2])
+        msg_queue.put({"num": 6})
+        items = list()
+        while True:
+            try:
+                items.extend(item["num"] for item in msg_queue.get_batch(10, block=False))
+            except queue.Empty:
+                break
+        self.assertEqual(items, [3, 4, 5, 6])
+        self.assertEqual(msg_queue.spilled, 0)
+        self.assertEqual(msg_queue.dropped, 0)
+        self.assertEqual(msg_queue.high_water_mark, 6)
+
+    def test_spill_lazy_envelopes(self):
+        msg_queue = MessageQueue(maxsize=1, overflow_policy=OverflowPolicy.spill)
+        for num in range(3):
+            command = {
+                "correlation_id": str(num),
+                "payload": {"data": "data", "metadata": ""},
+                "completion_strategy": "optimistic",
+                "timestamp": 1.5
+            }
+            envelope = LazyCommandEnvelope("dev", "srv", json.dumps(command))
+            if num == 2:
+                # decoded envelopes spill as well
+                envelope.correlation_id
+            msg_queue.put(envelope)
+        self.assertEqual(msg_queue.spilled, 2)
+        envelopes = msg_queue.get_batch(1) + msg_queue.get_batch(1) + msg_queue.get_batch(1)
+        self.assertEqual([envelope.correlation_id for envelope in envelopes], ["0", "1", "2"])
+        self.assertEqual(envelopes[1].message.data, "data")
+        self.assertEqual(envelopes[2].timestamp, 1.5)
+
+    def test_block(self):
+        msg_queue = MessageQueue(maxsize=1)
+        msg_queue.put(0)
+        with self.assertRaises(queue.Full):
+            msg_queue.put(1, timeout=0.05)
+        putter = threading.Thread(target=msg_queue.put, args=(1, ), daemon=True)
+        putter.start()
+        self.assertEqual(msg_queue.get_batch(5), [0])
+        putter.join(5)
+        self.assertEqual(msg_queue.get_batch(5), [1])
+
+    def test_get_batch_window(self):
+        msg_queue = MessageQueue()
+        msg_queue.put(0)
+        threading.Timer(0.05, msg_queue.put, args=(1, )).start()
+        self.assertEqual(msg_queue.get_batch(2, window=2), [0, 1])
+        with self.assertRaises(queue.Empty):
+            msg_queue.get_batch(1, timeout=0.01)
+
+
+if __name__ == "__main__":
+    unittest.main()
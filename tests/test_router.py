@@ -0,0 +1,77 @@
+"""
+   Copyright 2019 InfAI (CC SES)
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+from cc_lib.client import Client, RouteError
+from cc_lib.client._router import TopicRouter, filters_overlap
+from cc_lib._configuration import cc_conf
+import unittest
+
+
+class TestTopicRouter(unittest.TestCase):
+    def test_match(self):
+        router = TopicRouter()
+        router.add("command/+/+", "cmd", ("device_id", "service_uri"))
+        router.add("processes/+/cmd/#", "fog", (None, "sub_topic"))
+        router.add("command/dev/+", "literal", ("service_uri", ))
+        self.assertEqual(router.match("command/a/b"), ("cmd", {"device_id": "a", "service_uri": "b"}))
+        self.assertEqual(router.match("command/dev/b"), ("literal", {"service_uri": "b"}))
+        self.assertEqual(router.match("processes/hub/cmd/x/y"), ("fog", {"sub_topic": "x/y"}))
+        self.assertIsNone(router.match("event/a/b"))
+        router.remove("command/dev/+")
+        self.assertEqual(router.match("command/dev/b")[0], "cmd")
+
+    def test_overlap(self):
+        self.assertTrue(filters_overlap("command/+/+", "command/dev/srv"))
+        self.assertTrue(filters_overlap("command/#", "command/+/+"))
+        self.assertTrue(filters_overlap("#", "processes/+/cmd/#"))
+        self.assertTrue(filters_overlap("processes/+/cmd", "processes/+/cmd/#"))
+        self.assertFalse(filters_overlap("command/+", "command/+/+"))
+        self.assertFalse(filters_overlap("custom/#", "command/+/+"))
+        self.assertFalse(filters_overlap("processes/hub/state/#", "processes/+/cmd/#"))
+
+
+class TestClientRoutes(unittest.TestCase):
+    def setUp(self):
+        self.client = Client(user="user", pw="pw")
+
+    def test_reject_reserved(self):
+        for topic_filter in ("command/dev/srv", "command/#", "#", "+/+/+", "processes/hub/cmd/x"):
+            with self.assertRaises(RouteError):
+                self.client.register_route(topic_filter, lambda payload, topic: None)
+
+    def test_register_while_disconnected(self):
+        received = list()
+        self.client.register_route("custom/+", lambda payload, topic, name: received.append((payload, name)), ("name", ))
+        # messages are routed by the client's MQTT message handler
+        self.client._Client__route_message(b"data", "custom/test")
+        self.assertEqual(received, [(b"data", "test")])
+        self.client.unregister_route("custom/+")
+        self.client.unregister_route("custom/+")
+        self.client._Client__route_message(b"data", "custom/test")
+        self.assertEqual(len(received), 1)
+
+    def test_deprecated_router_conf(self):
+        identifier = cc_conf.router.command_sub_topic_identifier
+        try:
+            cc_conf.router.command_sub_topic_identifier = "cmd"
+            with self.assertRaises(ValueError):
+                Client(user="user", pw="pw")
+        finally:
+            cc_conf.router.command_sub_topic_identifier = identifier
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+   Copyright 2019 InfAI (CC SES)
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+from cc_lib.client import JSONSerializer, ORJSONSerializer, Serializer, get_serializer
+from cc_lib.client._serializer import orjson
+from cc_lib.types.message import DeviceMessage
+import unittest
+import json
+
+
+class UpperSerializer(JSONSerializer):
+    def loads(self, data):
+        return {key: value.upper() for key, value in super().loads(data).items()}
+
+
+class TestSerializer(unittest.TestCase):
+    def test_get_serializer(self):
+        self.assertIsInstance(get_serializer("json"), JSONSerializer)
+        self.assertIsInstance(get_serializer("auto"), ORJSONSerializer if orjson else JSONSerializer)
+        self.assertIsInstance(get_serializer("{}:UpperSerializer".format(__name__)), UpperSerializer)
+        with self.assertRaises(ValueError):
+            get_serializer("unknown")
+        with self.assertRaises(TypeError):
+            get_serializer("json:dumps")
+
+    def test_round_trip(self):
+        serializers = [JSONSerializer()]
+        if orjson:
+            serializers.append(ORJSONSerializer())
+        obj = {"metadata": "", "data": "ä"}
+        for serializer in serializers:
+            self.assertEqual(serializer.loads(serializer.dumps(obj)), obj)
+            self.assertEqual(serializer.loads(json.dumps(obj).encode()), obj)
+
+    def test_base(self):
+        with self.assertRaises(NotImplementedError):
+            Serializer().dumps({})
+
+
+class TestEncodedMessage(unittest.TestCase):
+    def test_decode(self):
+        message = DeviceMessage.from_encoded(b'{"metadata": "meta", "data": "data"}')
+        self.assertEqual(message.encoded, b'{"metadata": "meta", "data": "data"}')
+        self.assertEqual((message.data, message.metadata), ("data", "meta"))
+        message.data = "new"
+        self.assertIsNone(message.encoded)
+        self.assertEqual(dict(message), {"metadata": "meta", "data": "new"})
+
+    def test_loads(self):
+        message = DeviceMessage.from_encoded('{"metadata": "meta", "data": "data"}', loads=UpperSerializer().loads)
+        self.assertEqual((message.data, message.metadata), ("DATA", "META"))
+
+
+if __name__ == "__main__":
+    unittest.main()
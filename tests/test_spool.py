@@ -0,0 +1,115 @@
+"""
+   Copyright 2019 InfAI (CC SES)
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+from cc_lib._configuration import cc_conf
+from cc_lib.client import Client, Executor
+from cc_lib.client._spool import Spool, EvictionPolicy
+from cc_lib.types.message import EventEnvelope, DeviceMessage
+import threading
+import time
+import tempfile
+import unittest
+import os
+
+
+class TestSpool(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "spool.sqlite")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_fifo(self):
+        spool = Spool(self.path, max_messages=10)
+        for num in range(3):
+            self.assertTrue(spool.put("topic/{}".format(num), str(num), 1))
+        self.assertEqual(len(spool), 3)
+        items = spool.peek(2)
+        self.assertEqual([item[1] for item in items], ["topic/0", "topic/1"])
+        self.assertEqual([item[2] for item in items], [b"0", b"1"])
+        spool.remove([item[0] for item in items])
+        self.assertEqual(len(spool), 1)
+        self.assertEqual(spool.peek(5)[0][1], "topic/2")
+
+    def test_drop_oldest(self):
+        spool = Spool(self.path, max_messages=2, eviction_policy=EvictionPolicy.drop_oldest)
+        for num in range(3):
+            self.assertTrue(spool.put("t", str(num), 1))
+        self.assertEqual(len(spool), 2)
+        self.assertEqual(spool.dropped, 1)
+        self.assertEqual([item[2] for item in spool.peek(5)], [b"1", b"2"])
+
+    def test_drop_newest(self):
+        spool = Spool(self.path, max_messages=2, eviction_policy=EvictionPolicy.drop_newest)
+        self.assertTrue(spool.put("t", "0", 1))
+        self.assertTrue(spool.put("t", "1", 1))
+        self.assertFalse(spool.put("t", "2", 1))
+        self.assertEqual(spool.dropped, 1)
+        self.assertEqual([item[2] for item in spool.peek(5)], [b"0", b"1"])
+
+    def test_persistence(self):
+        spool = Spool(self.path, max_messages=10)
+        spool.put("t", b"payload", 2)
+        spool = Spool(self.path, max_messages=10)
+        self.assertEqual(len(spool), 1)
+        self.assertEqual(spool.peek(1)[0][1:], ("t", b"payload", 2))
+
+    def test_client_spools_while_disconnected(self):
+        enabled, path = cc_conf.spool.enabled, cc_conf.spool.path
+        cc_conf.spool.enabled, cc_conf.spool.path = True, self.path
+        try:
+            client = Client(user="user", pw="pw")
+            # an empty spool must not be treated as a disabled spool
+            client.send_event(EventEnvelope("device", "service", DeviceMessage("data")))
+            client.send_events([EventEnvelope("device", "service", DeviceMessage(str(num))) for num in range(2)])
+            self.assertEqual(client.get_metrics()["spool_length"], 3)
+        finally:
+            cc_conf.spool.enabled, cc_conf.spool.path = enabled, path
+
+    def test_drain_on_executor(self):
+        enabled, path = cc_conf.spool.enabled, cc_conf.spool.path
+        cc_conf.spool.enabled, cc_conf.spool.path = True, self.path
+        try:
+            client = Client(user="user", pw="pw", executor=Executor(max_workers=1, name="test-executor"))
+            client.send_event(EventEnvelope("device", "service", DeviceMessage("data")))
+            published = list()
+            drained = threading.Event()
+
+            class Comm:
+                def publish_batch(self, messages, qos, event_worker):
+                    published.append((threading.current_thread().name, messages))
+                    event_worker.set()
+                    drained.set()
+
+            client._Client__comm = Comm()
+            client._Client__on_connect()
+            self.assertTrue(drained.wait(5))
+            self.assertEqual(published[0][0], "test-executor-0")
+            self.assertEqual(len(published[0][1]), 1)
+            # let the drain finish before the spool file is removed
+            spool = client._Client__spool
+            for _ in range(50):
+                if not len(spool):
+                    break
+                time.sleep(0.1)
+            self.assertEqual(len(spool), 0)
+        finally:
+            cc_conf.spool.enabled, cc_conf.spool.path = enabled, path
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+"""
+   Copyright 2019 InfAI (CC SES)
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+from cc_lib.client import Client
+from cc_lib.types.message import DeviceMessage, EventEnvelope, device_message_unchecked, set_type_validation
+from cc_lib._util import TypeValidation
+import unittest
+
+
+class TestTypeValidation(unittest.TestCase):
+    def tearDown(self):
+        set_type_validation(True)
+
+    def test_switch(self):
+        with self.assertRaises(TypeError):
+            EventEnvelope("dev", 1, DeviceMessage("data"))
+        set_type_validation(False)
+        EventEnvelope("dev", 1, DeviceMessage("data"))
+        with self.assertRaises(TypeError):
+            set_type_validation("false")
+
+    def test_client_keeps_setting(self):
+        set_type_validation(False)
+        Client(user="user", pw="pw")
+        self.assertFalse(TypeValidation.enabled)
+
+    def test_unchecked_message(self):
+        message = device_message_unchecked(data=None, metadata=None)
+        self.assertIsNone(message.data)
+        self.assertIsNone(message.metadata)
+        self.assertIsNone(message.encoded)
+        message = device_message_unchecked(data="data")
+        self.assertEqual(dict(message), {"metadata": "", "data": "data"})
+
+
+if __name__ == "__main__":
+    unittest.main()